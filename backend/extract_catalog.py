@@ -28,101 +28,79 @@ Options:
   --settings-module PATH Python path to Django settings module (e.g. myproj.settings).
   --major-name NAME      Override major name (else uses header line).
   --skills-file PATH     Curated skills file (.txt); if given, skips NLP inference.
+  --force                With --save, re-ingest catalogs the manifest says are unchanged.
 """
 import os
 import sys
-import re
 import argparse
 from pathlib import Path
-import fitz  # PyMuPDF
 import nltk
-from transformers import pipeline
-from sentence_transformers import SentenceTransformer
-from keybert import KeyBERT
 
 # Ensure project root on PYTHONPATH for Django settings
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-# Initialize NLP models
-er_model = pipeline(
-    "ner",
-    model="jjzha/jobbert_skill_extraction",
-    aggregation_strategy="simple"
+from catalog.courses import infer_skills_many
+from catalog.extraction_cache import get_cache
+from catalog.pdf_text import (
+    course_entries, descriptions_map, extract_course_codes, extract_header_text, file_digest,
+    flat_text, parse_header, pdf_text,
 )
-embedder = SentenceTransformer('all-MiniLM-L6-v2')
-tf_model = KeyBERT(model='all-MiniLM-L6-v2')
+
+# NER / KeyBERT run in the inference worker when `manage.py inference_server`
+# is up; otherwise they load in-process on the first cache miss
 nltk.download('stopwords', quiet=True)
 
-# Text extraction utilities
+# Text extraction, header parsing and course codes live in catalog.pdf_text
+# (pages extracted in parallel, cached by file hash)
 def extract_text(path: Path) -> str:
-    txt = ''
-    with fitz.open(path) as doc:
-        for page in doc:
-            txt += page.get_text('text') + '\n'
-    txt = re.sub(r"\s+", ' ', txt)
-    txt = re.sub(r"([a-z])[-–—]([a-z])", r"\1 \2", txt, flags=re.I)
-    return txt
+    return flat_text(path)
 
 def extract_text_preserve(path: Path) -> str:
-    txt = ''
-    with fitz.open(path) as doc:
-        for page in doc:
-            txt += page.get_text('text') + '\n'
-    return txt
-
-# Header parsing
-def extract_header_text(path: Path, y_thresh: float=150.0) -> list[str]:
-    blocks = []
-    with fitz.open(path) as doc:
-        for blk in doc[0].get_text('blocks'):
-            x0, y0, _, _, txt = blk[:5]
-            if y0 < y_thresh and not re.match(r'^\d+\s*\|\s*Page', txt.strip()):
-                blocks.append((y0, txt.strip()))
-    blocks.sort(key=lambda t: t[0])
-    return [line for _, line in blocks]
-
-def parse_header(lines: list[str], max_sents: int=2):
-    dept = lines[0] if len(lines) > 0 else ''
-    maj_line = lines[1] if len(lines) > 1 else ''
-    desc = ''
-    if len(lines) > 2:
-        src = ' '.join(lines[2:])
-        sents = re.split(r'(?<=[\.\?!])\s+', src)
-        desc = ' '.join(sents[:max_sents]).strip()
-        desc = re.sub(r"\s+", ' ', desc)
-    return dept, maj_line, desc
-
-# Extract course codes
-def extract_course_codes(text: str) -> list[str]:
-    pat = re.compile(r'\b[A-Z]{2,5}\s*\d{3}\b')
-    return sorted({m.group().upper() for m in pat.finditer(text)})
-
-# Build descriptions map
+    return pdf_text(path)
+
+# Build descriptions map (linear header scan; cached by file hash)
 def parse_descriptions(path: Path) -> dict[str, str]:
-    raw = extract_text_preserve(path)
-    regex = re.compile(
-        r'^([A-Z]{2,5}\s*\d{3})\s+[^\(]+\([^\)]*\)\s*(.*?)\s*(?=^[A-Z]{2,5}\s*\d{3}\s+[^\(]+\([^\)]*\)|\Z)',
-        re.MULTILINE | re.DOTALL
-    )
-    descs = {}
-    for m in regex.finditer(raw):
-        code = re.sub(r"\s+", ' ', m.group(1)).strip()
-        txt = re.sub(r"\s+", ' ', m.group(2)).strip()
-        descs[code] = txt
-        descs[code.replace(' ', '')] = txt
-    return descs
-
-# NLP-based skill inference
-def infer_skills(text: str) -> set[str]:
-    skills = set()
-    for ent in er_model(text):
-        if ent.get('entity_group','').lower() == 'skill':
-            skills.add(ent['word'].lower())
-    for phrase, _ in tf_model.extract_keywords(text, keyphrase_ngram_range=(1,2), top_n=20):
-        skills.add(phrase.lower())
+    return descriptions_map(course_entries(path))
+
+def curated_skills(path: Path) -> set[str]:
+    skills = {line.strip().lower() for line in path.read_text(encoding='utf-8').splitlines() if line.strip()}
+    print(f"✅ Loaded {len(skills)} curated skills from {path}\n")
     return skills
 
+def report_major(args, by_code, desc_map, major_name, codes, curated):
+    if curated:
+        all_skills = curated_skills(args.skills_file)
+    else:
+        all_skills = set()
+        for code in codes:
+            if code in by_code and (desc_map.get(code) or desc_map.get(code.replace(' ', ''))):
+                sk = by_code[code]
+                all_skills.update(sk)
+                print(f"Course {code}: {', '.join(sorted(sk)) if sk else 'No skills found'}")
+    print(f"   {major_name}: {len(all_skills)} skills\n")
+
+def save_major(args, synced, catalog, major_name, dept, maj_desc, codes, curated, digests, version):
+    from catalog.courses import link_major, record_ingest
+    from catalog.models import Major
+    from catalog.services import resolve_skills
+
+    mj, _ = Major.objects.get_or_create(name=major_name)
+    mj.department = dept; mj.description = maj_desc; mj.save()
+    if curated:
+        # Curated lists are taken verbatim (and not recorded in the manifest)
+        all_skills = curated_skills(args.skills_file)
+        mj.skills.set(resolve_skills(sorted(all_skills), semantic=False))
+        print(f"💾 Saved {len(all_skills)} skills under '{major_name}'\n")
+        return
+    wanted = {c.replace(' ', '') for c in codes}
+    found = [course for code, course in synced.courses.items() if code.replace(' ', '') in wanted]
+    skill_ids = set().union(*(synced.skills[c.code] for c in found))
+    added, removed = link_major(mj, found, skill_ids)
+    record_ingest(catalog, digests[catalog], version, mj, len(found), len(skill_ids))
+    print(f"💾 Linked {len(found)} courses, {len(skill_ids)} skills under '{major_name}' "
+          f"(+{added} / -{removed})\n")
+
 # Main function
 def main():
     parser = argparse.ArgumentParser(description="Extract codes and link skills to DB")
@@ -137,10 +115,13 @@ def main():
     parser.add_argument('--major-name', type=str, help='Override major name')
     parser.add_argument('--skills-file', '-s', type=Path,
                         help='Path to curated skills .txt (one per line)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-ingest catalogs even if unchanged since the last --save')
     args = parser.parse_args()
 
     args.outdir.mkdir(parents=True, exist_ok=True)
-    desc_map = parse_descriptions(args.descriptions)
+    entries = course_entries(args.descriptions)
+    desc_map = descriptions_map(entries)
 
     if args.save:
         settings_mod = args.settings_module or os.environ.get('DJANGO_SETTINGS_MODULE') or 'skillgap_project.settings'
@@ -149,12 +130,24 @@ def main():
             import django; django.setup()
         except ModuleNotFoundError:
             sys.exit(f"❌  Settings module '{settings_mod}' not found. Use --settings-module or set DJANGO_SETTINGS_MODULE.")
-        from catalog.models import Major, Skill
+        from django.db import transaction
+        from catalog.courses import apply_courses, extractor_version, plan_courses, unchanged_catalogs
+        from catalog.prerequisites import sync_prerequisites
 
+        # Catalogs whose bytes and extractor version match the manifest are skipped
+        version = extractor_version(file_digest(args.descriptions))
+        digests = {c: file_digest(c) for c in args.catalogs if c.exists()}
+        unchanged = set() if args.force else unchanged_catalogs(digests, version)
+
+    # 1) Headers and course codes for every catalog
+    majors = []
     for catalog in args.catalogs:
         if not catalog.exists():
             print(f"❌ Catalog not found: {catalog}")
             continue
+        if args.save and catalog in unchanged:
+            print(f"⏭  {catalog.name} unchanged since the last ingest; skipping (--force to redo)\n")
+            continue
 
         # Header
         hdr = extract_header_text(catalog)
@@ -165,41 +158,49 @@ def main():
         # Course codes
         codes = extract_course_codes(extract_text(catalog))
         code_file = args.outdir / f"{catalog.stem}.txt"
+        curated = bool(args.skills_file and args.skills_file.exists() and args.skills_file.resolve() == code_file.resolve())
         # Skip overwriting if using the same skills file
-        if not (args.skills_file and args.skills_file.exists() and args.skills_file.resolve() == code_file.resolve()):
+        if not curated:
             code_file.write_text("\n".join(codes), encoding='utf-8')
             print(f"📝  {len(codes)} codes → {code_file}")
         else:
             print(f"📝  Skipping code list overwrite; using curated {code_file}")
-
-        # Skills
-        if args.skills_file and args.skills_file.exists() and args.skills_file.resolve() == code_file.resolve():
-            all_skills = {
-                line.strip().lower()
-                for line in args.skills_file.read_text(encoding='utf-8').splitlines()
-                if line.strip()
-            }
-            print(f"✅ Loaded {len(all_skills)} curated skills from {args.skills_file}\n")
-        else:
-            all_skills = set()
-            for code in codes:
-                desc = desc_map.get(code) or desc_map.get(code.replace(' ', ''))
-                if not desc:
-                    print(f"⚠️  No description for course {code}")
-                    continue
-                sk = infer_skills(desc)
-                all_skills.update(sk)
-                print(f"Course {code}: {', '.join(sorted(sk)) if sk else 'No skills found'}")
-
-        # Persist
-        if args.save:
-            mj, _ = Major.objects.get_or_create(name=major_name)
-            mj.department = dept; mj.description = maj_desc; mj.save()
-            mj.skills.clear()
-            for sk in sorted(all_skills):
-                skill_obj, _ = Skill.objects.get_or_create(name=sk)
-                mj.skills.add(skill_obj)
-            print(f"💾 Saved {len(all_skills)} skills under '{major_name}'\n")
+        majors.append((catalog, major_name, dept, maj_desc, codes, curated))
+
+    # 2) Skills: each course shared by several catalogs is inferred once
+    union = list(dict.fromkeys(c for *_, codes, curated in majors if not curated for c in codes))
+    if not majors:
+        print(get_cache().report())
+        return
+    by_code = {}
+    for code in union:
+        if not (desc_map.get(code) or desc_map.get(code.replace(' ', ''))):
+            print(f"⚠️  No description for course {code}")
+    if args.save:
+        # Inference happens before the transaction; all writes below share one
+        synced = plan_courses(union, entries)
+        if union:
+            new = sum(1 for c in synced.todo if c.pk is None)
+            print(f"📚 {len(union)} distinct courses: {new} new, {synced.reused} reused, "
+                  f"{synced.inferred} to infer ({synced.unique_texts} unique descriptions)\n")
+    elif union:
+        descs = [desc_map.get(c) or desc_map.get(c.replace(' ', '')) or '' for c in union]
+        by_code = dict(zip(union, infer_skills_many(descs)))
+
+    # 3) Per-major report / persist
+    if args.save:
+        with transaction.atomic():
+            apply_courses(synced)
+            added, removed = sync_prerequisites(entries)
+            print(f"🔗 Prerequisites: +{added} / -{removed} edges\n")
+            for catalog, major_name, dept, maj_desc, codes, curated in majors:
+                save_major(args, synced, catalog, major_name, dept, maj_desc, codes, curated,
+                           digests, version)
+    else:
+        for catalog, major_name, dept, maj_desc, codes, curated in majors:
+            report_major(args, by_code, desc_map, major_name, codes, curated)
+
+    print(get_cache().report())
 
 if __name__ == '__main__':
     main()
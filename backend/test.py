@@ -44,6 +44,8 @@ from keybert import KeyBERT
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from catalog.pdf_text import course_descriptions, pdf_text
+
 # Initialize NLP models
 er_model = pipeline(
     "ner",
@@ -51,25 +53,18 @@ er_model = pipeline(
     aggregation_strategy="simple"
 )
 embedder = SentenceTransformer('all-MiniLM-L6-v2')
-tf_model = KeyBERT(model='all-MiniLM-L6-v2')
+tf_model = KeyBERT(model=embedder)  # reuse the embedder instead of loading it twice
 nltk.download('stopwords', quiet=True)
 
-# Text extraction utilities
+# Text extraction utilities (pages extracted in parallel, cached by file hash)
 def extract_text(path: Path) -> str:
-    txt = ''
-    with fitz.open(path) as doc:
-        for page in doc:
-            txt += page.get_text('text') + '\n'
+    txt = pdf_text(path)
     txt = re.sub(r"\s+", ' ', txt)
     txt = re.sub(r"([a-z])[-–—]([a-z])", r"\1 \2", txt, flags=re.I)
     return txt
 
 def extract_text_preserve(path: Path) -> str:
-    txt = ''
-    with fitz.open(path) as doc:
-        for page in doc:
-            txt += page.get_text('text') + '\n'
-    return txt
+    return pdf_text(path)
 
 # Header parsing
 def extract_header_text(path: Path, y_thresh: float=150.0) -> list[str]:
@@ -98,20 +93,9 @@ def extract_course_codes(text: str) -> list[str]:
     pat = re.compile(r'\b[A-Z]{2,5}\s*\d{3}\b')
     return sorted({m.group().upper() for m in pat.finditer(text)})
 
-# Build descriptions map
+# Build descriptions map (linear header scan; cached by file hash)
 def parse_descriptions(path: Path) -> dict[str, str]:
-    raw = extract_text_preserve(path)
-    regex = re.compile(
-        r'^([A-Z]{2,5}\s*\d{3})\s+[^\(]+\([^\)]*\)\s*(.*?)\s*(?=^[A-Z]{2,5}\s*\d{3}\s+[^\(]+\([^\)]*\)|\Z)',
-        re.MULTILINE | re.DOTALL
-    )
-    descs = {}
-    for m in regex.finditer(raw):
-        code = re.sub(r"\s+", ' ', m.group(1)).strip()
-        txt = re.sub(r"\s+", ' ', m.group(2)).strip()
-        descs[code] = txt
-        descs[code.replace(' ', '')] = txt
-    return descs
+    return course_descriptions(path)
 
 # NLP-based skill inference
 def infer_skills(text: str) -> set[str]:
@@ -149,7 +133,8 @@ def main():
             import django; django.setup()
         except ModuleNotFoundError:
             sys.exit(f"❌  Settings module '{settings_mod}' not found. Use --settings-module or set DJANGO_SETTINGS_MODULE.")
-        from catalog.models import Major, Skill
+        from catalog.models import Major
+        from catalog.services import resolve_skills
 
     for catalog in args.catalogs:
         if not catalog.exists():
@@ -195,10 +180,8 @@ def main():
         if args.save:
             mj, _ = Major.objects.get_or_create(name=major_name)
             mj.department = dept; mj.description = maj_desc; mj.save()
-            mj.skills.clear()
-            for sk in sorted(all_skills):
-                skill_obj, _ = Skill.objects.get_or_create(name=sk)
-                mj.skills.add(skill_obj)
+            # set() diffs against the current links instead of clear() + re-add
+            mj.skills.set(resolve_skills(sorted(all_skills), semantic=False))
             print(f"💾 Saved {len(all_skills)} skills under '{major_name}'\n")
 
 if __name__ == '__main__':
@@ -1,11 +1,13 @@
 # catalog/utils/llm_extractor.py
 
-import json
-import subprocess
+import hashlib
 from django.conf import settings
 from jinja2 import Environment, FileSystemLoader
 import logging
 
+from catalog.extraction_cache import get_cache
+from catalog.llm import ollama_json, schema_version, skill_cert_schema
+
 logger = logging.getLogger(__name__)
 
 # Setup Jinja environment pointing to BASE_DIR/templates
@@ -14,6 +16,17 @@ j2_env = Environment(
     autoescape=False,
 )
 
+OLLAMA_MODEL = "llama2:latest"
+TEMPLATE_NAME = "course_extraction.jinja"
+
+
+def _prompt_version():
+    """Model + hash of the prompt template and schema, so editing either invalidates cached answers."""
+    source, _, _ = j2_env.loader.get_source(j2_env, TEMPLATE_NAME)
+    return (f"{OLLAMA_MODEL}/{hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]}"
+            f"-{schema_version(skill_cert_schema())}")
+
+
 def extract_skills_and_certs(
     text_input: str,
     domain: str = "General",
@@ -21,17 +34,35 @@ def extract_skills_and_certs(
     max_certs: int = 5,
 ) -> list[dict]:
     """
-    Render the extraction prompt via Jinja, then call Ollama CLI and parse its JSON output.
+    Render the extraction prompt via Jinja, then call Ollama with a JSON schema.
     Ensures we always return a list of dicts with keys "skill" and "certification".
+    Answers are cached by text + arguments (catalog.extraction_cache); failed calls are not.
     """
-    # 1) Build the prompt via Jinja
     try:
-        template = j2_env.get_template("course_extraction.jinja")
+        version = _prompt_version()
     except Exception as e:
         logger.error(f"Jinja template error: {e}")
         # Return empty list so caller sees no skills
         return []
+    params = {"domain": domain, "max_skills": max_skills, "max_certs": max_certs}
+    result = get_cache().fetch(
+        "ollama", version, text_input,
+        lambda text: _run_extraction(text, domain, max_skills, max_certs),
+        params=params,
+    )
+    return result or []
+
 
+def _run_extraction(text_input, domain, max_skills, max_certs):
+    """One uncached Ollama call; None on failure (so the cache skips it)."""
+    # 1) Build the prompt via Jinja
+    try:
+        template = j2_env.get_template(TEMPLATE_NAME)
+    except Exception as e:
+        logger.error(f"Jinja template error: {e}")
+        return None
+
+    schema = skill_cert_schema(max_items=max(max_skills, max_certs))
     prompt = (
         template.render(
             description="Extract skills & certifications from this course description:",
@@ -39,81 +70,32 @@ def extract_skills_and_certs(
             max_skills=max_skills,
             max_certs=max_certs,
             text_input=text_input,
-            output_format='[{"skill":"...","certification":"..."}]'
+            output_format='{"items": [{"skill":"...","certification":"..."}]}'
         )
         .replace("\n", " ")
     )
 
-    cmd = [
-        "ollama",
-        "run",
-        "--format", "json",
-        "llama2:latest",
-        prompt
-    ]
-    try:
-        # Run subprocess, capture stdout as bytes, then decode manually
-        proc = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-            timeout=60,
-        )
-        # Decode stdout as UTF-8, ignoring invalid bytes
-        raw = proc.stdout.decode("utf-8", errors="ignore").strip()
-    except subprocess.TimeoutExpired as e:
-        logger.error(f"Ollama call timed out: {e}")
-        return []
-    except subprocess.CalledProcessError as e:
-        # Non-zero exit code: log stderr for debugging
-        stderr = e.stderr.decode("utf-8", errors="ignore") if e.stderr else ""
-        logger.error(f"Ollama call failed (exit {e.returncode}): {stderr}")
-        return []
-    except Exception as e:
-        logger.error(f"Unexpected error calling Ollama: {e}")
+    # 2) Ollama decodes straight into the schema, within a budget derived from it
+    #    (None on transport errors, or a reply cut off at the budget)
+    parsed = ollama_json(OLLAMA_MODEL, prompt, schema, task="course_extract")
+    if parsed is None:
+        return None
+    items = parsed.get("items") if isinstance(parsed, dict) else None
+    if not isinstance(items, list):
+        logger.warning(f"Parsed output has no items list: {parsed!r}")
         return []
 
-    if not raw:
-        # No output
-        return []
-
-    # 2) Try parsing JSON
-    try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError as e:
-        # Parsing failed: log raw output for debugging
-        logger.error(f"JSON parse error: {e}; raw output: {raw!r}")
-        # Option A: return empty
-        return []
-        # Option B: wrap raw as a single skill entry, e.g.:
-        # return [{"skill": raw, "certification": None}]
-    # 3) Ensure parsed is in expected format
-    if isinstance(parsed, list):
-        # Filter only dict elements, ignore others
-        clean_list = []
-        for item in parsed:
-            if isinstance(item, dict):
-                # Optionally ensure keys exist
-                # If missing 'skill' or 'certification', you can set defaults
-                skill = item.get("skill")
-                cert = item.get("certification", None)
-                if skill is None:
-                    continue
-                clean_list.append({"skill": skill, "certification": cert})
-            else:
-                # item is not dict: skip or wrap?
-                logger.warning(f"Skipping non-dict item from parsed output: {item!r}")
-        return clean_list
-    elif isinstance(parsed, dict):
-        # Single dict: wrap into list if it has 'skill'
-        skill = parsed.get("skill")
-        cert = parsed.get("certification", None)
-        if skill:
-            return [{"skill": skill, "certification": cert}]
-        else:
-            return []
-    else:
-        # Parsed is not list/dict: skip
-        logger.warning(f"Parsed output is not a list or dict: {parsed!r}")
-        return []
+    # 3) Keep at most max_skills skills and max_certs certifications
+    clean_list, certs = [], 0
+    for item in items:
+        if not isinstance(item, dict) or not item.get("skill"):
+            logger.warning(f"Skipping malformed item from parsed output: {item!r}")
+            continue
+        if len(clean_list) >= max_skills:
+            break
+        cert = item.get("certification") or None
+        if cert and certs >= max_certs:
+            cert = None
+        certs += bool(cert)
+        clean_list.append({"skill": item["skill"], "certification": cert})
+    return clean_list
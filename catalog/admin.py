@@ -3,35 +3,56 @@
 from django.contrib import admin
 from .models import (
     Skill,
+    SkillAlias,
     Major,
     Course,
+    CoursePrerequisite,
+    CatalogIngest,
     Certification,
     JobField,
     JobPosting,
+    JobPostingSkill,
+    RawDocument,
     StudentProfile,
+    StudentProfileSkill,
     FacultyProfile,
 )
 
+from .skill_arrays import refresh_skill_ids
+
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+
+
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ("name", "frequency", "clusters", "category")
-    search_fields = ("name", "clusters")
+    search_fields = ("name", "clusters", "aliases__alias")
     list_filter = ("clusters","category")
     ordering = ("name",)
+    inlines = (SkillAliasInline,)
 
 
 @admin.register(Major)
 class MajorAdmin(admin.ModelAdmin):
     list_display = ("name", "department")
     search_fields = ("name", "department", "description")
-    filter_horizontal = ("skills",)
+    filter_horizontal = ("skills", "courses")
     ordering = ("name",)
 
 
+class CoursePrerequisiteInline(admin.TabularInline):
+    model = CoursePrerequisite
+    fk_name = "course"
+    autocomplete_fields = ("prerequisite",)
+    extra = 0
+
+
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
     list_display = ("code", "name", "major", "credits")
@@ -39,6 +60,15 @@ class CourseAdmin(admin.ModelAdmin):
     search_fields = ("code", "name", "description")
     filter_horizontal = ("skills",)
     ordering = ("major", "code")
+    inlines = (CoursePrerequisiteInline,)
+
+
+@admin.register(CatalogIngest)
+class CatalogIngestAdmin(admin.ModelAdmin):
+    list_display = ("path", "major", "courses", "skills", "ingested_at")
+    search_fields = ("path", "major__name")
+    readonly_fields = ("ingested_at",)
+    ordering = ("path",)
 
 
 @admin.register(Certification)
@@ -56,21 +86,51 @@ class JobFieldAdmin(admin.ModelAdmin):
     ordering = ("name",)
 
 
+class JobPostingSkillInline(admin.TabularInline):
+    model = JobPostingSkill
+    autocomplete_fields = ("skill",)
+    extra = 0
+
+
+class StudentProfileSkillInline(admin.TabularInline):
+    model = StudentProfileSkill
+    autocomplete_fields = ("skill",)
+    extra = 0
+
+
+class SkillIdsAdminMixin:
+    """Inline link rows are saved one by one (no m2m_changed), so rebuild skill_ids afterwards."""
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        refresh_skill_ids(self.model, [form.instance.pk])
+
+
 @admin.register(JobPosting)
-class JobPostingAdmin(admin.ModelAdmin):
-    list_display = ("title", "job_field", "location", "date_posted")
-    list_filter = ("job_field", "location", "date_posted")
-    search_fields = ("title", "location", "raw_description", "cleaned_description")
-    filter_horizontal = ("skills",)
+class JobPostingAdmin(SkillIdsAdminMixin, admin.ModelAdmin):
+    list_display = ("title", "job_field", "location", "date_posted",
+                    "min_years_experience", "education_level", "employment_type")
+    list_filter = ("job_field", "location", "date_posted", "education_level", "employment_type")
+    # raw HTML is compressed in RawDocument; cleaned_description holds the same text
+    search_fields = ("title", "location", "cleaned_description")
     ordering = ("-date_posted", "title")
+    raw_id_fields = ("raw_document",)
+    inlines = (JobPostingSkillInline,)
+
+
+@admin.register(RawDocument)
+class RawDocumentAdmin(admin.ModelAdmin):
+    list_display = ("digest", "size", "created_at")
+    search_fields = ("digest",)
+    ordering = ("-created_at",)
 
 
 @admin.register(StudentProfile)
-class StudentProfileAdmin(admin.ModelAdmin):
+class StudentProfileAdmin(SkillIdsAdminMixin, admin.ModelAdmin):
     list_display = ("user", "major", "date_joined")
     list_filter = ("major", "date_joined")
     search_fields = ("user__username", "user__first_name", "user__last_name", "major__name")
-    filter_horizontal = ("skills",)
+    inlines = (StudentProfileSkillInline,)
     ordering = ("user__username",)
 
 @admin.register(FacultyProfile)
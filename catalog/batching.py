@@ -0,0 +1,160 @@
+# catalog/batching.py
+"""
+Dynamic (micro-)batching for model calls made from request threads.
+
+A transformer forward pass over 16 texts costs little more than over one,
+so instead of one pass per API request, request threads `submit()` their
+input to a DynamicBatcher. A single background thread takes the first
+waiting item, keeps collecting for at most `max_wait` seconds or until
+`max_batch` items are queued, runs the batch function once, and hands each
+caller its own result. Under load, batches fill up; when idle, a lone
+request waits at most `max_wait`.
+
+The queue is bounded (`max_queue`): when it is full `submit()` raises
+BatcherFull at once rather than queueing work that would only time out. A
+caller that gives up on timeout cancels its item, and cancelled items are
+dropped before the batch function runs.
+
+Batchers live per process (one per gunicorn/runserver worker) and expose
+queue depth, batch-size histogram and timings through `metrics()`.
+"""
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+from django.conf import settings
+
+DEFAULT_CONFIG = {"max_batch": 32, "max_wait_ms": 10, "max_queue": 256, "timeout": 30}
+
+
+class BatcherFull(Exception):
+    """The batcher's queue is at `max_queue`; the caller should shed the request."""
+
+
+def batching_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "SKILL_EXTRACTION_BATCHING", {})}
+
+
+class DynamicBatcher:
+    def __init__(self, fn, max_batch=32, max_wait=0.01, max_queue=256, name="batcher"):
+        self.fn = fn                      # fn(list_of_items) -> list_of_results, same order
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.name = name
+        self.queue = queue.Queue(max_queue)
+        self.sizes = Counter()            # batch size -> how many batches had it
+        self.items = 0
+        self.errors = 0
+        self.rejected = 0                 # submits refused because the queue was full
+        self.cancelled = 0                # items dropped because their caller timed out
+        self.wait_seconds = 0.0           # summed over items: submit → batch start
+        self.run_seconds = 0.0            # summed over batches: time inside fn
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, item, timeout=None):
+        """
+        Queue one item and block until its result is ready. Raises BatcherFull
+        if the queue is full, and concurrent.futures.TimeoutError (after
+        cancelling the item) if no result arrives within `timeout`.
+        """
+        self._ensure_thread()
+        future = Future()
+        try:
+            self.queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            self.rejected += 1
+            raise BatcherFull(f"{self.name}: {self.queue.maxsize} items already queued") from None
+        try:
+            return future.result(timeout)
+        except FuturesTimeout:
+            future.cancel()
+            raise
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            collected = self._collect()
+            # skip items whose caller already gave up
+            batch = [entry for entry in collected if entry[1].set_running_or_notify_cancel()]
+            self.cancelled += len(collected) - len(batch)
+            if not batch:
+                continue
+            started = time.perf_counter()
+            self.sizes[len(batch)] += 1
+            self.items += len(batch)
+            self.wait_seconds += sum(started - queued for _, _, queued in batch)
+            try:
+                results = self.fn([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: got {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                self.errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            finally:
+                self.run_seconds += time.perf_counter() - started
+
+    def metrics(self):
+        batches = sum(self.sizes.values())
+        return {
+            "name": self.name,
+            "queue_depth": self.queue.qsize(),
+            "batches": batches,
+            "items": self.items,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "mean_batch_size": self.items / batches if batches else 0.0,
+            "batch_sizes": {str(k): v for k, v in sorted(self.sizes.items())},
+            "mean_wait_ms": 1000 * self.wait_seconds / self.items if self.items else 0.0,
+            "mean_run_ms": 1000 * self.run_seconds / batches if batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": 1000 * self.max_wait,
+            "max_queue": self.queue.maxsize,
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_batcher(name, fn):
+    """Process-wide batcher `name`, created on first use with settings.SKILL_EXTRACTION_BATCHING."""
+    with _registry_lock:
+        if name not in _registry:
+            config = batching_config()
+            _registry[name] = DynamicBatcher(
+                fn, max_batch=config["max_batch"], max_wait=config["max_wait_ms"] / 1000,
+                max_queue=config["max_queue"], name=name,
+            )
+        return _registry[name]
+
+
+def all_metrics():
+    with _registry_lock:
+        return [b.metrics() for b in _registry.values()]
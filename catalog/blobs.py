@@ -0,0 +1,27 @@
+# catalog/blobs.py
+"""
+Compression and content hashing for RawDocument, the out-of-row store for
+scraped HTML (JobPosting.raw_description).
+
+Documents are keyed by the SHA-256 of their UTF-8 text, so a panel scraped
+twice is stored once, and compressed with zstd; frames carry their content
+size, so decompression needs no length hint.
+"""
+import hashlib
+
+import zstandard
+
+LEVEL = 10      # well past the knee for HTML; compression runs once per scraped page
+
+
+def content_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(text):
+    # compressor objects aren't thread-safe, and are cheap next to the page itself
+    return zstandard.ZstdCompressor(level=LEVEL).compress(text.encode("utf-8"))
+
+
+def decompress(data):
+    return zstandard.ZstdDecompressor().decompress(bytes(data)).decode("utf-8")
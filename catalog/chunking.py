@@ -0,0 +1,111 @@
+# catalog/chunking.py
+"""
+Sliding-window NER over long descriptions.
+
+BERT-style NER models (dslim/bert-base-NER, jjzha/jobbert_skill_extraction)
+see at most 512 tokens, so anything past that in a long posting used to be
+silently dropped. Here each text is split into overlapping windows of at
+most `max_tokens` tokens (cut on word boundaries, `stride` tokens of
+overlap), the windows of *all* texts go through the pipeline as one
+batched call, and entities are mapped back to document offsets and merged:
+spans of the same type that overlap (the same skill seen from two windows,
+or one cut by a window edge) collapse into one, keeping the best score.
+"""
+MAX_TOKENS = 512
+STRIDE = 128
+BATCH_SIZE = 16
+
+
+def windows(tokenizer, text, max_tokens=MAX_TOKENS, stride=STRIDE):
+    """[(start_char, end_char), …] covering `text` in overlapping windows."""
+    limit = min(max_tokens, tokenizer.model_max_length or max_tokens)
+    limit -= tokenizer.num_special_tokens_to_add(pair=False)
+    enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, truncation=False)
+    offsets = enc["offset_mapping"]
+    n = len(offsets)
+    if n <= limit:
+        return [(0, len(text))]
+
+    word_ids = enc.word_ids()
+
+    def mid_word(k):
+        return word_ids[k] is not None and word_ids[k] == word_ids[k - 1]
+
+    spans, lo = [], 0
+    while True:
+        hi = min(lo + limit, n)
+        # never cut a word into sub-tokens at the right edge…
+        while lo + 1 < hi < n and mid_word(hi):
+            hi -= 1
+        spans.append((offsets[lo][0], offsets[hi - 1][1]))
+        if hi >= n:
+            return spans
+        # …nor at the left edge of the next window (back up to the word start,
+        # or skip forward past the word if that would not make progress)
+        nxt = start = max(hi - stride, lo + 1)
+        while start > lo and mid_word(start):
+            start -= 1
+        if start <= lo:
+            start = nxt
+            while start < hi and mid_word(start):
+                start += 1
+        lo = start
+
+
+def merge_entities(text, entities):
+    """
+    Collapse overlapping same-type spans (from overlapping windows) into one
+    entity whose word is the original text under the merged span.
+    """
+    if any(e.get("start") is None for e in entities):
+        # slow tokenizers give no offsets: fall back to de-duplicating by surface form
+        best = {}
+        for e in entities:
+            key = (e.get("entity_group"), e.get("word"))
+            if key not in best or e["score"] > best[key]["score"]:
+                best[key] = e
+        return list(best.values())
+
+    merged = []
+    for e in sorted(entities, key=lambda e: (e["start"], -e["end"])):
+        last = merged[-1] if merged else None
+        if last and e["start"] < last["end"] and e["entity_group"] == last["entity_group"]:
+            last["end"] = max(last["end"], e["end"])
+            last["score"] = max(last["score"], e["score"])
+        else:
+            merged.append(dict(e))
+    for e in merged:
+        e["word"] = text[e["start"]:e["end"]].strip()
+    return merged
+
+
+def chunked_ner(pipe, texts, max_tokens=MAX_TOKENS, stride=STRIDE, batch_size=BATCH_SIZE):
+    """
+    Entities for each text in `texts`, with every window of every text run
+    through `pipe` (an aggregated token-classification pipeline) in one call.
+    """
+    texts = list(texts)
+    owners, inputs = [], []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        for start, end in windows(pipe.tokenizer, text, max_tokens, stride):
+            owners.append((i, start))
+            inputs.append(text[start:end])
+
+    outputs = pipe(inputs, batch_size=batch_size) if inputs else []
+    if len(inputs) == 1 and outputs and isinstance(outputs[0], dict):
+        outputs = [outputs]         # single input → flat list
+
+    found = [[] for _ in texts]
+    for (i, offset), ents in zip(owners, outputs):
+        for e in ents:
+            start, end = e.get("start"), e.get("end")
+            found[i].append({
+                "entity_group": e.get("entity_group", ""),
+                "word": e.get("word", ""),
+                "score": float(e.get("score", 0.0)),
+                "start": None if start is None else start + offset,
+                "end": None if end is None else end + offset,
+            })
+    return [merge_entities(text, ents) for text, ents in zip(texts, found)]
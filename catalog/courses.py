@@ -0,0 +1,286 @@
+# catalog/courses.py
+"""
+Catalog courses: skill inference once per unique course, shared by majors.
+
+Most majors list the same core courses (ENGL, MATH, general education), so
+instead of inferring skills catalog by catalog, callers gather the union
+of course codes over every catalog and `sync_courses()`:
+
+  1. reuses catalog Course rows (major=NULL, unique by code) that already
+     have skills and an unchanged description;
+  2. runs jobbert NER and KeyBERT once over the remaining descriptions,
+     deduplicated by text, each model as one batch;
+  3. resolves the union of inferred names to Skills in one pass and writes
+     all Course ↔ Skill links with bulk inserts.
+
+Majors then only link courses (`link_major()`); their skill set is the
+union of their courses' skills plus any curated terms tag_catalog_skills
+added (`update_major_skills()`). Links are diffed (`replace_links()`), so an
+unchanged course or major costs a read and no writes, and CatalogIngest
+records which catalog files were ingested at which content hash so
+unchanged ones are skipped entirely.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from .inference import SKILL_NER_MODEL, keyphrases_many, ner_entities_many
+from .normalize import fit_many, normalize_many
+
+KEYBERT_PARAMS = {"keyphrase_ngram_range": (1, 2), "top_n": 20}
+SKILL_NAME_MAX_LENGTH = 100     # Skill.name; importable without Django set up
+
+
+def skills_from_outputs(entities, phrases):
+    skills = [e["word"] for e in entities if e.get("entity_group", "").lower() == "skill"]
+    skills.extend(phrases)
+    return {s.lower() for s in fit_many(normalize_many(skills, "ner"), SKILL_NAME_MAX_LENGTH)}
+
+
+def infer_skills_many(texts):
+    """Lower-cased skill names for each text; each unique text is inferred once, in batch."""
+    texts = list(texts)
+    unique = list(dict.fromkeys(t for t in texts if t))
+    if not unique:
+        return [set() for _ in texts]
+    entities = ner_entities_many(unique, SKILL_NER_MODEL)
+    phrases = keyphrases_many(unique, **KEYBERT_PARAMS)
+    by_text = {t: skills_from_outputs(e, p) for t, e, p in zip(unique, entities, phrases)}
+    return [set(by_text.get(t, ())) for t in texts]
+
+
+def infer_skills(text):
+    return infer_skills_many([text])[0]
+
+
+class CourseSync:
+    """What sync_courses() did: Course rows by code, plus counts for reports."""
+
+    def __init__(self):
+        self.courses = {}         # code -> Course
+        self.skills = {}          # code -> set of skill ids
+        self.created = 0
+        self.reused = 0
+        self.inferred = 0         # courses sent through the models
+        self.fresh = set()        # their codes
+        self.unique_texts = 0     # distinct descriptions among them
+        self.missing = []         # codes with no description
+        self.todo = []            # planned: courses to (re)infer …
+        self.changed = []         # … of which existing with a new description
+        self.names = []           # … and the skill names inferred for each
+
+    def __repr__(self):
+        return (f"<CourseSync courses={len(self.courses)} created={self.created} "
+                f"reused={self.reused} inferred={self.inferred}>")
+
+
+def replace_links(through, owner, target, wanted):
+    """
+    Make the M2M table `through` hold exactly wanted[owner_id] (a set of
+    target ids) for each owner id in `wanted`, writing only the difference:
+    one DELETE for dropped links and one bulk INSERT for new ones.
+    Returns (added, removed).
+    """
+    if not wanted:
+        return 0, 0
+    owner_col, target_col = f"{owner}_id", f"{target}_id"
+    kept, stale = {}, []
+    for pk, owner_id, target_id in (through.objects.filter(**{f"{owner_col}__in": list(wanted)})
+                                    .values_list("pk", owner_col, target_col)):
+        if target_id in wanted[owner_id]:
+            kept.setdefault(owner_id, set()).add(target_id)
+        else:
+            stale.append(pk)
+    rows = [
+        through(**{owner_col: owner_id, target_col: target_id})
+        for owner_id, ids in wanted.items() for target_id in ids - kept.get(owner_id, set())
+    ]
+    if stale:
+        through.objects.filter(pk__in=stale).delete()
+    through.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows), len(stale)
+
+
+def plan_courses(codes, entries, force=False):
+    """
+    Read-only half of sync_courses(): find which courses are new, changed
+    or missing skills and run the models over them. No rows are written.
+    """
+    from .models import Course
+
+    result = CourseSync()
+    lookup = {c.replace(" ", ""): c for c in entries}
+    wanted = {}
+    for code in dict.fromkeys(codes):
+        key = lookup.get(code.replace(" ", ""))
+        if key is None:
+            result.missing.append(code)
+        else:
+            wanted[key] = entries[key]
+
+    existing = {c.code: c for c in Course.objects.filter(major__isnull=True, code__in=wanted)}
+    linked = {}
+    for course_id, skill_id in Course.skills.through.objects.filter(
+            course__in=existing.values()).values_list("course_id", "skill_id"):
+        linked.setdefault(course_id, set()).add(skill_id)
+
+    todo, changed = [], []
+    for code, entry in wanted.items():
+        course = existing.get(code)
+        if course is None:
+            course = Course(code=code, name=(entry["title"] or code)[:200],
+                            description=entry["description"], credits=entry["credits"])
+            todo.append(course)
+            continue
+        if course.description != entry["description"]:
+            course.description = entry["description"]
+            changed.append(course)
+            todo.append(course)
+        elif force or course.id not in linked:
+            todo.append(course)
+        else:
+            result.reused += 1
+            result.skills[code] = linked[course.id]
+        result.courses[code] = course
+
+    result.todo, result.changed = todo, changed
+    result.names = infer_skills_many([c.description for c in todo])
+    result.inferred = len(todo)
+    result.unique_texts = len({c.description for c in todo if c.description})
+    return result
+
+
+def apply_courses(plan, semantic=True):
+    """
+    Write half of sync_courses(): create/update the planned courses and
+    diff their skill links. Runs in the caller's transaction if there is one.
+    """
+    from django.db import transaction
+
+    from .models import Course
+    from .services import resolve_skill_map
+
+    todo = plan.todo
+    skill_map = resolve_skill_map(sorted(set().union(*plan.names)), semantic=semantic) if todo else {}
+    with transaction.atomic():
+        new = [c for c in todo if c.pk is None]
+        Course.objects.bulk_create(new)
+        plan.created = len(new)
+        if plan.changed:
+            Course.objects.bulk_update(plan.changed, ["description"])
+        wanted = {}
+        for course, names in zip(todo, plan.names):
+            ids = {skill_map[n].id for n in names if n in skill_map}
+            plan.courses[course.code] = course
+            plan.skills[course.code] = ids
+            plan.fresh.add(course.code)
+            wanted[course.id] = ids
+        replace_links(Course.skills.through, "course", "skill", wanted)
+    return plan
+
+
+def sync_courses(codes, entries, semantic=True, force=False):
+    """
+    Ensure a catalog Course with skills exists for each code in `codes`.
+    `entries` is catalog.pdf_text.course_entries() output. With `force`,
+    skills are re-inferred even for unchanged courses.
+    """
+    return apply_courses(plan_courses(codes, entries, force), semantic)
+
+
+def course_skill_ids(major_ids):
+    """{major_id: ids of the skills its currently linked courses teach}."""
+    from .models import Course, Major
+
+    by_major = {m: set() for m in major_ids}
+    courses = {}
+    for major_id, course_id in (Major.courses.through.objects.filter(major_id__in=by_major)
+                                .values_list("major_id", "course_id")):
+        courses.setdefault(course_id, []).append(major_id)
+    for course_id, skill_id in (Course.skills.through.objects.filter(course_id__in=courses)
+                                .values_list("course_id", "skill_id")):
+        for major_id in courses[course_id]:
+            by_major[major_id].add(skill_id)
+    return by_major
+
+
+def update_major_skills(wanted, drop=None):
+    """
+    Major.skills is shared by link_major() (course skills) and
+    tag_catalog_skills (curated terms): add wanted[major_id] to each major's
+    skills and remove only drop[major_id], the links the calling writer
+    produced before and no longer finds. Links written by the other one are
+    kept, so the two can run in either order. Returns (added, removed).
+    """
+    from .models import Major
+
+    drop = drop or {}
+    target = {m: set() for m in wanted}
+    for major_id, skill_id in (Major.skills.through.objects.filter(major_id__in=target)
+                               .values_list("major_id", "skill_id")):
+        target[major_id].add(skill_id)
+    for major_id, ids in wanted.items():
+        target[major_id] = (target[major_id] - drop.get(major_id, set())) | set(ids)
+    return replace_links(Major.skills.through, "major", "skill", target)
+
+
+def link_major(major, courses, skill_ids):
+    """
+    Point `major` at its catalog courses and add their skills to its own.
+    Skills only its previous courses taught are dropped; curated links stay
+    (see update_major_skills()).
+    """
+    from .models import Major
+
+    skill_ids = set(skill_ids)
+    previous = course_skill_ids([major.id])[major.id]
+    replace_links(Major.courses.through, "major", "course", {major.id: {c.id for c in courses}})
+    return update_major_skills({major.id: skill_ids}, {major.id: previous - skill_ids})
+
+
+# ─── re-ingest manifest ─────────────────────────────────────────────────────────
+def extractor_version(descriptions_digest=""):
+    """
+    Everything a catalog's result depends on besides its own bytes: the
+    parser, the models and their parameters, and the descriptions PDF.
+    """
+    from .chunking import MAX_TOKENS, STRIDE
+    from .inference import EMBEDDING_MODEL
+    from .pdf_text import PARSER_VERSION
+
+    parts = [PARSER_VERSION, SKILL_NER_MODEL, MAX_TOKENS, STRIDE, EMBEDDING_MODEL,
+             sorted(KEYBERT_PARAMS.items()), descriptions_digest]
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def manifest_key(path):
+    """Catalog path relative to the project when inside it, so the manifest survives moves of the checkout."""
+    from django.conf import settings
+
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(Path(settings.BASE_DIR).resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def unchanged_catalogs(digests, version):
+    """Subset of {path: file digest} already ingested with this exact content and version."""
+    from .models import CatalogIngest
+
+    keys = {manifest_key(p): p for p in digests}
+    return {
+        keys[row.path]
+        for row in CatalogIngest.objects.filter(path__in=keys, major__isnull=False)
+        if row.file_hash == digests[keys[row.path]] and row.extractor_version == version
+    }
+
+
+def record_ingest(path, digest, version, major, courses, skills):
+    from .models import CatalogIngest
+
+    CatalogIngest.objects.update_or_create(
+        path=manifest_key(path),
+        defaults={"file_hash": digest, "extractor_version": version, "major": major,
+                  "courses": courses, "skills": skills},
+    )
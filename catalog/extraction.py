@@ -0,0 +1,187 @@
+# catalog/extraction.py
+"""
+Tiered skill-extraction cascade.
+
+Each posting/course is tried against the cheapest extractor first and only
+escalates when that tier finds too few skills or is not confident enough:
+
+    header     short bullets under a "Skills"/"Requirements" heading (free)
+    gazetteer  dictionary match against the Skill table (sub-millisecond)
+    ner        transformer NER (dslim/bert-base-NER by default)
+    llm        caller-supplied LLM callable (llama.cpp / Ollama)
+
+Skills found by every tier that ran are merged; `sources` records which
+tier produced each one, and `tier` is the one that settled the result (None
+when every tier fell short). The gazetteer tier shares its tokenization
+with the posting-attribute scan (catalog.posting_attributes), so every
+result also carries years of experience / education level / employment
+type. Thresholds live in settings.SKILL_EXTRACTION_CASCADE and can be
+overridden per cascade.
+"""
+import time
+
+from django.conf import settings
+
+from .extraction_cache import get_cache
+from .llm import stats as llm_stats
+from .normalize import clean_ner_entities, ner_text, normalize_many
+
+TIERS = ("header", "gazetteer", "ner", "llm")
+
+DEFAULT_CONFIG = {
+    "tiers": list(TIERS),
+    # accept a tier's result once it has at least this many skills…
+    "min_skills": {"header": 3, "gazetteer": 5, "ner": 3, "llm": 0},
+    # …and at least this (mean) confidence
+    "min_confidence": {"header": 0.0, "gazetteer": 0.0, "ner": 0.80, "llm": 0.0},
+    # seconds per call assumed for a tier until it has been measured
+    "cost_estimates": {"header": 0.0, "gazetteer": 0.001, "ner": 0.5, "llm": 10.0},
+    # header bullets longer than this are sentences, not skill names
+    "header_max_words": 6,
+    "ner_model": "dslim/bert-base-NER",
+}
+
+
+def cascade_config(**overrides):
+    """DEFAULT_CONFIG, updated from settings and then from `overrides`."""
+    config = {k: (dict(v) if isinstance(v, dict) else v) for k, v in DEFAULT_CONFIG.items()}
+    for source in (getattr(settings, "SKILL_EXTRACTION_CASCADE", {}), overrides):
+        for key, value in source.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            elif value is not None:
+                config[key] = value
+    return config
+
+
+class ExtractionResult:
+    """Skills plus the tier that settled them (None if none did) and the tiers that were tried."""
+
+    def __init__(self, skills, tier, confidence, sources, tried, attributes=None):
+        self.skills = skills
+        self.tier = tier
+        self.confidence = confidence
+        self.sources = sources      # skill -> tier that first produced it
+        self.tried = tried
+        self.attributes = attributes or {}
+
+    def __repr__(self):
+        return f"<ExtractionResult tier={self.tier or 'unsettled'} skills={len(self.skills)}>"
+
+
+class ExtractionCascade:
+    """
+    Usage:
+        cascade = ExtractionCascade(llm=my_llm)   # llm(text, found, bullets) -> [str]
+        result  = cascade.extract(text, bullets=header_bullets)
+        ...
+        print(cascade.report())
+    """
+
+    def __init__(self, tiers=None, llm=None, **overrides):
+        self.config = cascade_config(tiers=tiers, **overrides)
+        self.llm = llm
+        self.tiers = [
+            t for t in self.config["tiers"]
+            if t in TIERS and (t != "llm" or llm is not None)
+        ]
+        self.stats = {t: {"runs": 0, "accepted": 0, "seconds": 0.0, "skipped": 0} for t in self.tiers}
+        self.saved_seconds = 0.0
+        self.documents = 0
+        self.unsettled = 0          # documents no tier settled
+        self.pass_seconds = 0.0     # the shared gazetteer/attribute pass
+        self._gazetteer = None
+        self._profile = None
+
+    # ─── tiers ──────────────────────────────────────────────────────────────────
+    def _run_header(self, text, bullets, found):
+        limit = self.config["header_max_words"]
+        skills = [b for b in normalize_many(bullets or [], "bullet") if len(b.split()) <= limit]
+        return skills, 1.0 if skills else 0.0
+
+    def _run_gazetteer(self, text, bullets, found):
+        return self._profile.skills, 1.0
+
+    def _run_ner(self, text, bullets, found):
+        from .inference import ner_entities
+
+        flat = ner_text(text or "")
+        if not flat:
+            return [], 0.0
+        ents = ner_entities(flat, self.config["ner_model"])
+        scores = [float(e.get("score", 0.0)) for e in ents]
+        confidence = sum(scores) / len(scores) if scores else 0.0
+        return clean_ner_entities(ents), confidence
+
+    def _run_llm(self, text, bullets, found):
+        return normalize_many(self.llm(text, found, bullets), "llm"), 1.0
+
+    # ─── driver ─────────────────────────────────────────────────────────────────
+    def _cost(self, tier):
+        st = self.stats[tier]
+        if st["runs"]:
+            return st["seconds"] / st["runs"]
+        return self.config["cost_estimates"].get(tier, 0.0)
+
+    def _scan(self, text):
+        """One tokenization → gazetteer skills (if that tier is on) + attributes."""
+        from .posting_attributes import extract_posting
+
+        if self._gazetteer is None and "gazetteer" in self.tiers:
+            from .gazetteer import get_gazetteer
+            self._gazetteer = get_gazetteer()
+        t0 = time.perf_counter()
+        self._profile = extract_posting(text, self._gazetteer)
+        self.pass_seconds += time.perf_counter() - t0
+
+    def extract(self, text, bullets=None):
+        self.documents += 1
+        self._scan(text)
+        found, seen, sources, tried = [], set(), {}, []
+        settled, confidence = None, 0.0
+
+        for i, tier in enumerate(self.tiers):
+            t0 = time.perf_counter()
+            skills, confidence = getattr(self, f"_run_{tier}")(text, bullets, list(found))
+            st = self.stats[tier]
+            st["runs"] += 1
+            st["seconds"] += time.perf_counter() - t0
+            tried.append(tier)
+
+            for sk in skills:
+                key = sk.lower()
+                if key not in seen:
+                    seen.add(key)
+                    found.append(sk)
+                    sources[sk] = tier
+
+            if (len(skills) >= self.config["min_skills"].get(tier, 0)
+                    and confidence >= self.config["min_confidence"].get(tier, 0.0)):
+                st["accepted"] += 1
+                settled = tier
+                for later in self.tiers[i + 1:]:
+                    self.stats[later]["skipped"] += 1
+                    self.saved_seconds += self._cost(later)
+                break
+        else:
+            self.unsettled += 1
+
+        return ExtractionResult(found, settled, confidence, sources, tried, self._profile.attributes)
+
+    def report(self):
+        """Human-readable per-tier summary for the end of a command run."""
+        spent = sum(st["seconds"] for st in self.stats.values())
+        lines = [f"Extraction cascade over {self.documents} documents:"]
+        for tier in self.tiers:
+            st = self.stats[tier]
+            lines.append(
+                f"  {tier:<10} ran {st['runs']:>5}  settled {st['accepted']:>5}  "
+                f"skipped {st['skipped']:>5}  {st['seconds']:8.2f}s"
+            )
+        lines.append(f"  unsettled  {self.unsettled:>5} (every tier fell short; merged skills kept)")
+        lines.append(f"  tokenize + gazetteer/attribute pass {self.pass_seconds:.2f}s")
+        lines.append(f"  model time spent {spent:.1f}s, ~{self.saved_seconds:.1f}s saved by early exits")
+        lines.append(get_cache().report())
+        if llm_stats.tasks:
+            lines.append(llm_stats.report())
+        return "\n".join(lines)
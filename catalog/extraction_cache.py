@@ -0,0 +1,273 @@
+# catalog/extraction_cache.py
+"""
+Persistent cache of raw extractor output, keyed by content.
+
+    key = (extractor, model_version, sha256(normalized text + params))
+
+Ingesters and backend/extract_catalog.py see the same postings and course
+descriptions over and over (reposts, re-runs, shared courses), so every
+model call goes through `fetch()` / `fetch_many()` and unchanged text is
+never sent through a model twice. What is cached is the model's raw output
+(entities, noun phrases, keyphrases, parsed LLM JSON) — normalization still
+runs on every read, so blacklist tweaks apply without invalidating anything.
+
+Storage is a single SQLite file under settings.SKILL_INDEX_DIR, safe to
+share between processes. It is bounded by EXTRACTION_CACHE["max_entries"]:
+when full, the least recently used rows are evicted. Hits are counted per
+row (for `manage.py extraction_cache --stats`) and per process (`report()`).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from .normalize import WHITESPACE
+
+CACHE_FILE = "extraction_cache.sqlite3"
+DEFAULT_CONFIG = {
+    "path": None,                 # default: SKILL_INDEX_DIR / CACHE_FILE
+    "max_entries": 500_000,
+    "enabled": True,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extraction (
+    extractor     TEXT    NOT NULL,
+    model_version TEXT    NOT NULL,
+    digest        TEXT    NOT NULL,
+    value         TEXT    NOT NULL,
+    hits          INTEGER NOT NULL DEFAULT 0,
+    created       REAL    NOT NULL,
+    last_used     REAL    NOT NULL,
+    PRIMARY KEY (extractor, model_version, digest)
+);
+CREATE INDEX IF NOT EXISTS extraction_last_used ON extraction (last_used);
+"""
+
+
+def cache_config():
+    """DEFAULT_CONFIG updated from settings.EXTRACTION_CACHE (if Django is configured)."""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        from django.conf import settings
+        if settings.configured:
+            config.update(getattr(settings, "EXTRACTION_CACHE", {}))
+            if config["path"] is None:
+                config["path"] = Path(settings.SKILL_INDEX_DIR) / CACHE_FILE
+    except ImportError:
+        pass
+    if config["path"] is None:
+        config["path"] = Path(__file__).resolve().parents[1] / "data" / "skill_index" / CACHE_FILE
+    return config
+
+
+def normalize_text(text):
+    """Whitespace/Unicode-insensitive form the digest is taken over (case is kept: NER cares)."""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def digest(text, params=None):
+    h = hashlib.sha256(normalize_text(text).encode("utf-8"))
+    if params:
+        h.update(b"\0" + json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, path=None, max_entries=None, enabled=None):
+        config = cache_config()
+        self.path = Path(path or config["path"])
+        self.max_entries = config["max_entries"] if max_entries is None else max_entries
+        self.enabled = config["enabled"] if enabled is None else enabled
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._count = None
+
+    # ─── storage ────────────────────────────────────────────────────────────────
+    @property
+    def conn(self):
+        if self._conn is not None and self._pid != os.getpid():
+            # inherited across fork(): SQLite handles must not be shared with
+            # the parent, so leave it alone and open a fresh one
+            self._conn, self._count = None, None
+        if self._conn is None:
+            self._pid = os.getpid()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _evict(self):
+        """Drop least-recently-used rows once over max_entries (to 90%, so it runs rarely)."""
+        if not self.max_entries:
+            return
+        if self._count is None:
+            self._count = self.conn.execute("SELECT COUNT(*) FROM extraction").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        # other processes insert and evict too: confirm before deleting
+        self._count = self.conn.execute("SELECT COUNT(*) FROM extraction").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        excess = self._count - int(self.max_entries * 0.9)
+        self.conn.execute(
+            "DELETE FROM extraction WHERE rowid IN "
+            "(SELECT rowid FROM extraction ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self._count -= excess
+
+    def get_many(self, extractor, version, digests):
+        """{digest: value} for the digests present; bumps their hit count / recency."""
+        found = {}
+        if not digests:
+            return found
+        now = time.time()
+        with self._lock:
+            unique = list(dict.fromkeys(digests))
+            for lo in range(0, len(unique), 500):
+                part = unique[lo:lo + 500]
+                marks = ",".join("?" * len(part))
+                rows = self.conn.execute(
+                    f"SELECT digest, value FROM extraction WHERE extractor=? AND model_version=? "
+                    f"AND digest IN ({marks})", (extractor, version, *part),
+                ).fetchall()
+                found.update((d, json.loads(v)) for d, v in rows)
+            if found:
+                self.conn.executemany(
+                    "UPDATE extraction SET hits = hits + 1, last_used = ? "
+                    "WHERE extractor=? AND model_version=? AND digest=?",
+                    [(now, extractor, version, d) for d in found],
+                )
+        return found
+
+    def put_many(self, extractor, version, items):
+        """Store [(digest, value), …]; values must be JSON-serializable."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(extractor, version, d, json.dumps(v), now, now) for d, v in items]
+        with self._lock:
+            # a key that is already there was computed by another worker from the
+            # same text and model version: keep that row (and its hit count)
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO extraction "
+                "(extractor, model_version, digest, value, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute("COMMIT")
+            if self._count is not None:
+                self._count += self.conn.total_changes - before
+            self._evict()
+
+    def close(self):
+        """Close the connection (e.g. before forking workers); the next use reopens it."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn, self._count = None, None
+
+    # ─── memoization ────────────────────────────────────────────────────────────
+    def fetch_many(self, extractor, version, texts, compute_many, params=None):
+        """
+        Values for `texts`, in order. Misses (deduplicated) are computed in one
+        `compute_many(list_of_texts)` call; a None result is returned but not
+        cached, so transient failures are retried next time.
+        """
+        texts = list(texts)
+        if not self.enabled:
+            return list(compute_many(texts)) if texts else []
+        keys = [digest(t, params) for t in texts]
+        found = self.get_many(extractor, version, keys)
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        st = self.stats[extractor]
+        st["hits"] += len(texts) - sum(1 for k in keys if k not in found)
+        st["misses"] += len(pending)
+
+        if pending:
+            values = list(compute_many(list(pending.values())))
+            fresh = dict(zip(pending, values))
+            self.put_many(extractor, version, [(k, v) for k, v in fresh.items() if v is not None])
+            found.update(fresh)
+        return [found[k] for k in keys]
+
+    def fetch(self, extractor, version, text, compute, params=None):
+        """Single-text fetch_many(): compute(text) only on a miss."""
+        return self.fetch_many(extractor, version, [text], lambda ts: [compute(ts[0])], params)[0]
+
+    def fetch_key(self, extractor, version, key, compute):
+        """
+        Like fetch(), for inputs that are not text (e.g. a PDF): the caller
+        supplies the digest, compute() takes no arguments.
+        """
+        if not self.enabled:
+            return compute()
+        st = self.stats[extractor]
+        found = self.get_many(extractor, version, [key])
+        if key in found:
+            st["hits"] += 1
+            return found[key]
+        st["misses"] += 1
+        value = compute()
+        if value is not None:
+            self.put_many(extractor, version, [(key, value)])
+        return value
+
+    # ─── reporting / maintenance ────────────────────────────────────────────────
+    def report(self):
+        lines = []
+        for extractor, st in sorted(self.stats.items()):
+            total = st["hits"] + st["misses"]
+            rate = st["hits"] / total if total else 0.0
+            lines.append(f"  {extractor:<18} {st['hits']:>6} hits / {total:>6} lookups ({rate:.0%})")
+        return "Extraction cache:\n" + "\n".join(lines) if lines else "Extraction cache: no lookups"
+
+    def merge_stats(self, stats):
+        """Add hit/miss counts gathered elsewhere (a worker process) to this report."""
+        for extractor, st in stats.items():
+            self.stats[extractor]["hits"] += st["hits"]
+            self.stats[extractor]["misses"] += st["misses"]
+
+    def summary(self):
+        """Per (extractor, model_version): rows, stored hits, bytes."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT extractor, model_version, COUNT(*), SUM(hits), SUM(LENGTH(value)) "
+                "FROM extraction GROUP BY extractor, model_version ORDER BY extractor"
+            ).fetchall()
+
+    def clear(self, extractor=None):
+        with self._lock:
+            if extractor:
+                self.conn.execute("DELETE FROM extraction WHERE extractor=?", (extractor,))
+            else:
+                self.conn.execute("DELETE FROM extraction")
+            self._count = None
+            self.conn.execute("VACUUM")
+
+
+_lock = threading.Lock()
+_instance = None
+
+
+def get_cache():
+    global _instance
+    with _lock:
+        if _instance is None:
+            _instance = ExtractionCache()
+        return _instance
@@ -0,0 +1,190 @@
+# catalog/gazetteer.py
+"""
+Dictionary ("gazetteer") skill extractor built from the Skill table.
+
+Every Skill.name and SkillAlias.alias is tokenized the same way as the
+text being searched and compiled into one token-level Aho–Corasick
+automaton (catalog.normalize.PhraseAutomaton), so matching a description
+is a single pass over its tokens regardless of how many skills exist.
+
+The compiled automaton is pickled under settings.SKILL_INDEX_DIR. Workers
+load the pickle and then pull only rows newer than the ones it was built
+from; renames and deletions invalidate the pickle (see catalog.signals).
+Every process reloads when the pickle's mtime differs from the one it
+loaded, so a rebuild saved by another process is picked up too.
+"""
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from .normalize import PhraseAutomaton, skill_key
+
+TOKEN = re.compile(r"\w+[+#]*")
+INDEX_FILE = "gazetteer.pkl"
+FORMAT_VERSION = 1
+REFRESH_INTERVAL = 60     # seconds between DB top-ups for refresh=False callers
+
+
+def tokenize(text):
+    return TOKEN.findall(text.casefold())
+
+
+class Gazetteer:
+    def __init__(self):
+        self.automaton = PhraseAutomaton()
+        self.names = {}           # skill_id -> Skill.name
+        self.max_skill_id = 0
+        self.max_alias_id = 0
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.automaton)
+
+    # ─── building ───────────────────────────────────────────────────────────────
+    def add(self, skill_id, name, term=None):
+        """Add one surface form (the skill name itself, or an alias)."""
+        self.names.setdefault(skill_id, name)
+        tokens = tokenize(skill_key(term or name))
+        # single letters ("c", "r") are too ambiguous without context
+        if not tokens or (len(tokens) == 1 and len(tokens[0]) < 2):
+            return
+        self.automaton.add(tuple(tokens), skill_id)
+        self.dirty = True
+
+    def refresh(self):
+        """Pull Skills/SkillAliases created since the last build. Returns #added."""
+        from .models import Skill, SkillAlias
+
+        added = 0
+        for sid, name in (Skill.objects.filter(id__gt=self.max_skill_id)
+                          .order_by("id").values_list("id", "name").iterator()):
+            self.add(sid, name)
+            self.max_skill_id = sid
+            added += 1
+        for aid, sid, name, alias in (SkillAlias.objects.filter(id__gt=self.max_alias_id)
+                                      .order_by("id")
+                                      .values_list("id", "skill_id", "skill__name", "alias")
+                                      .iterator()):
+            self.add(sid, name, alias)
+            self.max_alias_id = aid
+            added += 1
+        if added:
+            self.automaton.build()
+        return added
+
+    @classmethod
+    def build_from_db(cls):
+        gz = cls()
+        gz.refresh()
+        return gz
+
+    # ─── matching ───────────────────────────────────────────────────────────────
+    def spans(self, text):
+        """
+        Leftmost-longest, non-overlapping (start, end, skill_id) token spans,
+        so "machine learning" wins over a nested "learning".
+        """
+        return self.token_spans(tokenize(text))
+
+    def token_spans(self, tokens):
+        """`spans()` over an already tokenized text."""
+        hits = sorted(self.automaton.scan(tokens), key=lambda h: (h[0], h[0] - h[1]))
+        out, last_end = [], 0
+        for start, end, sid in hits:
+            if start >= last_end:
+                out.append((start, end, sid))
+                last_end = end
+        return out
+
+    def match_ids(self, text):
+        """Distinct Skill ids mentioned in `text`, in order of first mention."""
+        return list(dict.fromkeys(sid for _, _, sid in self.spans(text)))
+
+    def match(self, text):
+        """Distinct Skill names mentioned in `text`."""
+        return [self.names[sid] for sid in self.match_ids(text)]
+
+    def match_many(self, texts):
+        return [self.match(t) for t in texts]
+
+    # ─── persistence ────────────────────────────────────────────────────────────
+    @staticmethod
+    def path():
+        return Path(settings.SKILL_INDEX_DIR) / INDEX_FILE
+
+    def save(self, path=None):
+        path = Path(path or self.path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.automaton._built:
+            self.automaton.build()
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((FORMAT_VERSION, self.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=None):
+        """Load the persisted gazetteer, or None if missing/outdated."""
+        path = Path(path or cls.path())
+        try:
+            with open(path, "rb") as f:
+                version, state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if version != FORMAT_VERSION:
+            return None
+        gz = cls.__new__(cls)
+        gz.__dict__.update(state)
+        return gz
+
+
+_lock = threading.Lock()
+_instance = None
+_loaded_mtime = None      # mtime of the pickle _instance was loaded from / saved to
+_refreshed_at = 0.0
+
+
+def _mtime():
+    try:
+        return Gazetteer.path().stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_gazetteer(refresh=True):
+    """
+    Process-wide gazetteer: loaded from disk (or built from the DB on first
+    use), topped up with any Skills added since, and re-saved if it changed.
+    Request handlers pass refresh=False and are topped up at most every
+    REFRESH_INTERVAL seconds instead of querying the DB per call.
+    """
+    global _instance, _loaded_mtime, _refreshed_at
+    with _lock:
+        # another process deleted (invalidate) or re-saved the pickle → reload
+        if _instance is not None and _mtime() != _loaded_mtime:
+            _instance = None
+        if _instance is None:
+            _loaded_mtime = _mtime()
+            _instance = Gazetteer.load() or Gazetteer.build_from_db()
+            _refreshed_at = 0.0
+        now = time.monotonic()
+        if refresh or now - _refreshed_at > REFRESH_INTERVAL:
+            _instance.refresh()
+            _refreshed_at = now
+        if _instance.dirty:
+            _instance.save()
+            _loaded_mtime = _mtime()
+        return _instance
+
+
+def invalidate():
+    """Forget the in-memory and persisted gazetteer (after renames/deletes)."""
+    global _instance
+    with _lock:
+        _instance = None
+        Gazetteer.path().unlink(missing_ok=True)
@@ -0,0 +1,209 @@
+# catalog/inference.py
+"""
+Lazily-loaded, process-wide model handles.
+
+Management commands used to build their transformers pipelines at import
+time, so even runs that never needed a model paid the load cost. Models
+are now created on first use and reused for the rest of the process.
+
+NER pipelines run on one of two backends (settings.NER_BACKEND):
+
+    torch   the stock transformers/PyTorch model
+    onnx    the same model exported to ONNX with dynamic int8 weight
+            quantization, run by onnxruntime (optimum); exported once into
+            SKILL_INDEX_DIR/onnx/ and reused. Much faster on CPU-only boxes.
+
+Both return an ordinary transformers pipeline, so call sites don't change.
+
+The *_many() helpers first try the resident worker started by
+`manage.py inference_server` (catalog.inference_daemon) and only load the
+model in-process when it isn't running.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+NER_MODEL = "dslim/bert-base-NER"
+SKILL_NER_MODEL = "jjzha/jobbert_skill_extraction"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SPACY_MODEL = "en_core_web_sm"
+NER_BACKENDS = ("torch", "onnx")
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def _setting(name, default):
+    """settings.<name>, or `default` when Django isn't configured (standalone scripts)."""
+    from django.conf import settings
+
+    return getattr(settings, name, default) if settings.configured else default
+
+
+def ner_backend(backend=None):
+    backend = backend or _setting("NER_BACKEND", "torch")
+    if backend not in NER_BACKENDS:
+        raise ValueError(f"Unknown NER backend {backend!r}; expected one of {NER_BACKENDS}")
+    return backend
+
+
+def onnx_model_dir(model, quantize=True):
+    base = _setting("SKILL_INDEX_DIR", DATA_DIR / "skill_index")
+    return Path(base) / "onnx" / (model.replace("/", "--") + ("-int8" if quantize else ""))
+
+
+def export_onnx(model=NER_MODEL, quantize=True, force=False):
+    """
+    Export a token-classification model to ONNX (int8 dynamic quantization
+    unless quantize=False) together with its config and tokenizer.
+    Returns the directory; a previous export is reused unless force=True.
+    """
+    import tempfile
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from optimum.onnxruntime import ORTModelForTokenClassification
+    from transformers import AutoTokenizer
+
+    out = onnx_model_dir(model, quantize)
+    if (out / "model.onnx").exists() and not force:
+        return out
+
+    ort_model = ORTModelForTokenClassification.from_pretrained(model, export=True)
+    out.mkdir(parents=True, exist_ok=True)
+    if quantize:
+        with tempfile.TemporaryDirectory() as tmp:
+            ort_model.save_pretrained(tmp)
+            quantize_dynamic(Path(tmp) / "model.onnx", out / "model.onnx", weight_type=QuantType.QInt8)
+        ort_model.config.save_pretrained(out)
+    else:
+        ort_model.save_pretrained(out)
+    AutoTokenizer.from_pretrained(model).save_pretrained(out)
+    return out
+
+
+def get_ner_pipeline(model=NER_MODEL, backend=None):
+    """HuggingFace token-classification pipeline with simple aggregation."""
+    return _load_ner_pipeline(model, ner_backend(backend))
+
+
+@lru_cache(maxsize=None)
+def _load_ner_pipeline(model, backend):
+    from transformers import AutoTokenizer, pipeline, logging as hf_logging
+
+    hf_logging.set_verbosity_error()
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForTokenClassification
+
+        path = export_onnx(model)
+        return pipeline(
+            "ner",
+            model=ORTModelForTokenClassification.from_pretrained(path),
+            tokenizer=AutoTokenizer.from_pretrained(path),
+            aggregation_strategy="simple",
+        )
+    return pipeline("ner", model=model, aggregation_strategy="simple")
+
+
+@lru_cache(maxsize=None)
+def get_embedder(model=EMBEDDING_MODEL):
+    """Shared SentenceTransformer; reuse it instead of loading a second copy."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model)
+
+
+@lru_cache(maxsize=None)
+def get_keybert(model=EMBEDDING_MODEL):
+    """KeyBERT on top of the shared embedder."""
+    from keybert import KeyBERT
+
+    return KeyBERT(model=get_embedder(model))
+
+
+@lru_cache(maxsize=None)
+def get_spacy(model=SPACY_MODEL):
+    import spacy
+
+    return spacy.load(model)
+
+
+def spacy_version(model=SPACY_MODEL):
+    """Installed pipeline package version, read without loading the model."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return f"{model}-{version(model)}"
+    except PackageNotFoundError:
+        return model
+
+
+def ner_entities_many(texts, model=NER_MODEL, backend=None):
+    """
+    Aggregated NER entities for each text. Long texts are split into
+    overlapping windows and all windows run as one batch (catalog.chunking);
+    results go through the extraction cache, so text the model has already
+    seen is never run through it again.
+    """
+    from .chunking import MAX_TOKENS, STRIDE, chunked_ner
+    from .extraction_cache import get_cache
+    from .inference_daemon import request
+
+    backend = ner_backend(backend)
+
+    def run(batch):
+        remote = request("ner", texts=batch, model=model, backend=backend)
+        return remote if remote is not None else chunked_ner(get_ner_pipeline(model, backend), batch)
+
+    return get_cache().fetch_many("ner", f"{model}/{backend}/w{MAX_TOKENS}s{STRIDE}", texts, run)
+
+
+def ner_entities(text, model=NER_MODEL, backend=None):
+    return ner_entities_many([text], model, backend)[0]
+
+
+def embed_many(texts, model=EMBEDDING_MODEL, normalize=True, batch_size=256):
+    """float32 sentence embeddings, from the worker if one is running."""
+    import numpy as np
+
+    from .inference_daemon import decode_array, request
+
+    texts = list(texts)
+    remote = request("embed", texts=texts, model=model, normalize=normalize)
+    if remote is not None:
+        return decode_array(remote)
+    vecs = get_embedder(model).encode(
+        texts, batch_size=batch_size, convert_to_numpy=True,
+        normalize_embeddings=normalize, show_progress_bar=False,
+    )
+    return np.ascontiguousarray(vecs, dtype="float32")
+
+
+def keyphrases_many(texts, model=EMBEDDING_MODEL, **kwargs):
+    """
+    KeyBERT keyphrases (without scores) for each text, cached and
+    worker-backed; misses run batched (catalog.keyphrases).
+    """
+    from .extraction_cache import get_cache
+    from .inference_daemon import request
+
+    def run(batch):
+        remote = request("keyphrases", texts=batch, model=model, **kwargs)
+        if remote is not None:
+            return remote
+        from .keyphrases import extract_keyphrases
+        return extract_keyphrases(batch, model, **kwargs)
+
+    return get_cache().fetch_many("keybert", model, texts, run, params=kwargs)
+
+
+def spacy_candidates_many(texts):
+    """Raw spaCy entity / noun-chunk candidates (catalog.nlp), cached and worker-backed."""
+    from .extraction_cache import get_cache
+    from .inference_daemon import request
+    from .nlp import CANDIDATES_VERSION
+
+    def run(batch):
+        remote = request("spacy", texts=batch)
+        if remote is not None:
+            return remote
+        from .nlp import spacy_candidates
+        return [spacy_candidates(t) for t in batch]
+
+    return get_cache().fetch_many("spacy", f"{spacy_version()}/{CANDIDATES_VERSION}", texts, run)
@@ -0,0 +1,219 @@
+# catalog/inference_daemon.py
+"""
+Long-lived local inference worker.
+
+`manage.py inference_server` keeps the NER pipelines, the sentence
+embedder, KeyBERT and spaCy resident and serves batched requests over a
+Unix socket (settings.INFERENCE_SOCKET). catalog.inference routes model
+calls through `request()` first and falls back to loading the model
+in-process when no worker is listening, so ingesters and
+backend/extract_catalog.py start in milliseconds instead of reloading
+BERT on every run.
+
+Wire format: each message is a 4-byte big-endian length followed by a
+UTF-8 JSON object. Requests are {"op": ..., **args}; replies are
+{"result": ...} or {"error": "..."}. Embeddings travel as base64 float32.
+"""
+import base64
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct("!I")
+RETRY_AFTER = 10.0       # seconds to stop trying a socket nobody listens on
+
+
+def socket_path():
+    from .inference import DATA_DIR, _setting
+
+    return str(_setting("INFERENCE_SOCKET", DATA_DIR / "inference.sock"))
+
+
+def available():
+    return hasattr(socket, "AF_UNIX")
+
+
+# ─── framing ────────────────────────────────────────────────────────────────────
+def send_message(sock, obj):
+    data = json.dumps(obj).encode("utf-8")
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("inference socket closed mid-message")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def recv_message(sock):
+    header = sock.recv(HEADER.size, socket.MSG_WAITALL)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        header += _recv_exact(sock, HEADER.size - len(header))
+    (n,) = HEADER.unpack(header)
+    return json.loads(_recv_exact(sock, n))
+
+
+def encode_array(arr):
+    arr = np.ascontiguousarray(arr, dtype="float32")
+    return {"shape": list(arr.shape), "data": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+
+def decode_array(obj):
+    return np.frombuffer(base64.b64decode(obj["data"]), dtype="float32").reshape(obj["shape"])
+
+
+# ─── client ─────────────────────────────────────────────────────────────────────
+_down_until = 0.0
+
+
+def request(op, timeout=None, path=None, **args):
+    """
+    Send one request to the worker. Returns its result, or None when no
+    worker is running (or it failed) — callers then run the model themselves.
+    """
+    global _down_until
+    path = path or socket_path()
+    if not available() or time.monotonic() < _down_until or not os.path.exists(path):
+        return None
+    from .inference import _setting
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout or _setting("INFERENCE_TIMEOUT", 600))
+            sock.connect(path)
+            send_message(sock, {"op": op, **args})
+            reply = recv_message(sock)
+    except (ConnectionRefusedError, FileNotFoundError):
+        _down_until = time.monotonic() + RETRY_AFTER      # stale socket file
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Inference worker request {op!r} failed, running in-process: {e}")
+        return None
+    if reply is None or "error" in reply:
+        logger.warning(f"Inference worker error on {op!r}: {(reply or {}).get('error')}")
+        return None
+    return reply["result"]
+
+
+# ─── server ─────────────────────────────────────────────────────────────────────
+class InferenceWorker:
+    """The ops the socket server exposes; each one serialised by its own lock."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.texts = 0
+        self.loaded = set()
+        self.locks = {}
+        self._guard = threading.Lock()
+
+    def lock(self, *key):
+        with self._guard:
+            self.loaded.add("/".join(k for k in key if k))
+            return self.locks.setdefault(key, threading.Lock())
+
+    def dispatch(self, message):
+        op = message.pop("op", None)
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            raise ValueError(f"unknown op {op!r}")
+        self.requests += 1
+        self.texts += len(message.get("texts", ()))
+        return handler(**message)
+
+    def op_ping(self):
+        return {"pid": os.getpid(), "uptime": time.time() - self.started,
+                "requests": self.requests, "texts": self.texts, "loaded": sorted(self.loaded)}
+
+    def op_ner(self, texts, model, backend=None):
+        from .chunking import chunked_ner
+        from .inference import get_ner_pipeline, ner_backend
+
+        backend = ner_backend(backend)
+        with self.lock("ner", model, backend):
+            return chunked_ner(get_ner_pipeline(model, backend), texts)
+
+    def op_embed(self, texts, model, normalize=True):
+        from .inference import get_embedder
+
+        with self.lock("embed", model):
+            vecs = get_embedder(model).encode(
+                texts, batch_size=256, convert_to_numpy=True,
+                normalize_embeddings=normalize, show_progress_bar=False,
+            )
+        return encode_array(vecs)
+
+    def op_keyphrases(self, texts, model, **kwargs):
+        from .keyphrases import extract_keyphrases
+
+        # the candidate-embedding cache stays warm across requests
+        with self.lock("embed", model):
+            return extract_keyphrases(texts, model, **kwargs)
+
+    def op_spacy(self, texts):
+        from .nlp import spacy_candidates
+
+        with self.lock("spacy"):
+            return [spacy_candidates(t) for t in texts]
+
+    def preload(self, ops, ner_models):
+        """Load models up front so the first request doesn't pay for it."""
+        from .inference import EMBEDDING_MODEL, get_embedder, get_ner_pipeline, get_spacy
+
+        if "ner" in ops:
+            for model in ner_models:
+                get_ner_pipeline(model)
+        if "embed" in ops:
+            get_embedder(EMBEDDING_MODEL)
+        if "spacy" in ops:
+            get_spacy()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (ConnectionError, ValueError):
+                return
+            if message is None:
+                return
+            try:
+                reply = {"result": self.server.worker.dispatch(message)}
+            except Exception as e:          # report, keep serving
+                logger.exception("inference op failed")
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            send_message(self.request, reply)
+
+
+def make_server(path, worker):
+    """Threaded Unix-socket server; removes a stale socket file first."""
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise RuntimeError(f"an inference worker is already listening on {path}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    server = socketserver.ThreadingUnixStreamServer(path, _Handler)
+    server.daemon_threads = True
+    server.worker = worker
+    os.chmod(path, 0o600)
+    return server
@@ -0,0 +1,137 @@
+# catalog/keyphrases.py
+"""
+Batched KeyBERT keyphrase extraction with cached candidate embeddings.
+
+Calling `KeyBERT.extract_keywords(text)` once per description embeds the
+document and every candidate n-gram in it, and course descriptions share
+most of their candidates ("data analysis", "students", "design"), so the
+same phrases are embedded over and over. Here documents go through KeyBERT
+in batches of BATCH_SIZE:
+
+  - one CountVectorizer over the batch (exactly what KeyBERT fits itself
+    when given a list), giving the batch's candidate vocabulary;
+  - document embeddings in one encode() call on the shared embedder
+    (catalog.inference.get_embedder, the same model KeyBERT wraps);
+  - candidate embeddings from a per-model LRU cache that persists across
+    batches and calls, so only never-seen phrases are encoded;
+
+and both are handed to KeyBERT as doc_embeddings / word_embeddings, so
+ranking (including MMR / MaxSum options) is KeyBERT's own.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .inference import EMBEDDING_MODEL, _setting, get_embedder, get_keybert
+
+BATCH_SIZE = 256                 # documents per vectorizer / encode pass
+ENCODE_BATCH_SIZE = 256
+DEFAULT_MAX_CANDIDATES = 50_000  # ~75 MB of MiniLM vectors
+
+
+class CandidateCache:
+    """LRU map of candidate phrase → embedding for one model."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_CANDIDATES):
+        self.max_entries = max_entries
+        self.vectors = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def embed(self, embedder, phrases):
+        """(len(phrases), dim) float32 array; only uncached phrases are encoded."""
+        with self._lock:
+            missing = list(dict.fromkeys(p for p in phrases if p not in self.vectors))
+            self.hits += len(phrases) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            fresh = embedder.encode(missing, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                    show_progress_bar=False)
+        with self._lock:
+            if missing:
+                for phrase, vec in zip(missing, np.asarray(fresh, dtype="float32")):
+                    self.vectors[phrase] = vec
+            out = []
+            for p in phrases:
+                vec = self.vectors.get(p)
+                if vec is None:            # evicted by a concurrent batch
+                    vec = np.asarray(embedder.encode([p], show_progress_bar=False)[0], dtype="float32")
+                else:
+                    self.vectors.move_to_end(p)
+                out.append(vec)
+            while len(self.vectors) > self.max_entries:
+                self.vectors.popitem(last=False)
+        return np.vstack(out) if out else np.zeros((0, 0), dtype="float32")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self.vectors), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def candidate_cache(model=EMBEDDING_MODEL):
+    with _caches_lock:
+        if model not in _caches:
+            _caches[model] = CandidateCache(_setting("KEYBERT_CANDIDATE_CACHE", DEFAULT_MAX_CANDIDATES))
+        return _caches[model]
+
+
+def _vectorizer(kwargs):
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    return CountVectorizer(
+        ngram_range=tuple(kwargs.get("keyphrase_ngram_range", (1, 1))),
+        stop_words=kwargs.get("stop_words", "english"),
+        min_df=kwargs.get("min_df", 1),
+        vocabulary=kwargs.get("candidates"),
+    )
+
+
+def extract_keyphrases(texts, model=EMBEDDING_MODEL, batch_size=BATCH_SIZE, **kwargs):
+    """
+    KeyBERT keyphrases (without scores) for each text, same kwargs as
+    KeyBERT.extract_keywords. Returns one list per input text.
+    """
+    texts = list(texts)
+    if kwargs.get("vectorizer") is not None:
+        # a caller-supplied vectorizer can't be reproduced here; no candidate cache
+        return _run(get_keybert(model), texts, None, None, kwargs)
+
+    kb = get_keybert(model)
+    embedder = get_embedder(model)
+    cache = candidate_cache(model)
+    out = []
+    for lo in range(0, len(texts), batch_size):
+        docs = texts[lo:lo + batch_size]
+        try:
+            words = _vectorizer(kwargs).fit(docs).get_feature_names_out()
+        except ValueError:                 # nothing but stop words in the whole batch
+            out.extend([] for _ in docs)
+            continue
+        doc_emb = embedder.encode(docs, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                  show_progress_bar=False)
+        out.extend(_run(kb, docs, doc_emb, cache.embed(embedder, list(words)), kwargs))
+    return out
+
+
+def _run(kb, docs, doc_emb, word_emb, kwargs):
+    if doc_emb is not None:
+        kwargs = {**kwargs, "doc_embeddings": doc_emb, "word_embeddings": word_emb}
+    if "keyphrase_ngram_range" in kwargs:
+        kwargs["keyphrase_ngram_range"] = tuple(kwargs["keyphrase_ngram_range"])
+    result = kb.extract_keywords(docs, **kwargs)
+    # KeyBERT unwraps single-document results and returns [] when no document has candidates
+    if len(docs) == 1:
+        result = [result]
+    elif not result:
+        result = [[] for _ in docs]
+    return [[phrase for phrase, _ in keywords] for keywords in result]
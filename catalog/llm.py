@@ -0,0 +1,196 @@
+# catalog/llm.py
+"""
+Schema-constrained, token-budgeted LLM calls.
+
+Free-form "comma-separated list" or "answer in JSON" prompts waste whole
+generations: the model rambles past the list, wraps it in prose, or stops
+mid-object, and the answer is dropped on JSONDecodeError. Here every call
+carries a JSON schema that the runtime enforces while decoding:
+
+    llama.cpp   the schema compiled to a GBNF grammar (LlamaGrammar)
+    Ollama      the schema passed as the /api/generate `format`
+
+and a max_tokens budget computed from the schema's own limits (maxItems,
+maxLength), so a runaway answer cannot happen. The budget is generous
+(one token per character, plus a margin) but not a guarantee: escapes and
+non-ASCII text can take several tokens per character, so callers must
+still treat a None or malformed answer as a failure. Token usage is recorded per task in `stats` for before/after
+comparisons (see `manage.py bench_llm_extraction`).
+"""
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+# Skill names are short; schema limits double as the decoding budget
+SKILL_MAX_LENGTH = 40
+CERT_MAX_LENGTH = 80
+# budget strings at one token per character, plus this much headroom
+BUDGET_MARGIN = 1.25
+OLLAMA_URL = "http://localhost:11434"
+
+logger = logging.getLogger(__name__)
+
+
+def skill_list_schema(max_skills=15):
+    return {
+        "type": "object",
+        "properties": {
+            "skills": {
+                "type": "array",
+                "items": {"type": "string", "minLength": 1, "maxLength": SKILL_MAX_LENGTH},
+                "maxItems": max_skills,
+            },
+        },
+        "required": ["skills"],
+        "additionalProperties": False,
+    }
+
+
+def skill_cert_schema(max_items=10):
+    return {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "skill": {"type": "string", "minLength": 1, "maxLength": SKILL_MAX_LENGTH},
+                        "certification": {"type": ["string", "null"], "maxLength": CERT_MAX_LENGTH},
+                    },
+                    "required": ["skill", "certification"],
+                    "additionalProperties": False,
+                },
+                "maxItems": max_items,
+            },
+        },
+        "required": ["items"],
+        "additionalProperties": False,
+    }
+
+
+def schema_version(schema):
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def token_budget(schema):
+    """
+    max_tokens for a schema-conforming answer: every string at its maxLength
+    (one token per character, times BUDGET_MARGIN), every array at maxItems,
+    plus one token per punctuation/key piece. Generous, not a proof: heavily
+    escaped or multi-byte text can still hit it (recorded as `truncated`).
+    """
+    kind = schema.get("type")
+    kinds = kind if isinstance(kind, list) else [kind]
+    if "object" in kinds:
+        props = schema.get("properties", {})
+        return 2 + sum(3 + token_budget(sub) for sub in props.values())
+    if "array" in kinds:
+        return 2 + schema.get("maxItems", 20) * (1 + token_budget(schema.get("items", {})))
+    if "string" in kinds:
+        return 2 + math.ceil(schema.get("maxLength", 100) * BUDGET_MARGIN)
+    return 4
+
+
+class LLMStats:
+    """Per-task call / token / parse-failure counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tasks = defaultdict(lambda: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                                          "budget": 0, "truncated": 0, "parse_errors": 0})
+
+    def record(self, task, prompt_tokens, completion_tokens, budget, truncated=False, parse_error=False):
+        with self._lock:
+            st = self.tasks[task]
+            st["calls"] += 1
+            st["prompt_tokens"] += prompt_tokens or 0
+            st["completion_tokens"] += completion_tokens or 0
+            st["budget"] += budget
+            st["truncated"] += bool(truncated)
+            st["parse_errors"] += bool(parse_error)
+
+    def report(self):
+        lines = ["LLM calls:"]
+        for task, st in sorted(self.tasks.items()):
+            n = st["calls"] or 1
+            lines.append(
+                f"  {task:<16} {st['calls']:>5} calls  {st['completion_tokens'] / n:6.1f} tokens/call "
+                f"(budget {st['budget'] / n:.0f})  {st['prompt_tokens'] / n:6.0f} prompt  "
+                f"{st['parse_errors']} unparsed, {st['truncated']} hit budget"
+            )
+        return "\n".join(lines) if self.tasks else "LLM calls: none"
+
+
+stats = LLMStats()
+
+
+def _parse(text):
+    try:
+        return json.loads(text), False
+    except (json.JSONDecodeError, TypeError):
+        return None, True
+
+
+@lru_cache(maxsize=32)
+def _grammar(schema_json):
+    from llama_cpp import LlamaGrammar
+
+    return LlamaGrammar.from_json_schema(schema_json, verbose=False)
+
+
+def llama_json(llm, prompt, schema, task="llama", max_tokens=None):
+    """
+    Run a llama_cpp.Llama completion constrained to `schema`. Returns the
+    parsed object, or None if it somehow still doesn't parse.
+    """
+    budget = max_tokens or token_budget(schema)
+    out = llm(
+        prompt=prompt,
+        grammar=_grammar(json.dumps(schema, sort_keys=True)),
+        max_tokens=budget,
+        temperature=0.0,
+    )
+    choice = out["choices"][0]
+    usage = out.get("usage", {})
+    parsed, failed = _parse(choice["text"])
+    stats.record(task, usage.get("prompt_tokens"), usage.get("completion_tokens"), budget,
+                 truncated=choice.get("finish_reason") == "length", parse_error=failed)
+    return parsed
+
+
+def ollama_json(model, prompt, schema, task="ollama", max_tokens=None, url=None, timeout=120):
+    """
+    Ollama /api/generate with `format` = schema (structured outputs).
+    Returns the parsed object, or None on transport or parse failure.
+    """
+    import requests
+
+    from .inference import _setting
+
+    budget = max_tokens or token_budget(schema)
+    try:
+        resp = requests.post(
+            f"{(url or _setting('OLLAMA_URL', OLLAMA_URL)).rstrip('/')}/api/generate",
+            json={
+                "model": model,
+                "prompt": prompt,
+                "format": schema,
+                "stream": False,
+                "options": {"temperature": 0, "num_predict": budget},
+            },
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        body = resp.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Ollama request failed: {e}")
+        return None
+    parsed, failed = _parse(body.get("response", ""))
+    stats.record(task, body.get("prompt_eval_count"), body.get("eval_count"), budget,
+                 truncated=body.get("done_reason") == "length", parse_error=failed)
+    return parsed
@@ -0,0 +1,99 @@
+# catalog/management/commands/bench_keybert.py
+"""
+Memory and throughput of KeyBERT keyphrase extraction over the full course
+descriptions set:
+
+  before  SentenceTransformer(name) and KeyBERT(model=name) loaded side by
+          side (two copies of the model), extract_keywords() once per text
+  after   KeyBERT on the shared embedder, batched with cached candidate
+          embeddings (catalog.keyphrases); run twice to show the warm cache
+
+The extraction cache is bypassed so every description really runs.
+
+Usage:
+  python manage.py bench_keybert [--descriptions "docs/Course Descriptions.pdf"] [--from-db]
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.courses import KEYBERT_PARAMS
+from catalog.inference import EMBEDDING_MODEL, get_embedder, get_keybert
+from catalog.keyphrases import candidate_cache, extract_keyphrases
+from catalog.management.commands.bench_ner_backends import rss_mb
+from catalog.models import Course
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-text KeyBERT vs batched KeyBERT with a shared embedder and candidate cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--descriptions", type=Path,
+                            default=Path(settings.BASE_DIR) / "docs" / "Course Descriptions.pdf")
+        parser.add_argument("--from-db", action="store_true", help="Use Course.description rows instead")
+        parser.add_argument("--limit", type=int, default=0, help="Only the first N descriptions")
+        parser.add_argument("--model", default=EMBEDDING_MODEL)
+
+    def handle(self, *args, **opts):
+        texts = self.load_texts(opts)
+        if not texts:
+            raise CommandError("No course descriptions to benchmark against.")
+        self.stdout.write(f"📄 {len(texts)} descriptions, model {opts['model']}, {KEYBERT_PARAMS}")
+
+        # after: one embedder, KeyBERT wrapping it
+        base = rss_mb()
+        get_keybert(opts["model"])
+        shared_mb = rss_mb() - base
+        get_embedder(opts["model"]).encode(texts[:1], show_progress_bar=False)     # warm-up
+
+        timings = {}
+        for label in ("after (cold)", "after (warm)"):
+            t0 = time.perf_counter()
+            after = extract_keyphrases(texts, opts["model"], **KEYBERT_PARAMS)
+            timings[label] = time.perf_counter() - t0
+        cache = candidate_cache(opts["model"]).stats()
+
+        # before: the two separately loaded copies, one call per text
+        from keybert import KeyBERT
+        from sentence_transformers import SentenceTransformer
+
+        base = rss_mb()
+        SentenceTransformer(opts["model"])
+        kb = KeyBERT(model=opts["model"])
+        separate_mb = rss_mb() - base
+        t0 = time.perf_counter()
+        before = [[p for p, _ in kb.extract_keywords(t, **KEYBERT_PARAMS)] for t in texts]
+        timings["before"] = time.perf_counter() - t0
+
+        self.stdout.write(f"🧠 model memory: before +{separate_mb:.0f} MB (two copies), after +{shared_mb:.0f} MB")
+        for label in ("before", "after (cold)", "after (warm)"):
+            self.stdout.write(f"⏱  {label:<13} {timings[label]:7.2f}s  {len(texts) / timings[label]:7.1f} docs/sec")
+        self.stdout.write(
+            f"🗂  candidate cache: {cache['entries']} phrases, {cache['hit_rate']:.0%} hit rate "
+            f"over both passes ({cache['hits']} hits / {cache['misses']} encoded)"
+        )
+
+        same = union = exact = 0
+        for a, b in zip(before, after):
+            a, b = set(a), set(b)
+            same += len(a & b)
+            union += len(a | b)
+            exact += a == b
+        self.stdout.write(
+            f"🤝 agreement: {same / union if union else 1.0:.1%} keyphrase Jaccard, "
+            f"{exact / len(texts):.1%} of descriptions identical"
+        )
+
+    def load_texts(self, opts):
+        if opts["from_db"]:
+            texts = list(Course.objects.exclude(description="").values_list("description", flat=True))
+        else:
+            from catalog.pdf_text import course_entries
+
+            if not opts["descriptions"].exists():
+                raise CommandError(f"Course descriptions not found: {opts['descriptions']}")
+            texts = [e["description"] for e in course_entries(opts["descriptions"]).values()]
+        texts = [t for t in dict.fromkeys(texts) if t]
+        return texts[:opts["limit"]] if opts["limit"] else texts
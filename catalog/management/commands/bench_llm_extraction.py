@@ -0,0 +1,106 @@
+# catalog/management/commands/bench_llm_extraction.py
+"""
+Tokens generated per posting, and how often the answer parses, for the old
+free-form prompts versus schema-constrained decoding (catalog.llm).
+
+  before  llama.cpp: "output ONLY comma-separated skill keywords", max_tokens=128
+          Ollama:    format="json" with no schema
+  after   the same model constrained to skill_list_schema(), budgeted max_tokens
+
+The extraction cache is bypassed so every posting really runs.
+
+Usage:
+  python manage.py bench_llm_extraction --model-path model.gguf [--limit 20]
+  python manage.py bench_llm_extraction --ollama llama2:latest [--limit 20]
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.llm import llama_json, ollama_json, skill_list_schema, stats
+from catalog.models import JobPosting
+from catalog.normalize import split_llm_list
+
+FREE_FORM_PROMPT = """You are a skills-extraction assistant.
+Read the following job description and output ONLY comma-separated skill keywords, just give the texts only.
+{text}
+"""
+CONSTRAINED_PROMPT = """You are a skills-extraction assistant.
+Read the following job description and list the individual skill keywords it names.
+Answer as JSON: {{"skills": ["...", "..."]}}
+{text}
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare tokens/posting and parse rate of free-form vs schema-constrained LLM extraction."
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument("--model-path", help="GGUF model for llama.cpp")
+        group.add_argument("--ollama", metavar="MODEL", help="Ollama model name")
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--max-chars", type=int, default=3000,
+                            help="Truncate descriptions to fit the context window")
+
+    def handle(self, *args, **opts):
+        texts = list(
+            JobPosting.objects.exclude(cleaned_description="")
+                      .order_by("-id").values_list("cleaned_description", flat=True)[:opts["limit"]]
+        )
+        texts = [t[:opts["max_chars"]] for t in texts]
+        if not texts:
+            raise CommandError("No job descriptions to benchmark against.")
+
+        schema = skill_list_schema()
+        if opts["model_path"]:
+            from llama_cpp import Llama
+
+            llm = Llama(model_path=opts["model_path"], n_ctx=2048, verbose=False)
+            before = lambda text: self.llama_free_form(llm, text)
+            after = lambda text: llama_json(llm, CONSTRAINED_PROMPT.format(text=text), schema, task="after")
+        else:
+            model = opts["ollama"]
+            before = lambda text: self.ollama_free_form(model, text)
+            after = lambda text: ollama_json(model, CONSTRAINED_PROMPT.format(text=text), schema, task="after")
+
+        for label, run in (("before", before), ("after", after)):
+            t0 = time.perf_counter()
+            parsed = sum(1 for text in texts if run(text) is not None)
+            elapsed = time.perf_counter() - t0
+            st = stats.tasks[label]
+            self.stdout.write(
+                f"⏱  {label:<6} {st['completion_tokens'] / len(texts):6.1f} tokens/posting  "
+                f"{parsed}/{len(texts)} parsed  {st['truncated']} cut off by max_tokens  "
+                f"{elapsed / len(texts):5.2f}s/posting"
+            )
+
+    # ─── the pre-constraint call patterns ───────────────────────────────────────
+    def llama_free_form(self, llm, text):
+        out = llm(prompt=FREE_FORM_PROMPT.format(text=text), max_tokens=128, temperature=0.0)
+        choice, usage = out["choices"][0], out.get("usage", {})
+        skills = [s.strip() for s in split_llm_list(choice["text"]) if s.strip()]
+        truncated = choice.get("finish_reason") == "length"
+        # a list cut off mid-item is only partially usable
+        stats.record("before", usage.get("prompt_tokens"), usage.get("completion_tokens"), 128,
+                     truncated=truncated, parse_error=not skills)
+        return skills or None
+
+    def ollama_free_form(self, model, text):
+        import requests
+
+        body = requests.post(
+            f"{getattr(settings, 'OLLAMA_URL', 'http://localhost:11434').rstrip('/')}/api/generate",
+            json={"model": model, "prompt": FREE_FORM_PROMPT.format(text=text),
+                  "format": "json", "stream": False, "options": {"temperature": 0}},
+            timeout=300,
+        ).json()
+        try:
+            parsed = json.loads(body.get("response", ""))
+        except json.JSONDecodeError:
+            parsed = None
+        stats.record("before", body.get("prompt_eval_count"), body.get("eval_count"), 0,
+                     truncated=body.get("done_reason") == "length", parse_error=parsed is None)
+        return parsed
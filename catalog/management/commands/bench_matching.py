@@ -0,0 +1,86 @@
+# catalog/management/commands/bench_matching.py
+"""
+Benchmark the per-field bit matrix matcher (catalog.matching) on synthetic
+postings (no database needed), against scoring each posting's skill set in
+Python the way a MissingSkills call per posting would.
+
+Usage:
+  python manage.py bench_matching [--postings 100000] [--skills 5000] [--queries 200]
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.matching import FieldMatrix
+
+
+class Command(BaseCommand):
+    help = "Time scoring one student against every posting of a field with packed bitsets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--postings", type=int, default=100_000)
+        parser.add_argument("--skills", type=int, default=5_000, help="Distinct skills in the field")
+        parser.add_argument("--per-posting", type=int, default=8, help="Average skills per posting")
+        parser.add_argument("--student", type=int, default=25, help="Skills per student")
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--updates", type=int, default=1_000, help="Incremental posting updates to time")
+        parser.add_argument("--seed", type=int, default=49)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        skills = range(1, opts["skills"] + 1)
+        # popular skills appear on many more postings than niche ones
+        weights = [1.0 / (i + 1) ** 0.8 for i in range(opts["skills"])]
+
+        def skill_set(k):
+            return sorted(set(rng.choices(skills, weights, k=max(1, k))))
+
+        postings = [(pid, skill_set(int(rng.gauss(opts["per_posting"], 2))))
+                    for pid in range(1, opts["postings"] + 1)]
+        students = [skill_set(opts["student"]) for _ in range(opts["queries"])]
+
+        t0 = time.perf_counter()
+        matrix = FieldMatrix().load(postings)
+        build = time.perf_counter() - t0
+        self.stdout.write(
+            f"🏗  {len(matrix)} postings × {len(matrix.columns)} skills packed into "
+            f"{matrix.bits.shape[0]} words/posting ({matrix.bits.nbytes / 2**20:.1f} MB) in {build * 1000:.0f}ms"
+        )
+
+        score = self.time_each(lambda s: matrix.score(s), students)
+        rank = self.time_each(lambda s: matrix.rank(s, opts["limit"]), students)
+        self.stdout.write(f"⏱  score all postings: p50 {score[0] * 1000:.2f}ms  p95 {score[1] * 1000:.2f}ms")
+        self.stdout.write(f"⏱  rank top {opts['limit']}:       p50 {rank[0] * 1000:.2f}ms  p95 {rank[1] * 1000:.2f}ms")
+
+        # the same answer from Python sets, as the per-posting path computes it
+        sets = [(pid, set(ids)) for pid, ids in postings]
+        sample = students[:max(1, len(students) // 20)]
+        python = self.time_each(lambda s: [(pid, len(ids & set(s))) for pid, ids in sets], sample)
+        self.stdout.write(f"🐍 Python sets:         p50 {python[0] * 1000:.2f}ms "
+                          f"({python[0] / score[0]:.0f}× slower)")
+
+        student = set(students[0])
+        posting_ids, matched, _, _ = matrix.score(students[0])
+        expected = {pid: len(set(ids) & student) for pid, ids in postings}
+        assert all(expected[int(p)] == int(m) for p, m in zip(posting_ids, matched)), "bitset scores disagree"
+
+        t0 = time.perf_counter()
+        for _ in range(opts["updates"]):
+            if rng.random() < 0.5:
+                matrix.set_posting(rng.randrange(1, opts["postings"] * 2), skill_set(opts["per_posting"]))
+            else:
+                matrix.remove_posting(rng.randrange(1, opts["postings"] + 1))
+        per_update = (time.perf_counter() - t0) / max(1, opts["updates"])
+        self.stdout.write(f"🔁 incremental insert/update/remove: {per_update * 1e6:.0f}µs each")
+
+    def time_each(self, fn, inputs):
+        timings = []
+        for arg in inputs:
+            t0 = time.perf_counter()
+            fn(arg)
+            timings.append(time.perf_counter() - t0)
+        timings.sort()
+        return statistics.median(timings), timings[max(0, int(len(timings) * 0.95) - 1)]
@@ -0,0 +1,92 @@
+# catalog/management/commands/bench_ner_backends.py
+"""
+Compare the PyTorch and ONNX/int8 NER backends on stored job descriptions:
+load time, resident memory, single-document latency, batched throughput,
+and how often the two agree on the extracted entities.
+
+The extraction cache is bypassed so both backends really run.
+
+Usage:
+  python manage.py bench_ner_backends [--limit 200] [--model dslim/bert-base-NER]
+"""
+import resource
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.chunking import chunked_ner
+from catalog.inference import NER_MODEL, get_ner_pipeline
+from catalog.models import RawDocument
+from catalog.normalize import ner_text
+
+
+def rss_mb():
+    """Current resident set size (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def entity_set(ents):
+    return {(e["entity_group"], e["word"].lower()) for e in ents}
+
+
+class Command(BaseCommand):
+    help = "Benchmark PyTorch vs ONNX int8 NER: latency, throughput, memory, agreement."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=200)
+        parser.add_argument("--model", default=NER_MODEL)
+        parser.add_argument("--batch-size", type=int, default=16)
+
+    def handle(self, *args, **opts):
+        texts = [
+            ner_text(doc.text) for doc in
+            RawDocument.objects.filter(postings__isnull=False).distinct().order_by("-id")[:opts["limit"]]
+        ]
+        texts = [t for t in texts if t]
+        if not texts:
+            self.stdout.write(self.style.WARNING("No job descriptions to benchmark against."))
+            return
+        self.stdout.write(f"📄 {len(texts)} descriptions, model {opts['model']}")
+
+        results = {}
+        for backend in ("torch", "onnx"):
+            before = rss_mb()
+            t0 = time.perf_counter()
+            pipe = get_ner_pipeline(opts["model"], backend)
+            load = time.perf_counter() - t0
+            memory = rss_mb() - before
+            pipe(texts[0][:200])                              # warm-up
+
+            latencies = []
+            for text in texts[:50]:
+                t0 = time.perf_counter()
+                chunked_ner(pipe, [text], batch_size=1)
+                latencies.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            ents = chunked_ner(pipe, texts, batch_size=opts["batch_size"])
+            throughput = len(texts) / (time.perf_counter() - t0)
+            results[backend] = [entity_set(e) for e in ents]
+
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+            self.stdout.write(
+                f"⏱  {backend:<5} load {load:5.1f}s  +{memory:6.0f} MB  "
+                f"p50 {statistics.median(latencies) * 1000:6.0f}ms  p95 {p95 * 1000:6.0f}ms  "
+                f"{throughput:6.1f} docs/sec"
+            )
+
+        same = union = 0
+        exact = 0
+        for a, b in zip(results["torch"], results["onnx"]):
+            same += len(a & b)
+            union += len(a | b)
+            exact += a == b
+        self.stdout.write(
+            f"🤝 agreement: {same / union if union else 1.0:.1%} entity Jaccard, "
+            f"{exact / len(texts):.1%} of documents identical"
+        )
@@ -0,0 +1,162 @@
+# catalog/management/commands/bench_skill_links.py
+"""
+Size and lookup latency of the posting ↔ skill link table, old layout vs new:
+
+  before  Django's auto-created through table: surrogate id, unique
+          (jobposting_id, skill_id), one index per column
+  after   JobPostingSkill: the same unique pair plus a (skill_id,
+          jobposting_id) index covering source/confidence (PostgreSQL),
+          no single-column indexes, provenance columns
+
+Both layouts are built as scratch tables in the configured database and
+filled with the same synthetic links (popular skills appear on many more
+postings), so the comparison needs no production data. Lookups are run
+with random keys; the scratch tables are dropped afterwards unless --keep.
+
+Usage:
+  python manage.py bench_skill_links [--postings 100000] [--per-posting 8] [--lookups 500]
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+BEFORE, AFTER = "bench_links_before", "bench_links_after"
+
+
+class Command(BaseCommand):
+    help = "Benchmark the JobPosting.skills link table layout (size and lookup latency), before vs after."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--postings", type=int, default=100_000)
+        parser.add_argument("--skills", type=int, default=5_000)
+        parser.add_argument("--per-posting", type=int, default=8, help="Average skills per posting")
+        parser.add_argument("--lookups", type=int, default=500, help="Random keys per query")
+        parser.add_argument("--seed", type=int, default=47)
+        parser.add_argument("--keep", action="store_true", help="Leave the scratch tables in place")
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        pg = connection.vendor == "postgresql"
+        links = self.generate(rng, opts)
+        self.stdout.write(f"🧪 {len(links)} links over {opts['postings']} postings / {opts['skills']} skills "
+                          f"({connection.vendor})")
+
+        try:
+            for table in (BEFORE, AFTER):
+                t0 = time.perf_counter()
+                self.create(table, pg)
+                self.fill(table, links, rng)
+                self.stdout.write(f"🏗  {table} built in {time.perf_counter() - t0:.1f}s")
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            self.stdout.write("")
+            for table in (BEFORE, AFTER):
+                size = self.sizes(table, pg)
+                self.stdout.write(f"💾 {table:<19} " + (
+                    f"table {size[0] / 2**20:7.1f} MB  indexes {size[1] / 2**20:7.1f} MB  "
+                    f"total {(size[0] + size[1]) / 2**20:7.1f} MB  "
+                    f"({(size[0] + size[1]) / len(links):.0f} B/link)" if size else "sizes n/a on this backend"
+                ))
+
+            skill_keys = [rng.choice(links)[1] for _ in range(opts["lookups"])]
+            posting_keys = [rng.choice(links) for _ in range(opts["lookups"])]
+            queries = [
+                ("postings needing skill", "SELECT jobposting_id FROM {t} WHERE skill_id = %s",
+                 [(s,) for s in skill_keys]),
+                ("… from one tier", "SELECT jobposting_id FROM {t} WHERE skill_id = %s AND source = 2",
+                 [(s,) for s in skill_keys]),
+                ("skills of posting", "SELECT skill_id FROM {t} WHERE jobposting_id = %s",
+                 [(p,) for p, _ in posting_keys]),
+                ("link exists", "SELECT 1 FROM {t} WHERE jobposting_id = %s AND skill_id = %s",
+                 posting_keys),
+            ]
+            self.stdout.write(f"\n{'lookup':<24} {'before p50':>11} {'p95':>9} {'after p50':>11} {'p95':>9}")
+            for label, sql, params in queries:
+                cells = []
+                for table in (BEFORE, AFTER):
+                    if table == BEFORE and "source" in sql:
+                        cells.append(f"{'(no column)':>11} {'':>9}")   # needs a join to the extraction log
+                        continue
+                    p50, p95 = self.time_query(sql.format(t=table), params)
+                    cells.append(f"{p50 * 1000:9.3f}ms {p95 * 1000:7.3f}ms")
+                self.stdout.write(f"{label:<24} " + " ".join(cells))
+        finally:
+            if not opts["keep"]:
+                with connection.cursor() as cursor:
+                    for table in (BEFORE, AFTER):
+                        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    # ─── data ───────────────────────────────────────────────────────────────────
+    def generate(self, rng, opts):
+        weights = [1.0 / (i + 1) ** 0.8 for i in range(opts["skills"])]
+        links = []
+        for posting in range(1, opts["postings"] + 1):
+            k = max(1, int(rng.gauss(opts["per_posting"], 2)))
+            for skill in set(rng.choices(range(1, opts["skills"] + 1), weights, k=k)):
+                links.append((posting, skill))
+        return links
+
+    def create(self, table, pg):
+        serial = "bigserial PRIMARY KEY" if pg else "integer PRIMARY KEY AUTOINCREMENT"
+        extra = ", source smallint NOT NULL DEFAULT 0, confidence smallint NULL" if table == AFTER else ""
+        statements = [
+            f"DROP TABLE IF EXISTS {table}",
+            f"CREATE TABLE {table} (id {serial}, jobposting_id bigint NOT NULL, "
+            f"skill_id bigint NOT NULL{extra}, UNIQUE (jobposting_id, skill_id))",
+        ]
+        if table == BEFORE:
+            statements += [f"CREATE INDEX {table}_posting ON {table} (jobposting_id)",
+                           f"CREATE INDEX {table}_skill ON {table} (skill_id)"]
+        else:
+            include = " INCLUDE (source, confidence)" if pg else ""
+            statements.append(f"CREATE INDEX {table}_reverse ON {table} (skill_id, jobposting_id){include}")
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def fill(self, table, links, rng, batch=10_000):
+        if table == AFTER:
+            sql = f"INSERT INTO {table} (jobposting_id, skill_id, source, confidence) VALUES (%s, %s, %s, %s)"
+            rows = [(p, s, rng.choice((1, 2, 2, 3)), rng.randrange(50, 100)) for p, s in links]
+        else:
+            sql = f"INSERT INTO {table} (jobposting_id, skill_id) VALUES (%s, %s)"
+            rows = links
+        with transaction.atomic(), connection.cursor() as cursor:
+            for lo in range(0, len(rows), batch):
+                cursor.executemany(sql, rows[lo:lo + batch])
+
+    # ─── measurements ───────────────────────────────────────────────────────────
+    def sizes(self, table, pg):
+        """(table bytes, index bytes), or None where the backend can't tell."""
+        with connection.cursor() as cursor:
+            if pg:
+                cursor.execute("SELECT pg_table_size(%s), pg_indexes_size(%s)", [table, table])
+                return cursor.fetchone()
+            if connection.vendor == "sqlite":
+                try:
+                    cursor.execute(
+                        "SELECT SUM(CASE WHEN name = %s THEN pgsize ELSE 0 END), "
+                        "SUM(CASE WHEN name != %s THEN pgsize ELSE 0 END) FROM dbstat "
+                        "WHERE name = %s OR name IN (SELECT name FROM sqlite_master "
+                        "WHERE type = 'index' AND tbl_name = %s)",
+                        [table, table, table, table],
+                    )
+                    return cursor.fetchone()
+                except Exception:       # SQLite built without the dbstat table
+                    return None
+        return None
+
+    def time_query(self, sql, params):
+        timings = []
+        with connection.cursor() as cursor:
+            for args in params:
+                t0 = time.perf_counter()
+                cursor.execute(sql, args)
+                cursor.fetchall()
+                timings.append(time.perf_counter() - t0)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
@@ -0,0 +1,56 @@
+# catalog/management/commands/build_gazetteer.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog import gazetteer
+from catalog.models import JobPosting
+
+
+class Command(BaseCommand):
+    help = (
+        "Build (or top up) the persisted Skill gazetteer used for dictionary "
+        "skill matching, and optionally measure its matching throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild", action="store_true",
+            help="Discard the persisted gazetteer and compile it from scratch"
+        )
+        parser.add_argument(
+            "--benchmark", type=int, default=0, metavar="N",
+            help="Match N stored job descriptions and report docs/sec"
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            gazetteer.invalidate()
+
+        t0 = time.perf_counter()
+        gz = gazetteer.get_gazetteer()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Gazetteer ready: {len(gz)} patterns for {len(gz.names)} skills "
+            f"in {time.perf_counter() - t0:.2f}s → {gz.path()}"
+        ))
+
+        n = options["benchmark"]
+        if not n:
+            return
+        texts = list(
+            JobPosting.objects.exclude(cleaned_description="")
+                      .values_list("cleaned_description", flat=True)[:n]
+        )
+        if not texts:
+            self.stdout.write(self.style.WARNING("No job descriptions to benchmark against."))
+            return
+
+        chars = sum(len(t) for t in texts)
+        t0 = time.perf_counter()
+        hits = sum(len(gz.match_ids(t)) for t in texts)
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(
+            f"⏱  {len(texts)} descriptions ({chars / len(texts):.0f} chars avg) in {elapsed:.3f}s "
+            f"→ {len(texts) / elapsed:,.0f} docs/sec, {hits / len(texts):.1f} skills/doc"
+        )
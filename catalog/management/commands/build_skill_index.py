@@ -0,0 +1,48 @@
+# catalog/management/commands/build_skill_index.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog import semantic
+
+
+class Command(BaseCommand):
+    help = (
+        "Build or incrementally update the FAISS vector index over Skill names "
+        "(all-MiniLM-L6-v2), and optionally query it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild", action="store_true",
+            help="Re-embed every skill instead of only new/renamed ones"
+        )
+        parser.add_argument(
+            "--query", "-q", action="append", default=[],
+            help="Show nearest skills for this text (repeatable), e.g. -q ML"
+        )
+        parser.add_argument("-k", type=int, default=5, help="Neighbours per query")
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        if options["rebuild"]:
+            index = semantic.SkillVectorIndex()
+            index.refresh(full=True)
+            index.save()
+            semantic._instance = index
+            semantic._stale_path().unlink(missing_ok=True)
+        else:
+            index = semantic.get_index(refresh=True)
+            semantic.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(index)} skill vectors ready in {time.perf_counter() - t0:.2f}s → {index.path()}"
+        ))
+
+        for q in options["query"]:
+            t0 = time.perf_counter()
+            hits = index.nearest([q], k=options["k"])[0]
+            ms = (time.perf_counter() - t0) * 1000
+            self.stdout.write(f"\n🔍 {q!r} ({ms:.1f} ms)")
+            for sid, name, score in hits:
+                self.stdout.write(f"   {score:.3f}  {name} (id={sid})")
@@ -0,0 +1,247 @@
+# catalog/management/commands/dedupe_skills.py
+"""
+Offline Skill de-duplication.
+
+1. Block: skills with the same normalized key ("Python", "python ", "PYTHON")
+   are the same skill outright. Digits stay in the key.
+2. Score: the remaining distinct keys are compared with character 3-gram
+   TF-IDF cosine, computed as chunked sparse matrix products, so only pairs
+   that share n-grams are ever scored. Pairs whose digit runs differ
+   ("ISO 9001" / "ISO 27001", "Windows 10" / "Windows 11") never join,
+   however similar the rest of the name is.
+3. Cluster: pairs ≥ --threshold are joined with union-find; each cluster's
+   canonical skill is the most referenced one.
+
+Cluster labels (the canonical name) are written to Skill.clusters. With
+--merge, every M2M through table that points at Skill is rewritten in bulk
+to the canonical skill, duplicate names become SkillAliases, and the
+duplicates are deleted.
+
+Usage:
+  python manage.py dedupe_skills [--threshold 0.85] [--merge] [--dry-run]
+"""
+import re
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from catalog.models import JobPosting, JobPostingSkill, Skill, SkillAlias, StudentProfile
+from catalog.normalize import skill_key
+from catalog.skill_arrays import refresh_skill_ids
+
+
+DIGIT_RUN = re.compile(r"\d+")
+
+
+def skill_through_tables():
+    """(through_model, owner_column, skill_column) for every M2M pointing at Skill."""
+    out = []
+    for rel in Skill._meta.get_fields():
+        if not (rel.many_to_many and rel.auto_created):
+            continue
+        through = rel.through
+        skill_col = owner_col = None
+        for f in through._meta.get_fields():
+            if not f.many_to_one:
+                continue
+            if f.related_model is Skill:
+                skill_col = f.attname
+            else:
+                owner_col = f.attname
+        out.append((through, owner_col, skill_col))
+    return out
+
+
+PROVENANCE = ("source", "confidence")
+
+
+def confidence_rank(prov):
+    """Order (source, confidence) pairs: unknown confidence below any score."""
+    source, confidence = prov
+    return (-1 if confidence is None else confidence, source != JobPostingSkill.UNKNOWN)
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def similar_pairs(keys, threshold, chunk=2000):
+    """Index pairs (i, j), i < j, whose char-3-gram cosine ≥ threshold."""
+    if len(keys) < 2:
+        return []
+    vec = TfidfVectorizer(
+        analyzer="char_wb", ngram_range=(3, 3),
+        max_df=max(200, len(keys) // 50), dtype=np.float32,
+    )
+    X = vec.fit_transform(keys).tocsr()
+    Xt = X.T.tocsc()
+    pairs = []
+    for lo in range(0, X.shape[0], chunk):
+        sims = (X[lo:lo + chunk] @ Xt).tocoo()
+        rows = sims.row + lo
+        mask = (sims.data >= threshold) & (rows < sims.col)
+        pairs.extend(zip(rows[mask].tolist(), sims.col[mask].tolist()))
+    return pairs
+
+
+class Command(BaseCommand):
+    help = "Cluster near-duplicate Skills, label Skill.clusters, and optionally merge them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=0.85,
+                            help="Char-n-gram cosine at which two skills are duplicates")
+        parser.add_argument("--merge", action="store_true",
+                            help="Rewrite all Skill M2M rows to the canonical skill and delete duplicates")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only report clusters; write nothing")
+        parser.add_argument("--show", type=int, default=20,
+                            help="How many of the largest clusters to print")
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        rows = list(Skill.objects.values_list("id", "name"))
+        self.stdout.write(f"🔍 {len(rows)} skills loaded")
+
+        # 1) exact blocking on the normalized key; versions and standards
+        #    differ only in their digits, so those are kept
+        by_key = defaultdict(list)
+        for sid, name in rows:
+            by_key[skill_key(name)].append(sid)
+        keys = list(by_key)
+
+        # 2) vectorized n-gram similarity between distinct keys, never across digit runs
+        digits = [DIGIT_RUN.findall(key) for key in keys]
+        uf = UnionFind(len(keys))
+        pairs = [(i, j) for i, j in similar_pairs(keys, opts["threshold"]) if digits[i] == digits[j]]
+        for i, j in pairs:
+            uf.union(i, j)
+        self.stdout.write(f"   {len(keys)} distinct keys, {len(pairs)} similar key pairs "
+                          f"({time.perf_counter() - t0:.1f}s)")
+
+        clusters = defaultdict(list)
+        for i, key in enumerate(keys):
+            clusters[uf.find(i)].extend(by_key[key])
+        clusters = [ids for ids in clusters.values() if len(ids) > 1]
+        if not clusters:
+            self.stdout.write(self.style.SUCCESS("✅ No duplicate skills found."))
+            return
+
+        # 3) canonical = most referenced across all through tables, then shortest name
+        usage = defaultdict(int)
+        tables = skill_through_tables()
+        for through, _, skill_col in tables:
+            for sid, n in through.objects.values_list(skill_col).annotate(n=Count("pk")):
+                usage[sid] += n
+        names = dict(rows)
+        canonical = {}
+        for ids in clusters:
+            head = min(ids, key=lambda i: (-usage[i], len(names[i]), i))
+            for i in ids:
+                canonical[i] = head
+
+        clusters.sort(key=len, reverse=True)
+        dupes = sum(len(c) - 1 for c in clusters)
+        self.stdout.write(f"🧩 {len(clusters)} clusters covering {dupes} duplicate skills")
+        for ids in clusters[:opts["show"]]:
+            head = canonical[ids[0]]
+            others = ", ".join(names[i] for i in ids if i != head)
+            self.stdout.write(f"   {names[head]}  ←  {others}")
+
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("Dry run: nothing written."))
+            return
+
+        with transaction.atomic():
+            # 4) cluster labels
+            label_skills = Skill.objects.in_bulk(list(canonical))
+            for sid, skill in label_skills.items():
+                skill.clusters = names[canonical[sid]][:200]
+            Skill.objects.bulk_update(label_skills.values(), ["clusters"], batch_size=1000)
+            self.stdout.write(f"🏷  Labelled {len(label_skills)} skills")
+
+            if opts["merge"]:
+                self.merge(canonical, names, tables)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Done in {time.perf_counter() - t0:.1f}s"))
+
+    def merge(self, canonical, names, tables):
+        remap = {dup: head for dup, head in canonical.items() if dup != head}
+        dup_ids = list(remap)
+
+        # rewrite every through table: add (owner, canonical), then drop (owner, dup)
+        touched = {}
+        for through, owner_col, skill_col in tables:
+            # posting links carry provenance; a merged link keeps its most confident one
+            extra = PROVENANCE if through is JobPostingSkill else ()
+            rows = (through.objects.filter(**{f"{skill_col}__in": dup_ids})
+                    .values_list(owner_col, skill_col, *extra))
+            new = {}
+            for owner, sid, *prov in rows.iterator():
+                key = (owner, remap[sid])
+                if key not in new or confidence_rank(prov) > confidence_rank(new[key]):
+                    new[key] = prov
+            upgraded = self.upgrade_links(through, owner_col, skill_col, new) if extra else 0
+            through.objects.bulk_create(
+                [through(**{owner_col: owner, skill_col: sid}, **dict(zip(extra, prov)))
+                 for (owner, sid), prov in new.items()],
+                batch_size=5000, ignore_conflicts=True,
+            )
+            deleted, _ = through.objects.filter(**{f"{skill_col}__in": dup_ids}).delete()
+            self.stdout.write(f"   {through._meta.db_table}: {len(new)} rows re-pointed "
+                              f"({upgraded} kept a duplicate's higher confidence), {deleted} removed")
+            touched[through] = {owner for owner, _ in new}
+
+        # bulk writes skip m2m_changed, and the duplicates' pre_delete finds no links left
+        for model in (JobPosting, StudentProfile):
+            if touched.get(model.skills.through):
+                refresh_skill_ids(model, touched[model.skills.through])
+
+        # keep the old spellings matchable as aliases of the canonical skill
+        by_head = defaultdict(list)
+        for dup, head in remap.items():
+            by_head[head].append(dup)
+        for head, dups in by_head.items():
+            SkillAlias.objects.filter(skill_id__in=dups).update(skill_id=head)
+        taken = set(SkillAlias.objects.filter(alias__in=[names[d] for d in dup_ids])
+                    .values_list("alias", flat=True))
+        SkillAlias.objects.bulk_create(
+            [SkillAlias(skill_id=head, alias=names[dup].strip()) for dup, head in remap.items()
+             if names[dup] not in taken],
+            batch_size=5000, ignore_conflicts=True,
+        )
+
+        Skill.objects.filter(id__in=dup_ids).delete()
+        self.stdout.write(f"🔀 Merged {len(dup_ids)} duplicates into {len(set(remap.values()))} skills")
+
+    def upgrade_links(self, through, owner_col, skill_col, new):
+        """
+        Where an owner already links the canonical skill, take the duplicate's
+        source/confidence if it is more confident. Returns #rows updated.
+        """
+        existing = (through.objects
+                    .filter(**{f"{owner_col}__in": {o for o, _ in new}, f"{skill_col}__in": {s for _, s in new}})
+                    .values_list("pk", owner_col, skill_col, *PROVENANCE))
+        better = []
+        for pk, owner, sid, *prov in existing.iterator():
+            dup = new.get((owner, sid))
+            if dup is not None and confidence_rank(dup) > confidence_rank(prov):
+                better.append(through(pk=pk, **dict(zip(PROVENANCE, dup))))
+        through.objects.bulk_update(better, list(PROVENANCE), batch_size=5000)
+        return len(better)
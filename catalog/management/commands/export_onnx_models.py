@@ -0,0 +1,31 @@
+# catalog/management/commands/export_onnx_models.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.inference import NER_MODEL, SKILL_NER_MODEL, export_onnx
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the NER models to ONNX with int8 dynamic quantization for the "
+        "onnxruntime backend (settings.NER_BACKEND = \"onnx\")."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", action="append", dest="models",
+            help=f"Model to export (repeatable; default: {NER_MODEL} and {SKILL_NER_MODEL})"
+        )
+        parser.add_argument("--no-quantize", action="store_true", help="Keep fp32 weights")
+        parser.add_argument("--force", action="store_true", help="Re-export even if present")
+
+    def handle(self, *args, **opts):
+        for model in opts["models"] or [NER_MODEL, SKILL_NER_MODEL]:
+            t0 = time.perf_counter()
+            path = export_onnx(model, quantize=not opts["no_quantize"], force=opts["force"])
+            size = (path / "model.onnx").stat().st_size / 1e6
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {model} → {path} ({size:.0f} MB, {time.perf_counter() - t0:.1f}s)"
+            ))
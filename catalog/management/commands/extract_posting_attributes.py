@@ -0,0 +1,78 @@
+# catalog/management/commands/extract_posting_attributes.py
+"""
+Backfill JobPosting.min_years_experience / education_level / employment_type
+(and, with --skills, gazetteer skills) from cleaned_description, one
+tokenization per posting.
+
+Usage:
+  python manage.py extract_posting_attributes [--missing] [--skills] [--batch-size 500]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog.gazetteer import get_gazetteer
+from catalog.models import JobPosting
+from catalog.posting_attributes import extract_posting
+from catalog.skill_arrays import refresh_skill_ids
+
+FIELDS = ["min_years_experience", "education_level", "employment_type"]
+
+
+class Command(BaseCommand):
+    help = "Parse experience, education and employment type out of stored job descriptions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--missing", action="store_true",
+                            help="Only postings with no attribute set yet")
+        parser.add_argument("--skills", action="store_true",
+                            help="Also link gazetteer-matched skills found in the same pass")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        qs = JobPosting.objects.exclude(cleaned_description="").order_by("id")
+        if opts["missing"]:
+            qs = qs.filter(min_years_experience__isnull=True, education_level__isnull=True,
+                           employment_type="")
+        gz = get_gazetteer() if opts["skills"] else None
+        Through = JobPosting.skills.through
+
+        t0 = time.perf_counter()
+        seen = changed = links = 0
+        batch, new_links = [], []
+        for posting in qs.only("id", "cleaned_description", *FIELDS).iterator(chunk_size=opts["batch_size"]):
+            seen += 1
+            profile = extract_posting(posting.cleaned_description, gz)
+            if any(getattr(posting, f) != v for f, v in profile.attributes.items()):
+                for f, v in profile.attributes.items():
+                    setattr(posting, f, v)
+                batch.append(posting)
+            new_links.extend(Through(jobposting_id=posting.id, skill_id=sid, source=Through.GAZETTEER)
+                             for sid in profile.skill_ids)
+            if len(batch) >= opts["batch_size"] or len(new_links) >= 10 * opts["batch_size"]:
+                changed += len(batch)
+                links += self.flush(batch, new_links)
+                batch, new_links = [], []
+        changed += len(batch)
+        links += self.flush(batch, new_links)
+
+        counts = {f: JobPosting.objects.exclude(**{f: None if f != "employment_type" else ""}).count()
+                  for f in FIELDS}
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {seen} postings scanned in {time.perf_counter() - t0:.2f}s, {changed} updated"
+            + (f", {links} gazetteer skill links (existing ones kept)" if gz is not None else "")
+        ))
+        for f, n in counts.items():
+            self.stdout.write(f"   {f:<22} set on {n} postings")
+
+    @staticmethod
+    def flush(batch, new_links):
+        with transaction.atomic():
+            if batch:
+                JobPosting.objects.bulk_update(batch, FIELDS)
+            if not new_links:
+                return 0
+            offered = len(JobPosting.skills.through.objects.bulk_create(new_links, ignore_conflicts=True))
+            refresh_skill_ids(JobPosting, {link.jobposting_id for link in new_links})
+            return offered
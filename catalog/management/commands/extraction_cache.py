@@ -0,0 +1,42 @@
+# catalog/management/commands/extraction_cache.py
+
+from django.core.management.base import BaseCommand
+
+from catalog.extraction_cache import get_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit statistics for the persistent extraction cache, or clear it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clear", nargs="?", const="", default=None, metavar="EXTRACTOR",
+            help="Delete cached results (all, or only those of one extractor, e.g. 'ner')"
+        )
+
+    def handle(self, *args, **options):
+        cache = get_cache()
+        if options["clear"] is not None:
+            cache.clear(options["clear"] or None)
+            self.stdout.write(self.style.SUCCESS(
+                f"🧹 Cleared {options['clear'] or 'all'} cached extractions"
+            ))
+
+        rows = cache.summary()
+        if not rows:
+            self.stdout.write(f"Extraction cache at {cache.path} is empty.")
+            return
+        self.stdout.write(f"📦 {cache.path} (max {cache.max_entries:,} entries)")
+        total_rows = total_hits = 0
+        for extractor, version, n, hits, size in rows:
+            total_rows += n
+            total_hits += hits or 0
+            self.stdout.write(
+                f"   {extractor:<12} {version[:40]:<40} {n:>8,} entries  "
+                f"{hits or 0:>8,} hits  {(size or 0) / 1e6:7.1f} MB"
+            )
+        # every entry was one miss when it was stored
+        self.stdout.write(
+            f"   lifetime hit rate {total_hits / (total_hits + total_rows):.0%} "
+            f"({total_hits:,} model calls avoided)"
+        )
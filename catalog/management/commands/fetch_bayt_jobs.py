@@ -1,3 +1,5 @@
+import hashlib
+import ntpath
 import time
 import random
 import re
@@ -12,72 +14,59 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
-from llama_cpp import Llama
-from transformers import pipeline, logging as hf_logging
-from catalog.models import JobField, JobPosting, Skill
-
-# Quiet HuggingFace info/warnings
-hf_logging.set_verbosity_error()
-
-# Initialize local GGUF Llama model
-llm = Llama(
-    model_path=r"C:\Users\aurakcyber5\Downloads\mistral-7b-instruct-v0.2-dare.Q5_K_M.gguf",
-    n_ctx=2048,
-    verbose=False
-)
-
-def clean_ner_entities(ner_outputs: list[dict]) -> list[str]:
-    ALLOWED_SHORT = {"c", "r", "ai", "go", "js"}
-    cleaned = []
-    for ent in ner_outputs:
-        w = ent.get("word", "").strip()
-        if not w or w.startswith("##"):
-            continue
-        lw = w.lower()
-        if len(lw) < 3 and lw not in ALLOWED_SHORT:
-            continue
-        w = re.sub(r"[^\w\s\+\#\.\-]", "", w)
-        w = re.sub(r"\s{2,}", " ", w).strip()
-        if w:
-            cleaned.append(w)
-    seen = {}
-    for w in cleaned:
-        k = w.lower()
-        if k not in seen:
-            seen[k] = w
-    return list(seen.values())
+from functools import lru_cache
+
+from catalog.extraction import ExtractionCascade
+from catalog.extraction_cache import get_cache
+from catalog.llm import llama_json, schema_version, skill_list_schema
+from catalog.models import JobField, JobPosting, RawDocument, Skill
+from catalog.normalize import fit_many, normalize_many
+from catalog.posting_attributes import extract_attributes, merge_attributes
+from catalog.services import link_posting_skills
+
+LLM_MODEL_PATH = r"C:\Users\aurakcyber5\Downloads\mistral-7b-instruct-v0.2-dare.Q5_K_M.gguf"
+
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """Load the local GGUF Llama model on first use (skipped entirely if the cascade never escalates)."""
+    from llama_cpp import Llama
+
+    return Llama(model_path=LLM_MODEL_PATH, n_ctx=2048, verbose=False)
+
+
+REFINE_PROMPT = """You are a skills-extraction assistant.
+Read the following Skills section and list the individual skill keywords it names.
+Answer as JSON: {{"skills": ["...", "..."]}}
+{text}
+"""
+REFINE_SCHEMA = skill_list_schema(max_skills=15)
 
 
 def refine_skills_llm(bullets: list[str]) -> list[str]:
     """
     Use the GGUF model to refine raw bullet list into
     a clean list of skill keywords.
-    Handles comma-, newline-, and dash-separated output.
+    Decoding is constrained to REFINE_SCHEMA (a JSON list of short strings)
+    with a max_tokens budget derived from it; a reply cut off at the budget
+    or off-schema gives None (not cached).
+    The parsed list is cached per bullet text (catalog.extraction_cache).
     """
     text = "\n".join(bullets)
-    prompt = f"""You are a skills-extraction assistant.
-Read the following Skills section and output ONLY comma-separated skill keywords, just give the texts only.
-{text}
-"""
+    version = (f"{ntpath.basename(LLM_MODEL_PATH)}/"
+               f"{hashlib.sha256(REFINE_PROMPT.encode()).hexdigest()[:8]}-{schema_version(REFINE_SCHEMA)}")
+
+    def complete(text):
+        parsed = llama_json(get_llm(), REFINE_PROMPT.format(text=text), REFINE_SCHEMA, task="bayt_refine")
+        skills = parsed.get("skills") if isinstance(parsed, dict) else None
+        if not isinstance(skills, list):
+            return None     # cut off or off-schema: not cached, retried next run
+        return [s for s in skills if isinstance(s, str)]
 
-    out = llm(
-        prompt=prompt,
-        max_tokens=128,
-        temperature=0.0,
-    )
-    raw = out["choices"][0]["text"].strip()
-    # Remove any “Skills:” or “Output:” prefix
-    cleaned = re.sub(r'^(Skills:|Output:)\s*', '', raw, flags=re.IGNORECASE)
-
-    # Split on commas or newlines
-    parts = re.split(r"[,\n]+", cleaned)
-    skills = []
-    for part in parts:
-        # strip leading hyphens, bullets, whitespace
-        skill = re.sub(r'^[\-•\s]+', '', part).strip()
-        if skill:
-            skills.append(skill)
-    return skills
+    skills = get_cache().fetch("llama_cpp", version, text, complete) or []
+    # location/demographic words and "N-M years" ranges are dropped by the
+    # "llm" normalization profile
+    return normalize_many(skills, "llm")
 
 
 def parse_bayt_date(text: str):
@@ -108,6 +97,8 @@ class Command(BaseCommand):
         parser.add_argument("-l", "--location", type=str, default="Uae")
         parser.add_argument("-f", "--jobfield", type=str, default="Software Engineering")
         parser.add_argument("--max-jobs", type=int, default=20)
+        parser.add_argument("--tiers", type=str, default=None,
+                            help="Comma-separated extraction tiers, e.g. 'header,gazetteer,ner,llm'")
 
     def handle(self, *args, **opts):
         query = opts["query"]
@@ -116,7 +107,11 @@ class Command(BaseCommand):
         max_jobs = opts["max_jobs"]
 
         jf, _ = JobField.objects.get_or_create(name=jobfield)
-        ner = pipeline("ner", model="dslim/bert-base-NER", grouped_entities=True)
+        # LLM refines the header bullets when present, else whatever cheaper tiers found
+        cascade = ExtractionCascade(
+            tiers=opts["tiers"].split(",") if opts["tiers"] else None,
+            llm=lambda text, found, bullets: refine_skills_llm(bullets or found or [text]),
+        )
 
         EDGE_DRIVER = r"C:\Users\aurakcyber5\Documents\edgedriver_win32_\msedgedriver.exe"
         service = EdgeService(executable_path=EDGE_DRIVER)
@@ -132,11 +127,7 @@ class Command(BaseCommand):
             return el.get_text(" · ", strip=True) if el else ""
 
         headings = [r"Skills", r"Essential", r"Desirable", r"Key Skills & Requirements"]
-        DEMOG = re.compile(r"age|male|female|residing|national", flags=re.I)
-        NON_SKILLS = re.compile(
-            r"\b(abu dhabi|dubai|uae|national|male|female|\d{1,2}[\-–]\d{1,2} years?)\b",
-            flags=re.I
-        )
+        MAX_LEN = Skill._meta.get_field("name").max_length
 
         try:
             slug = query.lower().replace(" ", "-")
@@ -178,16 +169,15 @@ class Command(BaseCommand):
                 if not panel:
                     continue
 
-                bullets = extract_bullets(panel, headings)
-                bullets = [b for b in bullets if not DEMOG.search(b)]
-                if not bullets:
-                    ents = ner(panel.get_text(" ", strip=True))
-                    bullets = clean_ner_entities(ents)
+                bullets = normalize_many(extract_bullets(panel, headings), "bullet")
+                result = cascade.extract(panel.get_text(" ", strip=True), bullets=bullets)
+                refined = fit_many(result.skills, MAX_LEN)
 
-                raw_refined = refine_skills_llm(bullets)
-                refined = [s for s in raw_refined if not NON_SKILLS.search(s)]
+                # the scraped "type · level · experience" line beats the free text
+                employment = gt(panel, "div[data-automation-id='id_type_level_experience'] .u-stretch")
+                attributes = merge_attributes(extract_attributes(employment, strict=False), result.attributes)
 
-                self.stdout.write("\nRefined Skills:")
+                self.stdout.write(f"\nRefined Skills ({result.tier or 'unsettled'}):")
                 for sk in refined:
                     self.stdout.write(f" • {sk}")
 
@@ -196,16 +186,21 @@ class Command(BaseCommand):
                     "company": gt(panel, ".toggle-head a.t-default"),
                     "location": location_text,
                     "date_posted": parse_bayt_date(gt(panel, "#jb-widget-posted-date")),
-                    "employment": gt(panel, "div[data-automation-id='id_type_level_experience'] .u-stretch"),
+                    "employment": employment,
+                    "attributes": attributes,
                     "industry": gt(panel, "div[data-automation-id='id_company_employees_industry'] .u-stretch"),
                     "raw_html": str(panel),
                     "cleaned_description": BeautifulSoup(str(panel), "html.parser").get_text("\n\n", strip=True),
                     "skills": bullets,
                     "refined_skills": refined,
+                    "tier": result.tier,
+                    "result": result,
                 })
 
                 time.sleep(random.uniform(1, 2))
 
+            self.stdout.write("\n" + cascade.report())
+
             if input("\nSave these to the database? (y/N): ").strip().lower() == "y":
                 cnt = 0
                 for job in scraped:
@@ -214,13 +209,12 @@ class Command(BaseCommand):
                         company_name=job["company"],
                         location=job["location"],
                         job_field=jf,
-                        raw_description=job["raw_html"],
+                        raw_document=RawDocument.store(job["raw_html"]),
                         cleaned_description=job["cleaned_description"],
                         date_posted=job["date_posted"],
+                        **job["attributes"],
                     )
-                    for sk in job["refined_skills"]:
-                        so, _ = Skill.objects.get_or_create(name=sk)
-                        jp.skills.add(so)
+                    link_posting_skills(jp, job["refined_skills"], job["result"])
                     jp.save()
                     cnt += 1
 
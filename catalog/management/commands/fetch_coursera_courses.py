@@ -24,7 +24,9 @@ from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 from tqdm import tqdm
 
+from catalog.extraction import ExtractionCascade
 from catalog.models import Course, Skill, Certification
+from catalog.services import resolve_skills
 from catalog.utils.llm_extractor import extract_skills_and_certs
 
 
@@ -44,6 +46,10 @@ class Command(BaseCommand):
             "--max-scrolls", type=int, default=10,
             help="Max scroll attempts when collecting URLs"
         )
+        parser.add_argument(
+            "--tiers", type=str, default="gazetteer,llm",
+            help="Comma-separated extraction tiers (certifications only come from the llm tier)"
+        )
 
     def handle(self, *args, **options):
         query = options["query"]
@@ -115,6 +121,24 @@ class Command(BaseCommand):
 
         # 4) Visit each, extract description & run local model
         preview = []
+        last_certs = []
+
+        def llm_stage(text, found, bullets):
+            # Call local LLM extractor; keep its certifications for this course
+            try:
+                extracted = extract_skills_and_certs(
+                    text_input=text,
+                    domain="General",
+                    max_skills=10,
+                    max_certs=5
+                )
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  Extraction error: {e}"))
+                extracted = []
+            last_certs[:] = [e.get("certification") for e in extracted if e.get("certification")]
+            return [e.get("skill") for e in extracted]
+
+        cascade = ExtractionCascade(tiers=options["tiers"].split(","), llm=llm_stage)
         self.stdout.write("⏳ Scraping pages and extracting skills/certs...")
         for idx, url in enumerate(
                 tqdm(course_urls, desc="🔍 Scraping & extracting"),
@@ -136,21 +160,11 @@ class Command(BaseCommand):
 
             self.stdout.write(f"[{idx}] URL: {url} | Desc length: {len(raw_text)}")
 
-            # Call local LLM extractor
-            try:
-                extracted = extract_skills_and_certs(
-                    text_input=raw_text,
-                    domain="General",
-                    max_skills=10,
-                    max_certs=5
-                )
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"  Extraction error: {e}"))
-                extracted = []
-
-                skills_list = [e.get("skill") for e in extracted if e.get("skill")]
-                certs_list  = [e.get("certification") for e in extracted if e.get("certification")]
-
+            # Dictionary match first; Ollama only when it finds too little
+            last_certs.clear()
+            result = cascade.extract(raw_text)
+            skills_list = result.skills
+            certs_list  = list(last_certs)
 
             preview.append({
                 "url": url,
@@ -162,10 +176,12 @@ class Command(BaseCommand):
 
             self.stdout.write(
                 f"    Title: {driver.title}\n"
-                f"    Skills: {skills_list}\n"
+                f"    Skills ({result.tier or 'unsettled'}): {skills_list}\n"
                 f"    Certs:  {certs_list}"
             )
 
+        self.stdout.write("\n" + cascade.report())
+
         # 5) Confirm & save
         answer = input(f"\nSave {len(preview)} courses? [Y/n]: ")
         if answer.strip().lower() not in ("", "y", "yes"):
@@ -187,11 +203,7 @@ class Command(BaseCommand):
                 }
             )
             # Persist skills
-            for skill_name in item["skills"]:
-                if not skill_name:
-                    continue
-                sk, _ = Skill.objects.get_or_create(name=skill_name)
-                course_obj.skills.add(sk)
+            course_obj.skills.add(*resolve_skills(item["skills"]))
             # Persist certifications (skip None/empty)
             for cert_name in item["certs"]:
                 if cert_name:
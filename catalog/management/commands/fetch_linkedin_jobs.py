@@ -19,8 +19,11 @@ import requests
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 from django.core.management.base import BaseCommand
-from catalog.models import JobField, JobPosting, Skill
-from transformers import pipeline
+from catalog.blobs import content_digest
+from catalog.models import JobField, JobPosting, RawDocument, Skill
+from catalog.extraction import ExtractionCascade
+from catalog.normalize import fit_many
+from catalog.services import link_posting_skills
 import html
 
 # Browser-like headers
@@ -32,25 +35,6 @@ USER_AGENT = (
 # LinkedIn guest API endpoint for listings
 LISTING_API = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
 
-# Initialize NER pipeline once (no grouping; we'll post-process)
-NER_PIPELINE = pipeline(
-    "ner",
-    model="dslim/bert-base-NER",
-    aggregation_strategy="simple"
-)
-
-# List of unwanted terms to filter out from extracted skill-like NER entities.
-# You can extend this set with more terms you deem non-skills.
-UNWANTED_TERMS = {
-    # e.g. common company/location words you see incorrectly captured
-    "united arab emirates", "abudhabi", "dubai", "uae", "middle east",
-    # month/day terms that sometimes appear
-    "january", "february", "march", "april", "may", "june", "july",
-    "august", "september", "october", "november", "december",
-    # remove single common words if needed; adjust as you discover
-    # ...
-}
-
 def fetch_listings(keywords, location, start=0):
     """
     Fetch up to ~25 job cards via LinkedIn guest API.
@@ -141,53 +125,8 @@ def parse_relative_date_text(text):
                 return (datetime.today() - timedelta(days=30 * amount)).date()
     return None
 
-def clean_ner_entities(ner_outputs: list[dict]) -> list[str]:
-    """
-    Post-process HuggingFace NER output into a clean list of skill names.
-    - Drop tokens that start with '##' (subword fragments).
-    - Discard 1–2 letter tokens unless explicitly allowed.
-    - Remove stray punctuation (keep alphanumeric, +, #, ., -, and spaces).
-    - Deduplicate case-insensitively but preserve original casing for first occurrence.
-    - Filter out unwanted terms (from UNWANTED_TERMS) by whole-word match.
-    """
-    ALLOWED_SHORT = {"c", "r", "ai", "go", "js"}
-    cleaned = []
-    for ent in ner_outputs:
-        word = ent.get("word", "").strip()
-        if not word:
-            continue
-        # 1) Drop subword fragments
-        if word.startswith("##"):
-            continue
-        lower_word = word.lower()
-        # 2) Drop 1–2 char tokens unless allowed
-        if len(lower_word) < 3 and lower_word not in ALLOWED_SHORT:
-            continue
-        # 3) Remove stray punctuation except allowed ones
-        cleaned_word = re.sub(r"[^\w\s\+\#\.\-]", "", word)
-        # 4) Collapse whitespace
-        cleaned_word = re.sub(r"\s{2,}", " ", cleaned_word).strip()
-        if not cleaned_word:
-            continue
-        # 5) Filter out unwanted by exact lower-word match or if full phrase matches unwanted
-        lw = cleaned_word.lower()
-        # check if any unwanted term equals this or contained wholly:
-        if lw in UNWANTED_TERMS:
-            continue
-        # e.g., if unwanted term is multiple words, skip if cleaned_word equals it
-        # We do not drop if cleaned_word contains unwanted term as substring within a larger word, 
-        # but you may adjust here if desired.
-        cleaned.append(cleaned_word)
-    # Deduplicate case-insensitive
-    seen = {}
-    for w in cleaned:
-        key = w.lower()
-        if key not in seen:
-            seen[key] = w
-    return list(seen.values())
-
 class Command(BaseCommand):
-    help = "Fetch LinkedIn job postings and extract skills via NER, with full description extraction."
+    help = "Fetch LinkedIn job postings and extract skills (header → gazetteer → NER cascade), with full description extraction."
     def add_arguments(self, parser):
         parser.add_argument(
             "--query", "-q", type=str, default="Software Engineer",
@@ -205,6 +144,10 @@ class Command(BaseCommand):
             "--max-jobs", "-m", type=int, default=50,
             help="Max postings to fetch"
         )
+        parser.add_argument(
+            "--tiers", type=str, default=None,
+            help="Comma-separated extraction tiers to try, e.g. 'header,gazetteer,ner'"
+        )
 
     def handle(self, *args, **options):
         query = options["query"]
@@ -243,7 +186,8 @@ class Command(BaseCommand):
 
         # 3) Preview each: fetch details and show date, skills, cleaned description
         preview_data = []
-        ner = NER_PIPELINE
+        tiers = options["tiers"].split(",") if options["tiers"] else None
+        cascade = ExtractionCascade(tiers=tiers)
         for idx, job in enumerate(listings[:total], start=1):
             url = job['url']
             # Skip existing in DB if desired for preview? We'll preview anyway.
@@ -256,6 +200,9 @@ class Command(BaseCommand):
                     "url": url,
                     "date": None,
                     "skills": [],
+                    "tier": None,
+                    "result": None,
+                    "attributes": {},
                     "cleaned_description": "",
                     "raw_html": ""
                 })
@@ -340,8 +287,9 @@ class Command(BaseCommand):
                     if rel_elem:
                         date_posted = parse_relative_date_text(rel_elem.get_text(strip=True))
             
-            # 3d) First try to pick up an explicit “Skills” (or “Requirements”) section…
-            skills = []
+            # 3d) Pick up an explicit “Skills” (or “Requirements”) section if there is one;
+            #     the cascade only falls through to gazetteer/NER when it is thin
+            bullets = None
             header = soup.find(
                 lambda tag: tag.name in ("strong", "h3", "h4", "p")
                             and any(kw in tag.get_text(strip=True).lower() 
@@ -351,24 +299,22 @@ class Command(BaseCommand):
                 # look for a following <ul> of bullets
                 ul = header.find_next_sibling("ul")
                 if ul:
-                    skills = [li.get_text(strip=True) for li in ul.find_all("li")]
+                    bullets = [li.get_text(strip=True) for li in ul.find_all("li")]
                 else:
                     # or maybe comma-separated on the same line
                     after = header.get_text(separator=" ").split(":", 1)[-1]
-                    skills = [s.strip() for s in after.split(",") if s.strip()]
-            else:
-                # fallback to your NER pipeline
-                text_for_nlp = re.sub(r"[^\w\s\+\#\.\-]", " ",
-                                    cleaned_text.replace("\n", " "))
-                text_for_nlp = re.sub(r"\s{2,}", " ", text_for_nlp).strip()
-                entities = ner(text_for_nlp) if text_for_nlp else []
-                skills = clean_ner_entities(entities)
+                    bullets = after.split(",")
+            result = cascade.extract(cleaned_text, bullets=bullets)
+            skills = result.skills
 
             preview_data.append({
                 "index": idx,
                 "url": url,
                 "date": date_posted,
                 "skills": skills,
+                "tier": result.tier,
+                "result": result,
+                "attributes": result.attributes,
                 "cleaned_description": cleaned_text,
                 "raw_html": raw_html_snippet
             })
@@ -379,7 +325,7 @@ class Command(BaseCommand):
             idx = item["index"]
             date_str = item["date"].isoformat() if item["date"] else "Unknown"
             skills_str = ", ".join(item["skills"]) if item["skills"] else "None"
-            self.stdout.write(f" [{idx}] Date: {date_str} | Skills: {skills_str}")
+            self.stdout.write(f" [{idx}] Date: {date_str} | Skills ({item['tier'] or '-'}): {skills_str}")
             # Print cleaned description with indentation
             desc = item["cleaned_description"]
             if desc:
@@ -391,6 +337,8 @@ class Command(BaseCommand):
             else:
                 self.stdout.write("    Description: <empty>")
 
+        self.stdout.write("\n" + cascade.report())
+
         # 5) Ask user whether to persist to DB
         answer = input(f"\nSave these {len(preview_data)} postings? [Y/n]: ")
         if answer.strip().lower() not in ('y', 'yes', ''):
@@ -399,11 +347,13 @@ class Command(BaseCommand):
 
         # 6) Save to DB
         saved = 0
+        MAX_LEN = Skill._meta.get_field("name").max_length
         for item, job in zip(preview_data, listings[:total]):
             url = job['url']
             # Avoid duplicates by raw_description matching URL or raw_html?
             # Here we check URL; raw_description in DB was previously URL or HTML snippet.
-            if JobPosting.objects.filter(raw_description=url).exists():
+            # Documents are content-addressed, so this is a digest lookup.
+            if JobPosting.objects.filter(raw_document__digest=content_digest(url)).exists():
                 continue
             # Create posting
             flat_desc = item["cleaned_description"].replace("\n", " ")
@@ -412,26 +362,14 @@ class Command(BaseCommand):
                 company_name=job['company_name'],
                 job_field=job_field,
                 location=job['location'],
-                raw_description=item["raw_html"] or url,
+                raw_document=RawDocument.store(item["raw_html"] or url),
                 cleaned_description=flat_desc,
-                date_posted=item["date"]
+                date_posted=item["date"],
+                **item["attributes"],
             )
-            MAX_LEN = Skill._meta.get_field("name").max_length
-            for raw in item["skills"]:
-                raw = raw.strip()
-                # 1) Split on delimiters looking for a short chunk
-                parts = re.split(r"[\/\-\&]| and |, ", raw)
-                for candidate in parts:
-                    candidate = candidate.strip()
-                    if candidate and len(candidate) <= MAX_LEN:
-                        name = candidate
-                        break
-                else:
-                    # 2) If nothing fits, truncate at a word boundary
-                    name = raw[:MAX_LEN].rsplit(" ", 1)[0]
-
-                skill_obj, _ = Skill.objects.get_or_create(name=name)
-                posting.skills.add(skill_obj)
+            # Split/truncate over-long bullets so they fit Skill.name, then map
+            # onto existing skills (name/alias, else nearest neighbour) before creating
+            link_posting_skills(posting, fit_many(item["skills"], MAX_LEN), item["result"])
 
             saved += 1
         self.stdout.write(self.style.SUCCESS(f"💾 Saved {saved} postings."))
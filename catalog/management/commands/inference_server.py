@@ -0,0 +1,71 @@
+# catalog/management/commands/inference_server.py
+
+import os
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog import inference_daemon
+from catalog.inference import NER_MODEL, SKILL_NER_MODEL
+
+
+def _stop(*_):
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the resident inference worker: keeps NER, embedding, KeyBERT and "
+        "spaCy models loaded and serves batched requests over a Unix socket, so "
+        "ingest commands and backend/extract_catalog.py don't reload them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--socket", help="Socket path (default: settings.INFERENCE_SOCKET)")
+        parser.add_argument(
+            "--preload", default="ner,embed",
+            help="Comma-separated models to load at start-up: ner, embed, spacy"
+        )
+        parser.add_argument(
+            "--model", action="append", dest="models",
+            help=f"NER model to preload (repeatable; default: {NER_MODEL} and {SKILL_NER_MODEL})"
+        )
+        parser.add_argument("--ping", action="store_true", help="Query a running worker and exit")
+
+    def handle(self, *args, **opts):
+        if not inference_daemon.available():
+            raise CommandError("Unix sockets are not available on this platform.")
+        path = opts["socket"] or inference_daemon.socket_path()
+
+        if opts["ping"]:
+            status = inference_daemon.request("ping", path=path)
+            if status is None:
+                raise CommandError(f"No inference worker is listening on {path}")
+            self.stdout.write(
+                f"🟢 pid {status['pid']}, up {status['uptime'] / 60:.0f} min, "
+                f"{status['requests']} requests / {status['texts']} texts; "
+                f"loaded: {', '.join(status['loaded']) or 'nothing yet'}"
+            )
+            return
+
+        worker = inference_daemon.InferenceWorker()
+        try:
+            server = inference_daemon.make_server(path, worker)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        ops = {o.strip() for o in opts["preload"].split(",") if o.strip()}
+        self.stdout.write(f"⏳ Loading {', '.join(sorted(ops)) or 'nothing'}…")
+        worker.preload(ops, opts["models"] or [NER_MODEL, SKILL_NER_MODEL])
+
+        signal.signal(signal.SIGTERM, _stop)
+        self.stdout.write(self.style.SUCCESS(f"✅ Inference worker listening on {path} (Ctrl+C to stop)"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(path):
+                os.unlink(path)
+            self.stdout.write(f"🛑 Stopped after {worker.requests} requests.")
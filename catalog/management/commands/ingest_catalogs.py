@@ -0,0 +1,257 @@
+# catalog/management/commands/ingest_catalogs.py
+"""
+Ingest every catalog PDF in a directory in one run.
+
+  1. Header and course-code extraction fan out to a process pool, one PDF
+     per task (catalog.pdf_text.scan_catalog).
+  2. The union of course codes goes through catalog.courses.sync_courses
+     once: NER and KeyBERT each see every unique description in a single
+     batch, served by the resident inference worker (started here with
+     --spawn-worker when none is running; otherwise models load once in
+     this process).
+  3. Each major links its courses; its skills are their union. Prerequisite
+     edges between catalog courses and their closure are brought up to date
+     (catalog.prerequisites).
+
+Catalogs whose content hash and extractor version match the CatalogIngest
+manifest are skipped before any parsing; the rest are written as diffs
+(catalog.courses.replace_links), with courses, majors and manifest in one
+transaction so an interrupted run leaves the previous state intact.
+
+The run ends with a per-major report: scan time, courses, how many were
+inferred for this run vs shared/reused, skill count and link time.
+
+Usage:
+  python manage.py ingest_catalogs docs/ [--descriptions "docs/Course Descriptions.pdf"]
+                                         [--workers 4] [--spawn-worker] [--force] [--dry-run]
+"""
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from catalog import inference_daemon
+from catalog.extraction_cache import get_cache
+from catalog.pdf_text import course_entries, file_digest, scan_catalog
+
+DESCRIPTIONS_FILE = "Course Descriptions.pdf"
+
+
+def _init_worker():
+    # spawn-started workers (Windows/macOS) need settings for the extraction cache path
+    import django
+
+    django.setup()
+
+
+def _scan_catalog(path):
+    """scan_catalog() in a worker, with this task's extraction cache hits/misses for the parent's report."""
+    cache = get_cache()
+    cache.stats.clear()
+    scan = scan_catalog(path)
+    scan["cache_stats"] = {extractor: dict(st) for extractor, st in cache.stats.items()}
+    return scan
+
+
+class Command(BaseCommand):
+    help = "Parse all catalog PDFs in a directory in parallel and link their courses and skills."
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", type=Path, help="Directory of catalog PDFs (e.g. docs/)")
+        parser.add_argument("--descriptions", type=Path,
+                            help=f"Course descriptions PDF (default: <directory>/{DESCRIPTIONS_FILE})")
+        parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 8),
+                            help="Processes for PDF parsing")
+        parser.add_argument("--spawn-worker", action="store_true",
+                            help="Start `inference_server` for this run if none is listening")
+        parser.add_argument("--worker-timeout", type=float, default=300,
+                            help="Seconds to wait for a spawned worker to load its models")
+        parser.add_argument("--force", action="store_true",
+                            help="Re-ingest unchanged catalogs and re-infer skills for courses that already have them")
+        parser.add_argument("--dry-run", action="store_true", help="Infer and report, write nothing")
+
+    def handle(self, *args, **opts):
+        directory = opts["directory"]
+        descriptions = opts["descriptions"] or directory / DESCRIPTIONS_FILE
+        if not descriptions.exists():
+            raise CommandError(f"Course descriptions not found: {descriptions}")
+        catalogs = sorted(p for p in directory.glob("*.pdf") if p.resolve() != descriptions.resolve())
+        if not catalogs:
+            raise CommandError(f"No catalog PDFs in {directory}")
+
+        spawned = self.ensure_worker(opts) if opts["spawn_worker"] else None
+        try:
+            self.ingest(catalogs, descriptions, opts)
+        finally:
+            if spawned is not None:
+                spawned.terminate()
+                spawned.wait(timeout=30)
+                self.stdout.write("🛑 Stopped the spawned inference worker.")
+
+    # ─── the run ────────────────────────────────────────────────────────────────
+    def ingest(self, catalogs, descriptions, opts):
+        t_start = time.perf_counter()
+
+        # 0) skip what the manifest says is already ingested
+        from catalog.courses import extractor_version, unchanged_catalogs
+
+        version = extractor_version(file_digest(descriptions))
+        digests = {p: file_digest(p) for p in catalogs}
+        skipped = set() if opts["force"] else unchanged_catalogs(digests, version)
+        if skipped:
+            self.stdout.write(f"⏭  {len(skipped)} of {len(catalogs)} catalogs unchanged since the last ingest; "
+                              f"skipping (--force to redo)")
+        catalogs = [p for p in catalogs if p not in skipped]
+        if not catalogs:
+            self.stdout.write(self.style.SUCCESS("✅ Nothing to do."))
+            return
+
+        # 1) course descriptions (page-parallel, cached) + catalogs on the pool
+        t0 = time.perf_counter()
+        entries = course_entries(descriptions)
+        t_desc = time.perf_counter() - t0
+
+        # forked workers must not inherit this process's SQLite or database
+        # handles; each opens its own on first use
+        get_cache().close()
+        connections.close_all()
+
+        t0 = time.perf_counter()
+        scans = []
+        with ProcessPoolExecutor(max_workers=max(1, opts["workers"]), initializer=_init_worker) as pool:
+            futures = {pool.submit(_scan_catalog, str(p)): p for p in catalogs}
+            for future in as_completed(futures):
+                try:
+                    scan = future.result()
+                    get_cache().merge_stats(scan.pop("cache_stats"))
+                    scans.append(scan)
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f"⚠️  {futures[future].name}: {e}"))
+        scans.sort(key=lambda s: s["path"])
+        t_scan = time.perf_counter() - t0
+        self.stdout.write(
+            f"📄 {len(entries)} course descriptions in {t_desc:.2f}s; "
+            f"{len(scans)} catalogs scanned in {t_scan:.2f}s on {opts['workers']} processes"
+        )
+
+        # 2) each distinct course once, both models batched
+        known = {code.replace(" ", "") for code in entries}
+        for scan in scans:
+            scan["codes"] = [c for c in scan["codes"] if c.replace(" ", "") in known]
+        union = list(dict.fromkeys(c for scan in scans for c in scan["codes"]))
+        used_by = Counter(c for scan in scans for c in set(scan["codes"]))
+
+        t0 = time.perf_counter()
+        if opts["dry_run"]:
+            from catalog.courses import infer_skills_many
+
+            lookup = {c.replace(" ", ""): c for c in entries}
+            keys = [lookup[c.replace(" ", "")] for c in union]
+            names = dict(zip(union, infer_skills_many([entries[k]["description"] for k in keys])))
+            fresh = set(union)
+            unique = len({entries[k]["description"] for k in keys})
+        else:
+            from catalog.courses import plan_courses
+
+            synced = plan_courses(union, entries, force=opts["force"])
+            by_compact = {code.replace(" ", ""): code for code in synced.courses}
+            fresh = {c for c in union if by_compact.get(c.replace(" ", "")) in {x.code for x in synced.todo}}
+            unique = synced.unique_texts
+        t_infer = time.perf_counter() - t0
+        self.stdout.write(
+            f"🧠 {len(union)} distinct courses ({sum(used_by.values())} catalog listings): "
+            f"{len(fresh)} inferred from {unique} unique descriptions in {t_infer:.2f}s, "
+            f"{len(union) - len(fresh)} reused"
+        )
+
+        # 3) per-major linking; all writes in one transaction
+        rows = []
+        with transaction.atomic():
+            if not opts["dry_run"]:
+                from catalog.courses import apply_courses
+                from catalog.prerequisites import sync_prerequisites
+
+                apply_courses(synced)
+                added, removed = sync_prerequisites(entries)
+                self.stdout.write(f"🔗 prerequisites: +{added} / -{removed} edges")
+            for scan in scans:
+                t0 = time.perf_counter()
+                codes = scan["codes"]
+                if opts["dry_run"]:
+                    skills, diff = set().union(*(names[c] for c in codes)), (0, 0)
+                else:
+                    skills, diff = self.link(scan, synced, by_compact, digests, version)
+                rows.append((
+                    scan["major"], scan["seconds"], len(codes),
+                    sum(1 for c in codes if used_by[c] > 1), sum(1 for c in codes if c in fresh),
+                    len(skills), diff, time.perf_counter() - t0,
+                ))
+        self.report(rows)
+        self.stdout.write(get_cache().report())
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(rows)} majors in {time.perf_counter() - t_start:.1f}s"
+            + (" (dry run, nothing saved)" if opts["dry_run"] else "")
+        ))
+
+    def link(self, scan, synced, by_compact, digests, version):
+        from catalog.courses import link_major, record_ingest
+        from catalog.models import Major
+
+        major, _ = Major.objects.get_or_create(name=scan["major"])
+        major.department = scan["department"]
+        major.description = scan["description"]
+        major.save()
+        courses = [synced.courses[by_compact[c.replace(" ", "")]] for c in scan["codes"]]
+        skill_ids = set().union(*(synced.skills[c.code] for c in courses))
+        diff = link_major(major, courses, skill_ids)
+        path = Path(scan["path"])
+        record_ingest(path, digests[path], version, major, len(courses), len(skill_ids))
+        return skill_ids, diff
+
+    def report(self, rows):
+        width = max([len(r[0]) for r in rows] + [5])
+        self.stdout.write(
+            f"\n{'major':<{width}}  {'scan':>6}  {'courses':>7}  {'shared':>6}  "
+            f"{'inferred':>8}  {'skills':>6}  {'+/-':>9}  {'link':>6}"
+        )
+        for name, scan_s, courses, shared, inferred, skills, (added, removed), link_s in rows:
+            self.stdout.write(
+                f"{name:<{width}}  {scan_s:5.2f}s  {courses:>7}  {shared:>6}  "
+                f"{inferred:>8}  {skills:>6}  {f'+{added}/-{removed}':>9}  {link_s:5.2f}s"
+            )
+        self.stdout.write("")
+
+    # ─── shared inference worker ────────────────────────────────────────────────
+    def ensure_worker(self, opts):
+        """Start `manage.py inference_server` unless one answers; returns the process or None."""
+        if not inference_daemon.available():
+            self.stdout.write(self.style.WARNING("⚠️  No Unix sockets here; models run in this process."))
+            return None
+        if inference_daemon.request("ping") is not None:
+            self.stdout.write("🟢 Using the running inference worker.")
+            return None
+
+        proc = subprocess.Popen(
+            [sys.executable, str(Path(settings.BASE_DIR) / "manage.py"), "inference_server",
+             "--preload", "ner,embed"],
+            stdout=subprocess.DEVNULL,
+        )
+        self.stdout.write(f"⏳ Starting inference worker (pid {proc.pid})…")
+        deadline = time.monotonic() + opts["worker_timeout"]
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise CommandError("The inference worker exited during start-up.")
+            if os.path.exists(inference_daemon.socket_path()) and \
+                    inference_daemon.request("ping", timeout=opts["worker_timeout"]) is not None:
+                self.stdout.write(self.style.SUCCESS("🟢 Inference worker ready."))
+                return proc
+            time.sleep(1)
+        proc.terminate()
+        raise CommandError(f"The inference worker did not come up within {opts['worker_timeout']:.0f}s.")
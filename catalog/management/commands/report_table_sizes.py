@@ -0,0 +1,119 @@
+# catalog/management/commands/report_table_sizes.py
+"""
+On-disk size of the job posting tables (heap, TOAST, indexes), and how well
+the raw HTML compresses in RawDocument. Save a snapshot before migrating and
+compare against it afterwards:
+
+  python manage.py report_table_sizes --save sizes-before.json
+  python manage.py migrate catalog
+  python manage.py report_table_sizes --vacuum --compare sizes-before.json
+
+Dropping raw_description leaves its space in catalog_jobposting until the
+table is rewritten; --vacuum runs VACUUM FULL on the reported tables first
+(it takes an exclusive lock, so run it off-peak). --prune deletes documents
+no posting refers to any more.
+
+Usage:
+  python manage.py report_table_sizes [--save FILE] [--compare FILE] [--vacuum] [--prune]
+"""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+TABLES = ["catalog_jobposting", "catalog_rawdocument", "catalog_jobposting_skills"]
+
+
+def mb(n):
+    return f"{n / 2**20:8.1f} MB"
+
+
+class Command(BaseCommand):
+    help = "Report heap/TOAST/index sizes of the posting tables, optionally against a saved snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--save", type=Path, help="Write the sizes to this JSON file")
+        parser.add_argument("--compare", type=Path, help="Show the change against a saved JSON file")
+        parser.add_argument("--vacuum", action="store_true", help="VACUUM FULL the tables first")
+        parser.add_argument("--prune", action="store_true", help="Delete RawDocuments without postings")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("Table sizes are read from PostgreSQL's catalog.")
+        if opts["prune"]:
+            from catalog.models import RawDocument
+
+            deleted, _ = RawDocument.objects.filter(postings__isnull=True).delete()
+            self.stdout.write(f"🧹 {deleted} orphaned documents deleted")
+        if opts["vacuum"]:
+            with connection.cursor() as cursor:
+                for table in self.existing(TABLES):
+                    cursor.execute(f"VACUUM FULL ANALYZE {table}")
+            self.stdout.write("🧽 VACUUM FULL done")
+
+        sizes = self.sizes()
+        before = None
+        if opts["compare"]:
+            try:
+                before = json.loads(opts["compare"].read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {opts['compare']}: {e}")
+
+        self.stdout.write(f"\n{'table':<27} {'rows':>9} {'heap':>11} {'toast':>11} {'indexes':>11} {'total':>11}")
+        for table, s in sizes.items():
+            self.stdout.write(
+                f"{table:<27} {s['rows']:>9} {mb(s['heap'])} {mb(s['toast'])} {mb(s['indexes'])} {mb(s['total'])}"
+            )
+            old = (before or {}).get(table)
+            if old:
+                self.stdout.write(
+                    f"{'  vs saved':<27} {s['rows'] - old['rows']:>+9} "
+                    + " ".join(f"{(s[k] - old[k]) / 2**20:+8.1f} MB" for k in ("heap", "toast", "indexes", "total"))
+                )
+        if before:
+            total = sum(s["total"] for s in sizes.values())
+            total_before = sum(s["total"] for s in before.values())
+            self.stdout.write(f"\n📦 all tables: {mb(total_before).strip()} → {mb(total).strip()}")
+
+        docs = self.documents()
+        if docs["documents"]:
+            self.stdout.write(
+                f"🗜  {docs['documents']} documents for {docs['postings']} postings: "
+                f"{mb(docs['raw']).strip()} of HTML stored in {mb(docs['stored']).strip()} "
+                f"({docs['raw'] / max(docs['stored'], 1):.1f}×)"
+            )
+
+        if opts["save"]:
+            opts["save"].write_text(json.dumps(sizes, indent=2))
+            self.stdout.write(f"💾 sizes saved to {opts['save']}")
+
+    def existing(self, tables):
+        return [t for t in tables if t in connection.introspection.table_names()]
+
+    def sizes(self):
+        out = {}
+        with connection.cursor() as cursor:
+            for table in self.existing(TABLES):
+                cursor.execute(
+                    "SELECT c.reltuples::bigint, pg_relation_size(c.oid), "
+                    "COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0), "
+                    "pg_indexes_size(c.oid), pg_total_relation_size(c.oid) "
+                    "FROM pg_class c WHERE c.oid = %s::regclass",
+                    [table],
+                )
+                rows, heap, toast, indexes, total = cursor.fetchone()
+                out[table] = {"rows": max(rows, 0), "heap": heap, "toast": toast, "indexes": indexes, "total": total}
+        return out
+
+    def documents(self):
+        from catalog.models import JobPosting, RawDocument
+
+        if "catalog_rawdocument" not in connection.introspection.table_names():
+            return {"documents": 0}
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(octet_length(data)), 0) "
+                           f"FROM {RawDocument._meta.db_table}")
+            documents, raw, stored = cursor.fetchone()
+        postings = JobPosting.objects.filter(raw_document__isnull=False).count()
+        return {"documents": documents, "postings": postings, "raw": raw, "stored": stored}
@@ -0,0 +1,203 @@
+# catalog/management/commands/tag_catalog_skills.py
+"""
+Tag majors with curated skill terms found in their catalog PDFs.
+
+Term lists come either from a directory of `<catalog name>.txt` files (one
+term per line, default skill_lists/) or from a JSON config:
+
+  {
+    "B.A. Mass Communication (Digital Media)": {
+      "catalog": "docs/B.A. Degree in Mass Communication with Concentration in Digital Media.pdf",
+      "terms": ["news reporting", "broadcast journalism", ...]
+    },
+    "Major in Finance": ["financial analysis", ...]
+  }
+
+where a bare list means the catalog is <catalogs>/<key>.pdf. Every term of
+every major goes into one PhraseMatcher (lower-cased, hyphen breaks split
+the same way as the catalog text), every catalog's text streams through
+`nlp.pipe` in a single pass, and each major keeps only hits from its own
+list. Skills are resolved in one batch and added to Major.skills as a diff
+in one transaction (catalog.courses.update_major_skills, shared with
+ingest_catalogs, so neither drops the other's links); the major's name
+defaults to its catalog header. --replace also removes curated links that
+are no longer found, but never the skills of the major's courses.
+
+Only the tokenizer is needed, so the default pipeline is `spacy.blank("en")`
+and no model is downloaded.
+
+Usage:
+  python manage.py tag_catalog_skills [--terms skill_lists/ | --config majors.json]
+                                      [--catalogs docs/] [--replace] [--dry-run]
+"""
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from catalog.pdf_text import HYPHEN_BREAK, WHITESPACE, extract_header_text, flat_text, parse_header
+
+
+def term_key(term):
+    """Matcher key for a term: the normalisation flat_text() applies to catalog text, lower-cased."""
+    return HYPHEN_BREAK.sub(r"\1 \2", WHITESPACE.sub(" ", term.strip().lower()))
+
+
+class Command(BaseCommand):
+    help = "Match curated skill term lists against every catalog PDF in one spaCy pass and save Major.skills."
+
+    def add_arguments(self, parser):
+        base = Path(settings.BASE_DIR)
+        source = parser.add_mutually_exclusive_group()
+        source.add_argument("--terms", type=Path, default=base / "skill_lists",
+                            help="Directory of <catalog name>.txt term lists")
+        source.add_argument("--config", type=Path, help="JSON mapping of majors to term lists")
+        parser.add_argument("--catalogs", type=Path, default=base / "docs",
+                            help="Directory holding the catalog PDFs")
+        parser.add_argument("--model", default="en",
+                            help='spaCy language ("en" = blank tokenizer) or installed pipeline package')
+        parser.add_argument("--batch-size", type=int, default=8, help="Documents per nlp.pipe batch")
+        parser.add_argument("--replace", action="store_true",
+                            help="Also drop the major's skills that are neither found now nor taught by its courses")
+        parser.add_argument("--dry-run", action="store_true", help="Match and report, write nothing")
+
+    def handle(self, *args, **opts):
+        t_start = time.perf_counter()
+        majors = self.load_config(opts) if opts["config"] else self.load_term_dir(opts)
+        if not majors:
+            raise CommandError("No term lists to match.")
+
+        nlp = self.load_nlp(opts["model"])
+        matcher, display = self.build_matcher(nlp, majors)
+        self.stdout.write(f"🔎 {len(display)} distinct terms from {len(majors)} majors in one PhraseMatcher")
+
+        # one pass: every catalog's text through nlp.pipe
+        t0 = time.perf_counter()
+        stream = ((flat_text(m["catalog"]), i) for i, m in enumerate(majors))
+        with nlp.select_pipes(disable=nlp.pipe_names):
+            for doc, i in nlp.pipe(stream, as_tuples=True, batch_size=opts["batch_size"]):
+                keys = {nlp.vocab.strings[match_id] for match_id, _, _ in matcher(doc)}
+                majors[i]["found"] = sorted(display[k] for k in keys & majors[i]["keys"])
+        t_match = time.perf_counter() - t0
+        self.stdout.write(f"📄 {len(majors)} catalogs tokenized and matched in {t_match:.2f}s")
+
+        for m in majors:
+            dept, header_major, desc = parse_header(extract_header_text(m["catalog"]))
+            m.update(name=m["name"] or header_major or m["catalog"].stem, department=dept, description=desc)
+
+        if not opts["dry_run"]:
+            self.save(majors, opts["replace"])
+        self.report(majors)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(majors)} majors in {time.perf_counter() - t_start:.1f}s"
+            + (" (dry run, nothing saved)" if opts["dry_run"] else "")
+        ))
+
+    # ─── inputs ─────────────────────────────────────────────────────────────────
+    def catalog_index(self, directory):
+        if not directory.is_dir():
+            raise CommandError(f"Catalog directory not found: {directory}")
+        # file names differ in case here and there ("With Concentration")
+        return {p.stem.lower(): p for p in directory.glob("*.pdf")}
+
+    def load_term_dir(self, opts):
+        if not opts["terms"].is_dir():
+            raise CommandError(f"Term list directory not found: {opts['terms']}")
+        catalogs = self.catalog_index(opts["catalogs"])
+        majors = []
+        for path in sorted(opts["terms"].glob("*.txt")):
+            catalog = catalogs.get(path.stem.lower())
+            if catalog is None:
+                self.stdout.write(self.style.WARNING(f"⚠️  No catalog PDF for {path.name}; skipped"))
+                continue
+            terms = path.read_text(encoding="utf-8").splitlines()
+            majors.append(self.major(None, catalog, terms))
+        return majors
+
+    def load_config(self, opts):
+        try:
+            config = json.loads(opts["config"].read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {opts['config']}: {e}")
+        catalogs = self.catalog_index(opts["catalogs"])
+        majors = []
+        for name, spec in config.items():
+            if isinstance(spec, list):
+                spec = {"terms": spec}
+            catalog = Path(spec["catalog"]) if spec.get("catalog") else catalogs.get(name.lower())
+            if catalog is None or not catalog.exists():
+                self.stdout.write(self.style.WARNING(f"⚠️  No catalog PDF for '{name}'; skipped"))
+                continue
+            majors.append(self.major(name, catalog, spec.get("terms", [])))
+        return majors
+
+    def major(self, name, catalog, terms):
+        terms = [t.strip() for t in terms if t.strip()]
+        return {"name": name, "catalog": catalog, "terms": terms,
+                "keys": {term_key(t) for t in terms}, "found": []}
+
+    # ─── matching ───────────────────────────────────────────────────────────────
+    def load_nlp(self, model):
+        import spacy
+
+        if model == "en":
+            nlp = spacy.blank("en")
+            nlp.max_length = 10_000_000     # tokenizer only; no parser memory to protect
+            return nlp
+        try:
+            return spacy.load(model)
+        except OSError:
+            raise CommandError(f"spaCy pipeline '{model}' is not installed "
+                               f"(python -m spacy download {model}), or use --model en.")
+
+    def build_matcher(self, nlp, majors):
+        """One PhraseMatcher with a match id per distinct term; returns it and {key: display name}."""
+        from spacy.matcher import PhraseMatcher
+
+        display = {}
+        for m in majors:
+            for term in m["terms"]:
+                display.setdefault(term_key(term), term)
+        matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        for key, pattern in zip(display, nlp.tokenizer.pipe(display)):
+            matcher.add(key, [pattern])
+        return matcher, display
+
+    # ─── output ─────────────────────────────────────────────────────────────────
+    def save(self, majors, replace):
+        from catalog.courses import course_skill_ids, update_major_skills
+        from catalog.models import Major
+        from catalog.services import resolve_skill_map
+
+        # curated terms are taken verbatim, as with extract_catalog --skills-file
+        skill_map = resolve_skill_map(sorted({t for m in majors for t in m["found"]}), semantic=False)
+        with transaction.atomic():
+            wanted = {}
+            for m in majors:
+                major, _ = Major.objects.get_or_create(name=m["name"])
+                major.department = m["department"]
+                major.description = m["description"]
+                major.save()
+                m["major"] = major
+                wanted[major.id] = {skill_map[t.lower()].id for t in m["found"] if t.lower() in skill_map}
+            drop = None
+            if replace:
+                # everything but the course skills (link_major's) is ours to drop
+                taught = course_skill_ids(wanted)
+                drop = {major_id: set() for major_id in wanted}
+                for major_id, skill_id in (Major.skills.through.objects.filter(major_id__in=wanted)
+                                           .values_list("major_id", "skill_id")):
+                    if skill_id not in taught[major_id]:
+                        drop[major_id].add(skill_id)
+            added, removed = update_major_skills(wanted, drop)
+        self.stdout.write(f"💾 Major.skills: +{added} / -{removed} links")
+
+    def report(self, majors):
+        width = max([len(m["name"]) for m in majors] + [5])
+        self.stdout.write(f"\n{'major':<{width}}  {'terms':>5}  {'found':>5}")
+        for m in majors:
+            self.stdout.write(f"{m['name']:<{width}}  {len(m['terms']):>5}  {len(m['found']):>5}")
+        self.stdout.write("")
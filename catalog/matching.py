@@ -0,0 +1,221 @@
+# catalog/matching.py
+"""
+Score one student against every posting of a JobField at once.
+
+Each field's postings are held as a packed bit matrix: one bit column per
+skill that appears in the field, 64 columns to a uint64 word, stored
+word-major so a word is one contiguous array over all postings. A student's
+skills become a handful of (word, mask) pairs, and for every posting
+
+    matched = Σ popcount(bits[word] & mask)      missing = skills − matched
+
+is a few vectorized passes over the postings, touching only the words the
+student has bits in. Ranking 100k postings takes milliseconds instead of a
+MissingSkills call per posting.
+
+Matrices are built lazily per field from JobPosting.skill_ids and patched
+in place when postings change (mark_stale(), wired up in catalog.signals
+and catalog.skill_arrays); they are rebuilt at least every
+SKILL_MATCHER["max_age"] seconds so other processes' edits show up.
+"""
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+DEFAULT_CONFIG = {
+    "max_age": 300,
+}
+WORD = 64
+
+if hasattr(np, "bitwise_count"):             # NumPy ≥ 2.0
+    _popcount = np.bitwise_count
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return _BYTE_COUNTS[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+
+def matcher_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "SKILL_MATCHER", {})}
+
+
+class FieldMatrix:
+    """The postings of one JobField × the skills they list, one bit per link."""
+
+    def __init__(self, field_id=None):
+        self.field_id = field_id
+        self.columns = {}                                  # skill_id -> bit column
+        self.rows = {}                                     # posting id -> row
+        self.posting_ids = np.zeros(0, dtype=np.int64)     # row -> posting id, 0 for a free row
+        self.counts = np.zeros(0, dtype=np.int32)          # row -> number of skills
+        self.bits = np.zeros((0, 0), dtype=np.uint64)      # (word, row)
+        self.free = []
+        self.built_at = 0.0
+        # patches replace posting_ids/counts/bits one after another when they
+        # grow, so queries must never see them mid-update
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    # ─── building ───────────────────────────────────────────────────────────────
+    def load(self, postings):
+        """postings: [(posting_id, [skill_id, …]), …]"""
+        postings = list(postings)
+        self.columns = {sid: c for c, sid in enumerate(sorted({s for _, ids in postings for s in ids}))}
+        self.rows = {pid: r for r, (pid, _) in enumerate(postings)}
+        self.posting_ids = np.fromiter((pid for pid, _ in postings), dtype=np.int64, count=len(postings))
+        self.counts = np.fromiter((len(ids) for _, ids in postings), dtype=np.int32, count=len(postings))
+        self.bits = np.zeros((-(-len(self.columns) // WORD), len(postings)), dtype=np.uint64)
+        self.free = []
+
+        rows = np.repeat(np.arange(len(postings)), self.counts)
+        cols = np.fromiter((self.columns[s] for _, ids in postings for s in ids), dtype=np.int64, count=len(rows))
+        # several bits of one row can land in the same word, so accumulate unbuffered
+        np.bitwise_or.at(self.bits, (cols // WORD, rows), np.left_shift(np.uint64(1), (cols % WORD).astype(np.uint64)))
+        self.built_at = time.monotonic()
+        return self
+
+    @classmethod
+    def build_from_db(cls, field_id):
+        from .models import JobPosting
+
+        postings = JobPosting.objects.filter(job_field_id=field_id).order_by("id").values_list("id", "skill_ids")
+        return cls(field_id).load(postings.iterator(chunk_size=5_000))
+
+    # ─── incremental updates ────────────────────────────────────────────────────
+    def _column(self, skill_id):
+        col = self.columns.get(skill_id)
+        if col is None:
+            col = self.columns[skill_id] = len(self.columns)
+            if col // WORD >= self.bits.shape[0]:
+                self.bits = np.vstack([self.bits, np.zeros((1, self.bits.shape[1]), dtype=np.uint64)])
+        return col
+
+    def _row(self, posting_id):
+        row = self.rows.get(posting_id)
+        if row is not None:
+            return row
+        if not self.free:
+            # grow by half again, so a stream of new postings costs amortized O(1) copies
+            old = len(self.posting_ids)
+            extra = max(16, old // 2)
+            self.posting_ids = np.concatenate([self.posting_ids, np.zeros(extra, dtype=np.int64)])
+            self.counts = np.concatenate([self.counts, np.zeros(extra, dtype=np.int32)])
+            self.bits = np.hstack([self.bits, np.zeros((self.bits.shape[0], extra), dtype=np.uint64)])
+            self.free = list(range(old + extra - 1, old - 1, -1))
+        row = self.rows[posting_id] = self.free.pop()
+        self.posting_ids[row] = posting_id
+        return row
+
+    def set_posting(self, posting_id, skill_ids):
+        """Insert a posting or replace its skills."""
+        with self.lock:
+            cols = [self._column(sid) for sid in set(skill_ids)]
+            row = self._row(posting_id)
+            self.bits[:, row] = 0
+            for col in cols:
+                self.bits[col // WORD, row] |= np.uint64(1 << (col % WORD))
+            self.counts[row] = len(cols)
+
+    def remove_posting(self, posting_id):
+        with self.lock:
+            row = self.rows.pop(posting_id, None)
+            if row is None:
+                return
+            self.bits[:, row] = 0
+            self.posting_ids[row] = 0
+            self.counts[row] = 0
+            self.free.append(row)
+
+    # ─── queries ────────────────────────────────────────────────────────────────
+    def student_words(self, skill_ids):
+        """{word: mask} for the student's skills that occur in this field."""
+        words = {}
+        for sid in skill_ids:
+            col = self.columns.get(sid)
+            if col is not None:
+                words[col // WORD] = words.get(col // WORD, 0) | 1 << (col % WORD)
+        return words
+
+    def score(self, skill_ids):
+        """
+        (posting_ids, matched, missing, ratio) arrays over every posting in
+        the field; ratio is matched / the posting's skill count (0 for none).
+        """
+        with self.lock:
+            return self._score(skill_ids)
+
+    def _score(self, skill_ids):
+        matched = np.zeros(len(self.posting_ids), dtype=np.int32)
+        for word, mask in self.student_words(skill_ids).items():
+            matched += _popcount(self.bits[word] & np.uint64(mask))
+        live = self.posting_ids != 0
+        matched, counts = matched[live], self.counts[live]
+        ratio = np.divide(matched, counts, out=np.zeros(len(counts)), where=counts > 0)
+        return self.posting_ids[live], matched, counts - matched, ratio
+
+    def rank(self, skill_ids, limit=20):
+        """[(posting_id, matched, missing, ratio)] best first: highest ratio, then fewest missing."""
+        posting_ids, matched, missing, ratio = self.score(skill_ids)   # copies, safe to use unlocked
+        candidates = np.arange(len(posting_ids))
+        if 0 < limit < len(candidates):
+            # only rows above the limit-th best ratio, plus just enough of the
+            # rows tied with it (fewest missing first), need the full ordering
+            kth = np.partition(ratio, len(ratio) - limit)[len(ratio) - limit]
+            above, ties = np.flatnonzero(ratio > kth), np.flatnonzero(ratio == kth)
+            need = limit - len(above)
+            if need < len(ties):
+                tie_key = missing[ties].astype(np.int64) * (int(posting_ids.max()) + 1) + posting_ids[ties]
+                ties = ties[np.argpartition(tie_key, need - 1)[:need]]
+            candidates = np.concatenate([above, ties])
+        order = candidates[np.lexsort((posting_ids[candidates], missing[candidates], -ratio[candidates]))]
+        return [(int(posting_ids[i]), int(matched[i]), int(missing[i]), float(ratio[i]))
+                for i in order[:limit]]
+
+
+_lock = threading.Lock()
+_matrices = {}        # job_field_id -> FieldMatrix
+_stale = set()        # posting ids changed since the matrices last saw them
+
+
+def get_field_matrix(field_id):
+    """Process-wide matrix for one field, patched with pending changes, rebuilt once max_age old."""
+    max_age = matcher_config()["max_age"]
+    with _lock:
+        if _stale:
+            _apply_stale()
+        matrix = _matrices.get(field_id)
+        if matrix is None or (max_age and time.monotonic() - matrix.built_at > max_age):
+            matrix = _matrices[field_id] = FieldMatrix.build_from_db(field_id)
+        return matrix
+
+
+def _apply_stale():
+    """Move, update or drop the changed postings in the loaded matrices, in one query."""
+    from .models import JobPosting
+
+    ids = list(_stale)
+    _stale.clear()
+    current = {pid: (field_id, skill_ids) for pid, field_id, skill_ids in
+               JobPosting.objects.filter(pk__in=ids).values_list("id", "job_field_id", "skill_ids")}
+    for pid in ids:
+        field_id, skill_ids = current.get(pid, (None, None))
+        for fid, matrix in _matrices.items():
+            if fid != field_id or skill_ids is None:
+                matrix.remove_posting(pid)
+        if skill_ids is not None and field_id in _matrices:
+            _matrices[field_id].set_posting(pid, skill_ids)
+
+
+def mark_stale(posting_ids=None):
+    """Postings whose field or skills changed (None: drop every matrix)."""
+    with _lock:
+        if posting_ids is None:
+            _matrices.clear()
+            _stale.clear()
+        elif _matrices:
+            _stale.update(posting_ids)
@@ -0,0 +1,54 @@
+# catalog/migration_operations.py
+"""
+Migration operations that build indexes without locking writes on
+PostgreSQL (CREATE INDEX CONCURRENTLY) and fall back to the plain
+operation on other backends, so SQLite test runs still migrate. Migrations
+using them must set `atomic = False`.
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently as _AddIndexConcurrently
+from django.db import migrations
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrently(_AddIndexConcurrently):
+    """AddIndex, concurrently on PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        return AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        return AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class CreateIndexSQL(migrations.RunPython):
+    """
+    An index on a table this app doesn't own (e.g. auth_user), given as
+    `name`, `table` and a column list or expression. Concurrent on
+    PostgreSQL; IF NOT EXISTS everywhere, so it is safe to re-run.
+    """
+
+    def __init__(self, name, table, columns):
+        self.index_name, self.table, self.columns = name, table, columns
+        super().__init__(self._create, self._drop, atomic=False)
+
+    def _create(self, apps, schema_editor):
+        concurrently = "CONCURRENTLY " if schema_editor.connection.vendor == "postgresql" else ""
+        schema_editor.execute(
+            f"CREATE INDEX {concurrently}IF NOT EXISTS {self.index_name} ON {self.table} ({self.columns})"
+        )
+
+    def _drop(self, apps, schema_editor):
+        concurrently = "CONCURRENTLY " if schema_editor.connection.vendor == "postgresql" else ""
+        schema_editor.execute(f"DROP INDEX {concurrently}IF EXISTS {self.index_name}")
+
+    def describe(self):
+        return f"Create index {self.index_name} on {self.table} ({self.columns})"
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {
+            "name": self.index_name, "table": self.table, "columns": self.columns,
+        }
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0008_skill_category"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SkillAlias",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("alias", models.CharField(max_length=100, unique=True)),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aliases",
+                        to="catalog.skill",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0009_skillalias"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobposting",
+            name="education_level",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[
+                    (1, "High school"),
+                    (2, "Diploma"),
+                    (3, "Bachelor's"),
+                    (4, "Master's"),
+                    (5, "Doctorate"),
+                ],
+                db_index=True,
+                help_text="Lowest degree the posting accepts",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobposting",
+            name="employment_type",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("full_time", "Full time"),
+                    ("part_time", "Part time"),
+                    ("contract", "Contract"),
+                    ("temporary", "Temporary"),
+                    ("internship", "Internship"),
+                ],
+                db_index=True,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobposting",
+            name="min_years_experience",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                db_index=True,
+                help_text="Minimum years of experience asked for",
+                null=True,
+            ),
+        ),
+    ]
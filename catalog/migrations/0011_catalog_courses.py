@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0010_jobposting_attributes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="major",
+            name="courses",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Courses in this major's catalog",
+                related_name="majors",
+                to="catalog.course",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="course",
+            name="major",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="electives",
+                to="catalog.major",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="course",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("major__isnull", True)),
+                fields=("code",),
+                name="unique_catalog_course_code",
+            ),
+        ),
+    ]
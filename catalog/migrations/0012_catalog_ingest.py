@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0011_catalog_courses"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogIngest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=500, unique=True)),
+                ("file_hash", models.CharField(max_length=64)),
+                ("extractor_version", models.CharField(max_length=64)),
+                ("courses", models.PositiveIntegerField(default=0)),
+                ("skills", models.PositiveIntegerField(default=0)),
+                ("ingested_at", models.DateTimeField(auto_now=True)),
+                (
+                    "major",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="catalog_ingests",
+                        to="catalog.major",
+                    ),
+                ),
+            ],
+        ),
+    ]
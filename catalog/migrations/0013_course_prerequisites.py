@@ -0,0 +1,126 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0012_catalog_ingest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CoursePrerequisite",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("pre", "Prerequisite"), ("co", "Corequisite")],
+                        default="pre",
+                        max_length=3,
+                    ),
+                ),
+                ("group", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "alternatives",
+                    models.PositiveSmallIntegerField(
+                        default=1,
+                        help_text="Courses in this group as written in the catalog (1 = mandatory)",
+                    ),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="requisite_links",
+                        to="catalog.course",
+                    ),
+                ),
+                (
+                    "prerequisite",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="required_for_links",
+                        to="catalog.course",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="requisites",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="required_for",
+                through="catalog.CoursePrerequisite",
+                through_fields=("course", "prerequisite"),
+                to="catalog.course",
+            ),
+        ),
+        migrations.CreateModel(
+            name="PrerequisiteClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "depth",
+                    models.PositiveSmallIntegerField(
+                        help_text="Shortest prerequisite chain length"
+                    ),
+                ),
+                (
+                    "required",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Reachable through mandatory prerequisites only (no or-alternatives)",
+                    ),
+                ),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_closure",
+                        to="catalog.course",
+                    ),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="prerequisite_closure",
+                        to="catalog.course",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="courseprerequisite",
+            constraint=models.UniqueConstraint(
+                fields=("course", "prerequisite"), name="unique_course_prerequisite"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="prerequisiteclosure",
+            constraint=models.UniqueConstraint(
+                fields=("course", "ancestor"), name="unique_prerequisite_closure"
+            ),
+        ),
+    ]
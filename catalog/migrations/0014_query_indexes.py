@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+from catalog.migration_operations import AddIndexConcurrently, CreateIndexSQL
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0013_course_prerequisites"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="jobposting",
+            index=models.Index(
+                fields=["-date_posted", "title"], name="jobposting_recent_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="jobposting",
+            index=models.Index(
+                condition=models.Q(("job_field__isnull", False)),
+                fields=["job_field", "-date_posted"],
+                name="jobposting_field_recent_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="skill",
+            index=models.Index(
+                fields=["category", "name"], name="skill_category_name_idx"
+            ),
+        ),
+        # EmailAuthToken looks users up by email, FacultyEmailAuthToken by email__iexact
+        CreateIndexSQL(name="auth_user_email_idx", table="auth_user", columns="email"),
+        CreateIndexSQL(name="auth_user_email_upper_idx", table="auth_user", columns="UPPER(email)"),
+    ]
@@ -0,0 +1,143 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from catalog.migration_operations import AddIndexConcurrently
+
+SOURCE_CHOICES = [
+    (0, "Unknown"),
+    (1, "Skills header"),
+    (2, "Gazetteer"),
+    (3, "NER model"),
+    (4, "LLM"),
+    (5, "Manual"),
+]
+
+
+def _auto_id():
+    return models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")
+
+
+class Migration(migrations.Migration):
+    # the reverse indexes are built concurrently on the (large) existing tables
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0014_query_indexes"),
+    ]
+
+    operations = [
+        # 1) adopt the auto-created through tables as they are: same table,
+        #    columns, indexes and unique pair, so no SQL runs here
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="JobPostingSkill",
+                    fields=[
+                        ("id", _auto_id()),
+                        ("jobposting", models.ForeignKey(
+                            on_delete=django.db.models.deletion.CASCADE, to="catalog.jobposting")),
+                        ("skill", models.ForeignKey(
+                            on_delete=django.db.models.deletion.CASCADE, to="catalog.skill")),
+                    ],
+                    options={
+                        "db_table": "catalog_jobposting_skills",
+                        "unique_together": {("jobposting", "skill")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="jobposting",
+                    name="skills",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        help_text="Skills required by this job (parsed from description)",
+                        related_name="job_postings",
+                        through="catalog.JobPostingSkill",
+                        to="catalog.skill",
+                    ),
+                ),
+                migrations.CreateModel(
+                    name="StudentProfileSkill",
+                    fields=[
+                        ("id", _auto_id()),
+                        ("studentprofile", models.ForeignKey(
+                            on_delete=django.db.models.deletion.CASCADE, to="catalog.studentprofile")),
+                        ("skill", models.ForeignKey(
+                            on_delete=django.db.models.deletion.CASCADE, to="catalog.skill")),
+                    ],
+                    options={
+                        "db_table": "catalog_studentprofile_skills",
+                        "unique_together": {("studentprofile", "skill")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="studentprofile",
+                    name="skills",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="students",
+                        through="catalog.StudentProfileSkill",
+                        to="catalog.skill",
+                    ),
+                ),
+            ],
+        ),
+        # 2) provenance columns; existing links become "unknown"
+        migrations.AddField(
+            model_name="jobpostingskill",
+            name="source",
+            field=models.PositiveSmallIntegerField(choices=SOURCE_CHOICES, default=0),
+        ),
+        migrations.AddField(
+            model_name="jobpostingskill",
+            name="confidence",
+            field=models.PositiveSmallIntegerField(
+                blank=True, help_text="Extractor confidence, 0–100", null=True
+            ),
+        ),
+        # 3) (skill, owner) indexes for reverse lookups …
+        AddIndexConcurrently(
+            model_name="jobpostingskill",
+            index=models.Index(
+                fields=["skill", "jobposting"],
+                include=("source", "confidence"),
+                name="jobpostingskill_reverse_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="studentprofileskill",
+            index=models.Index(
+                fields=["skill", "studentprofile"], name="studentskill_reverse_idx"
+            ),
+        ),
+        # 4) … which, with the unique pair, make the single-column FK indexes redundant
+        migrations.AlterField(
+            model_name="jobpostingskill",
+            name="jobposting",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, to="catalog.jobposting"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobpostingskill",
+            name="skill",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, to="catalog.skill"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="studentprofileskill",
+            name="studentprofile",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, to="catalog.studentprofile"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="studentprofileskill",
+            name="skill",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, to="catalog.skill"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:02
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from catalog.migration_operations import AddIndexConcurrently
+
+BATCH = 5_000
+
+
+def backfill(apps, schema_editor):
+    """Copy the existing links into the new arrays, one committed id range at a time."""
+    with schema_editor.connection.cursor() as cursor:
+        for table, through, fk in (
+            ("catalog_jobposting", "catalog_jobposting_skills", "jobposting_id"),
+            ("catalog_studentprofile", "catalog_studentprofile_skills", "studentprofile_id"),
+        ):
+            cursor.execute(f"SELECT MIN(id), MAX(id) FROM {table}")
+            lo, hi = cursor.fetchone()
+            if lo is None:
+                continue
+            for start in range(lo, hi + 1, BATCH):
+                cursor.execute(
+                    f"UPDATE {table} AS t SET skill_ids = ARRAY("
+                    f"SELECT skill_id FROM {through} WHERE {fk} = t.id ORDER BY skill_id) "
+                    f"WHERE t.id >= %s AND t.id < %s",
+                    [start, start + BATCH],
+                )
+
+
+class Migration(migrations.Migration):
+    # batches commit as they go and the GIN indexes are built concurrently
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0015_skill_through_models"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobposting",
+            name="skill_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name="studentprofile",
+            name="skill_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name="jobposting",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["skill_ids"], name="jobposting_skill_ids_gin"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="studentprofile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["skill_ids"], name="studentprofile_skill_ids_gin"
+            ),
+        ),
+    ]
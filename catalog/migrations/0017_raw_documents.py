@@ -0,0 +1,120 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:41
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+from catalog.blobs import compress, content_digest, decompress
+from catalog.migration_operations import AddIndexConcurrently
+
+BATCH = 1_000
+
+
+def store_data_external(apps, schema_editor):
+    """zstd frames don't shrink further; keep PostgreSQL's TOAST from trying pglz on every row."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    RawDocument = apps.get_model("catalog", "RawDocument")
+    schema_editor.execute(
+        f"ALTER TABLE {schema_editor.quote_name(RawDocument._meta.db_table)} ALTER COLUMN data SET STORAGE EXTERNAL"
+    )
+
+
+def move_to_documents(apps, schema_editor):
+    """raw_description → RawDocument, BATCH postings per committed transaction."""
+    JobPosting = apps.get_model("catalog", "JobPosting")
+    RawDocument = apps.get_model("catalog", "RawDocument")
+    alias = schema_editor.connection.alias
+
+    last = 0
+    while True:
+        batch = list(
+            JobPosting.objects.using(alias)
+            .filter(id__gt=last, raw_document__isnull=True, raw_description__isnull=False)
+            .exclude(raw_description="")
+            .order_by("id").values_list("id", "raw_description")[:BATCH]
+        )
+        if not batch:
+            return
+        last = batch[-1][0]
+        digests = [(pid, content_digest(text), text) for pid, text in batch]
+        with transaction.atomic(using=alias):
+            known = dict(RawDocument.objects.using(alias)
+                         .filter(digest__in={d for _, d, _ in digests}).values_list("digest", "id"))
+            new = {d: text for _, d, text in digests if d not in known}
+            RawDocument.objects.using(alias).bulk_create(
+                [RawDocument(digest=d, size=len(text.encode("utf-8")), data=compress(text))
+                 for d, text in new.items()],
+                ignore_conflicts=True,
+            )
+            if new:
+                known.update(RawDocument.objects.using(alias).filter(digest__in=new).values_list("digest", "id"))
+            JobPosting.objects.using(alias).bulk_update(
+                [JobPosting(id=pid, raw_document_id=known[d]) for pid, d, _ in digests], ["raw_document"]
+            )
+
+
+def move_back(apps, schema_editor):
+    JobPosting = apps.get_model("catalog", "JobPosting")
+    RawDocument = apps.get_model("catalog", "RawDocument")
+    alias = schema_editor.connection.alias
+
+    last = 0
+    while True:
+        batch = list(
+            JobPosting.objects.using(alias)
+            .filter(id__gt=last, raw_document__isnull=False)
+            .order_by("id").values_list("id", "raw_document_id")[:BATCH]
+        )
+        if not batch:
+            return
+        last = batch[-1][0]
+        texts = {pk: decompress(data) for pk, data in RawDocument.objects.using(alias)
+                 .filter(pk__in={doc for _, doc in batch}).values_list("pk", "data")}
+        with transaction.atomic(using=alias):
+            JobPosting.objects.using(alias).bulk_update(
+                [JobPosting(id=pid, raw_description=texts[doc]) for pid, doc in batch], ["raw_description"]
+            )
+
+
+class Migration(migrations.Migration):
+    # postings move in committed batches and the FK index is built concurrently
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0016_skill_id_arrays"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RawDocument",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("digest", models.CharField(max_length=64, unique=True)),
+                ("size", models.PositiveIntegerField(help_text="Uncompressed size in bytes")),
+                ("data", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(store_data_external, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="jobposting",
+            name="raw_document",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="postings",
+                to="catalog.rawdocument",
+            ),
+        ),
+        migrations.RunPython(move_to_documents, move_back),
+        migrations.RemoveField(
+            model_name="jobposting",
+            name="raw_description",
+        ),
+        AddIndexConcurrently(
+            model_name="jobposting",
+            index=models.Index(fields=["raw_document"], name="jobposting_raw_document_idx"),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.utils.functional import cached_property
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 
 class Skill(models.Model):
     """
@@ -30,10 +33,32 @@ class Skill(models.Model):
       help_text="Whether this is a major-related, technical, or soft skill"
     )
 
+    class Meta:
+        indexes = [
+            # MajorSkillsSerializer and skill lists filter by category, sorted by name
+            models.Index(fields=['category', 'name'], name='skill_category_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class SkillAlias(models.Model):
+    """
+    An alternative spelling or abbreviation of a Skill ("ML" → Machine Learning).
+    The gazetteer matches aliases as well as Skill.name.
+    """
+    skill = models.ForeignKey(
+        Skill,
+        on_delete=models.CASCADE,
+        related_name='aliases'
+    )
+    alias = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return f"{self.alias} → {self.skill.name}"
+
+
 class Major(models.Model):
     """
     Represents an academic major. Each major has its own set of Skills
@@ -50,6 +75,14 @@ class Major(models.Model):
         blank=True,
         help_text="Baseline skills every student in this major should acquire"
     )
+    # Courses listed in the major's catalog PDF; shared core courses are
+    # stored once (Course.major is NULL) and linked from every major
+    courses = models.ManyToManyField(
+        'Course',
+        related_name='majors',
+        blank=True,
+        help_text="Courses in this major's catalog"
+    )
 
     def __str__(self):
         return self.name
@@ -57,8 +90,9 @@ class Major(models.Model):
 
 class Course(models.Model):
     """
-    An elective course offered under a Major. Each elective has its own
-    set of Skills that it teaches or reinforces.
+    A course with the Skills it teaches or reinforces. Electives belong to
+    one Major; catalog courses (from "Course Descriptions.pdf") have no
+    owning major, are unique by code, and are linked via Major.courses.
     """
     code = models.CharField(max_length=20, blank=True)
     name = models.CharField(max_length=200)
@@ -72,6 +106,8 @@ class Course(models.Model):
     major = models.ForeignKey(
         Major,
         on_delete=models.CASCADE,
+        null=True,
+        blank=True,
         related_name='electives'
     )
 
@@ -82,14 +118,125 @@ class Course(models.Model):
         blank=True,
         help_text="Skills taught or reinforced by this elective"
     )
+    # parsed from the "Prerequisite(s):" / "Corequisite(s):" clauses
+    requisites = models.ManyToManyField(
+        'self',
+        through='CoursePrerequisite',
+        through_fields=('course', 'prerequisite'),
+        symmetrical=False,
+        related_name='required_for',
+        blank=True
+    )
 
     class Meta:
         unique_together = ('major', 'code')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['code'],
+                condition=models.Q(major__isnull=True),
+                name='unique_catalog_course_code',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.code} – {self.name}" if self.code else self.name
 
 
+class CoursePrerequisite(models.Model):
+    """
+    One course required before (or alongside) another. Rows of a course
+    with the same kind and `group` are alternatives ("CSCI 112 or CSCI 114");
+    every group is required.
+    """
+    KIND_CHOICES = [
+        ('pre', 'Prerequisite'),
+        ('co',  'Corequisite'),
+    ]
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='requisite_links'
+    )
+    prerequisite = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='required_for_links'
+    )
+    kind = models.CharField(max_length=3, choices=KIND_CHOICES, default='pre')
+    group = models.PositiveSmallIntegerField(default=0)
+    alternatives = models.PositiveSmallIntegerField(
+        default=1,
+        help_text="Courses in this group as written in the catalog (1 = mandatory)"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['course', 'prerequisite'],
+                name='unique_course_prerequisite',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.prerequisite.code} → {self.course.code}"
+
+
+class PrerequisiteClosure(models.Model):
+    """
+    Transitive closure of the prerequisite graph: every course needed before
+    `course`, so that is one indexed lookup. Maintained by catalog.prerequisites.
+    """
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='prerequisite_closure'
+    )
+    ancestor = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='descendant_closure'
+    )
+    depth = models.PositiveSmallIntegerField(help_text="Shortest prerequisite chain length")
+    required = models.BooleanField(
+        default=True,
+        help_text="Reachable through mandatory prerequisites only (no or-alternatives)"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['course', 'ancestor'],
+                name='unique_prerequisite_closure',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} ≺ {self.course_id} (depth {self.depth})"
+
+
+class CatalogIngest(models.Model):
+    """
+    Manifest of catalog PDFs already ingested, so re-runs skip files whose
+    content hash and extractor version (models, parser, descriptions PDF)
+    are unchanged. See catalog.courses.
+    """
+    path = models.CharField(max_length=500, unique=True)
+    file_hash = models.CharField(max_length=64)
+    extractor_version = models.CharField(max_length=64)
+    major = models.ForeignKey(
+        Major,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='catalog_ingests'
+    )
+    courses = models.PositiveIntegerField(default=0)
+    skills = models.PositiveIntegerField(default=0)
+    ingested_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.path} @ {self.file_hash[:12]}"
+
 
 class Certification(models.Model):
     """
@@ -138,6 +285,42 @@ class JobField(models.Model):
         return self.name
 
 
+class RawDocument(models.Model):
+    """
+    Scraped HTML kept out of the JobPosting row, so listing postings never
+    reads it: zstd-compressed, stored once per distinct content (SHA-256
+    digest) and only fetched when a posting's raw_description is asked for.
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def store(cls, text):
+        """The document holding `text` (None for empty text), created if the content is new."""
+        from .blobs import compress, content_digest
+
+        if not text:
+            return None
+        digest = content_digest(text)
+        doc = cls.objects.filter(digest=digest).defer("data").first()
+        if doc is None:
+            doc, _ = cls.objects.get_or_create(
+                digest=digest, defaults={"size": len(text.encode("utf-8")), "data": compress(text)}
+            )
+        return doc
+
+    @cached_property
+    def text(self):
+        from .blobs import decompress
+
+        return decompress(self.data)
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} B)"
+
+
 class JobPosting(models.Model):
     title = models.CharField(max_length=200)
     job_field = models.ForeignKey(
@@ -155,11 +338,15 @@ class JobPosting(models.Model):
         help_text="Name of the company offering this job"
     )
 
-    # Allow NULL/blank so migrations don’t force a default on existing rows
-    raw_description = models.TextField(
+    # Original text scraped from the job site, compressed out of row; read it
+    # through raw_description. Indexed in Meta (built concurrently).
+    raw_document = models.ForeignKey(
+        RawDocument,
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Original text scraped from job site"
+        db_index=False,
+        related_name='postings'
     )
     cleaned_description = models.TextField(
         blank=True,
@@ -169,20 +356,110 @@ class JobPosting(models.Model):
 
     skills = models.ManyToManyField(
         Skill,
+        through='JobPostingSkill',
         related_name='job_postings',
         blank=True,
         help_text="Skills required by this job (parsed from description)"
     )
+    # sorted copy of the skill links' ids for set operations in SQL (catalog.skill_arrays)
+    skill_ids = ArrayField(models.BigIntegerField(), default=list, blank=True, editable=False)
+
+    # Structured attributes parsed from the description alongside the skills
+    # (see catalog.posting_attributes); ordered so ?education=<n> means "at most n"
+    EDUCATION_CHOICES = [
+        (1, 'High school'),
+        (2, 'Diploma'),
+        (3, "Bachelor's"),
+        (4, "Master's"),
+        (5, 'Doctorate'),
+    ]
+    EMPLOYMENT_CHOICES = [
+        ('full_time',  'Full time'),
+        ('part_time',  'Part time'),
+        ('contract',   'Contract'),
+        ('temporary',  'Temporary'),
+        ('internship', 'Internship'),
+    ]
+    min_years_experience = models.PositiveSmallIntegerField(
+        null=True, blank=True, db_index=True,
+        help_text="Minimum years of experience asked for"
+    )
+    education_level = models.PositiveSmallIntegerField(
+        choices=EDUCATION_CHOICES, null=True, blank=True, db_index=True,
+        help_text="Lowest degree the posting accepts"
+    )
+    employment_type = models.CharField(
+        max_length=20, choices=EMPLOYMENT_CHOICES, blank=True, db_index=True
+    )
 
     class Meta:
         indexes = [
             models.Index(fields=['title', 'job_field']),
+            # newest first (admin ordering, listings by date)
+            models.Index(fields=['-date_posted', 'title'], name='jobposting_recent_idx'),
+            # a field's newest postings; postings without a field are never listed by field
+            models.Index(
+                fields=['job_field', '-date_posted'],
+                name='jobposting_field_recent_idx',
+                condition=models.Q(job_field__isnull=False),
+            ),
+            GinIndex(fields=['skill_ids'], name='jobposting_skill_ids_gin'),
+            models.Index(fields=['raw_document'], name='jobposting_raw_document_idx'),
         ]
 
+    @property
+    def raw_description(self):
+        """The scraped HTML, fetched and decompressed on first access."""
+        return self.raw_document.text if self.raw_document_id else None
+
     def __str__(self):
         return self.title
 
 
+class JobPostingSkill(models.Model):
+    """
+    JobPosting ↔ Skill link (the table Django created for JobPosting.skills),
+    with the extraction tier that produced it so analytics can filter by
+    source without a join. (skill, jobposting) is indexed for "postings
+    needing skill X", covering source/confidence on PostgreSQL.
+    """
+    UNKNOWN, HEADER, GAZETTEER, NER, LLM, MANUAL = range(6)
+    SOURCE_CHOICES = [
+        (UNKNOWN,   'Unknown'),
+        (HEADER,    'Skills header'),
+        (GAZETTEER, 'Gazetteer'),
+        (NER,       'NER model'),
+        (LLM,       'LLM'),
+        (MANUAL,    'Manual'),
+    ]
+    # catalog.extraction tier name → source
+    TIER_SOURCES = {'header': HEADER, 'gazetteer': GAZETTEER, 'ner': NER, 'llm': LLM}
+
+    # the unique pair's index serves jobposting lookups and the reverse index
+    # serves skill lookups, so neither column needs its own index
+    jobposting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, db_index=False)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, db_index=False)
+    source = models.PositiveSmallIntegerField(choices=SOURCE_CHOICES, default=UNKNOWN)
+    confidence = models.PositiveSmallIntegerField(
+        null=True, blank=True,
+        help_text="Extractor confidence, 0–100"
+    )
+
+    class Meta:
+        db_table = 'catalog_jobposting_skills'
+        unique_together = ('jobposting', 'skill')
+        indexes = [
+            models.Index(
+                fields=['skill', 'jobposting'],
+                include=['source', 'confidence'],
+                name='jobpostingskill_reverse_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.jobposting_id} ↔ {self.skill_id} ({self.get_source_display()})"
+
+
 class StudentProfile(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
@@ -192,7 +469,10 @@ class StudentProfile(models.Model):
     major = models.ForeignKey(
         Major, on_delete=models.SET_NULL, null=True, blank=True, related_name='students'
     )
-    skills = models.ManyToManyField(Skill, related_name='students', blank=True)
+    skills = models.ManyToManyField(
+        Skill, through='StudentProfileSkill', related_name='students', blank=True
+    )
+    skill_ids = ArrayField(models.BigIntegerField(), default=list, blank=True, editable=False)
     date_joined = models.DateField(auto_now_add=True)
 
     # ← new fields:
@@ -209,9 +489,30 @@ class StudentProfile(models.Model):
     phone_secondary = models.CharField(max_length=20, blank=True)
     phone_work      = models.CharField(max_length=20, blank=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['skill_ids'], name='studentprofile_skill_ids_gin'),
+        ]
+
     def __str__(self):
         return self.user.get_full_name() or self.user.username
 
+class StudentProfileSkill(models.Model):
+    """StudentProfile ↔ Skill link, indexed both ways like JobPostingSkill."""
+    studentprofile = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, db_index=False)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        db_table = 'catalog_studentprofile_skills'
+        unique_together = ('studentprofile', 'skill')
+        indexes = [
+            models.Index(fields=['skill', 'studentprofile'], name='studentskill_reverse_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.studentprofile_id} ↔ {self.skill_id}"
+
+
 class FacultyProfile(models.Model):
     """
     A one‐to‐one extension of Django's User for faculty accounts.
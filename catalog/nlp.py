@@ -1,39 +1,41 @@
 # catalog/nlp.py
 
 import re
-import spacy
 from bs4 import BeautifulSoup
 
-nlp = spacy.load("en_core_web_sm")
+from .inference import get_spacy, spacy_candidates_many
+from .normalize import normalize_many
 
-# NER labels and blacklist as before
+# NER labels kept as skill candidates (blacklist lives in catalog.normalize)
 NER_LABELS = {"PRODUCT", "ORG", "LANGUAGE", "GPE", "NORP", "WORK_OF_ART"}
-EXTENDED_BLACKLIST = {
-    "microsoft","certified","learn","introduction","module",
-    "experience","services","resources","candidate","responsibilities",
-    "knowledge","solution","solutions","clients"
-}
 MIN_WORDS, MAX_WORDS = 1, 3
-MIN_CHAR = 3
+# bump when spacy_candidates() changes, to invalidate cached candidates
+CANDIDATES_VERSION = "2"
+WHITESPACE = re.compile(r"\s+")
+
+def spacy_candidates(cleaned):
+    doc = get_spacy()(cleaned)
+    candidates = []
+
+    # NER
+    for ent in doc.ents:
+        if ent.label_ in NER_LABELS:
+            candidates.append(ent.text)
+
+    # Noun chunks, by whitespace-separated words: spaCy splits "end-to-end"
+    # into five tokens
+    for chunk in doc.noun_chunks:
+        if MIN_WORDS <= len(chunk.text.split()) <= MAX_WORDS:
+            candidates.append(chunk.text)
+    return candidates
 
 def extract_skills(text, products=None, subjects=None):
     # 1) Attempt structured seeds
-    seeds = set()
-    for p in (products or []):
-        seeds.add(p.lower().strip())
-    for s in (subjects or []):
-        seeds.add(s.lower().strip())
-
-    # Clean seeds
-    seeds = {
-        re.sub(r"[^\w\s-]","", s)
-        for s in seeds
-        if len(s)>=MIN_CHAR and not re.search(r"\d",s)
-    }
+    seeds = normalize_many(list(products or []) + list(subjects or []), "seed")
 
     # 2) If we got any seeds, return them
     if seeds:
-        return list(seeds)
+        return seeds
 
     # 3) Otherwise, do hybrid NLP on the text
     if not text:
@@ -41,35 +43,13 @@ def extract_skills(text, products=None, subjects=None):
 
     # Strip HTML
     soup = BeautifulSoup(text, "html.parser")
-    cleaned = re.sub(r"\s+"," ", soup.get_text()).strip()
+    cleaned = WHITESPACE.sub(" ", soup.get_text()).strip()
     if not cleaned:
         return []
 
-    doc = nlp(cleaned)
-    skills = set()
-
-    # NER
-    for ent in doc.ents:
-        if ent.label_ in NER_LABELS:
-            skills.add(ent.text.lower().strip())
-
-    # Noun chunks
-    for chunk in doc.noun_chunks:
-        phrase = chunk.text.lower().strip()
-        words = phrase.split()
-        if MIN_WORDS <= len(words) <= MAX_WORDS:
-            skills.add(phrase)
-
-    # Final filter
-    final = []
-    for phrase in skills:
-        ph = re.sub(r"[^\w\s-]","", phrase).strip()
-        if len(ph)<MIN_CHAR: 
-            continue
-        if any(b in ph for b in EXTENDED_BLACKLIST):
-            continue
-        if re.search(r"\d",ph):
-            continue
-        final.append(ph)
+    # Raw candidates are cached per text (and computed by the inference
+    # worker when it runs); the filter below always re-runs
+    candidates = spacy_candidates_many([cleaned])[0]
 
-    return final
+    # Final filter: one batched pass (punctuation, length, digits, blacklist)
+    return normalize_many(candidates, "phrase")
@@ -0,0 +1,332 @@
+# catalog/normalize.py
+"""
+Skill-string normalization shared by every extractor.
+
+NER entities, spaCy noun chunks, LLM output and scraped "Skills" bullets
+all go through the same SkillNormalizer profiles defined here, so the
+cleanup rules (punctuation, short tokens, blacklists, de-duplication)
+live in one place. Patterns are compiled once at import, and blacklists
+are matched with a single Aho–Corasick pass instead of one `in` test per
+term, so the cost no longer grows with the blacklist.
+"""
+import re
+from bisect import bisect_right
+from collections import deque
+
+# ─── PRECOMPILED PATTERNS ───────────────────────────────────────────────────────
+STRAY_PUNCT   = re.compile(r"[^\w\s\+\#\.\-]")     # keep + # . - (C++, C#, .NET, CI-CD)
+PHRASE_PUNCT  = re.compile(r"[^\w\s-]")
+DIGIT         = re.compile(r"\d")
+WHITESPACE    = re.compile(r"\s+")
+HSPACE        = re.compile(r"[^\S\n]+")            # any whitespace run except newlines
+LINE_BREAKS   = re.compile(r"[\r\n]+")
+BULLET_PREFIX = re.compile(r"^[\-•\*\t ]+", re.MULTILINE)
+LLM_PREFIX    = re.compile(r"^(Skills:|Output:)\s*", re.IGNORECASE)
+SKILL_SPLIT   = re.compile(r"[\/\-\&]| and |, ")
+YEARS_RANGE   = re.compile(r"\b\d{1,2}[\-–]\d{1,2} years?\b", re.IGNORECASE)
+KEY_PUNCT     = re.compile(r"[^\w\s\+\#]")
+KEY_SPACE     = re.compile(r"[\s_\-\.]+")
+
+# ─── TERM LISTS ─────────────────────────────────────────────────────────────────
+ALLOWED_SHORT = {"c", "r", "ai", "go", "js"}
+
+# Exact (whole-entity) matches dropped from NER output.
+UNWANTED_TERMS = {
+    # common company/location words that get captured as entities
+    "united arab emirates", "abudhabi", "abu dhabi", "dubai", "uae", "middle east",
+    # month names
+    "january", "february", "march", "april", "may", "june", "july",
+    "august", "september", "october", "november", "december",
+}
+
+# Substring matches dropped from spaCy noun chunks / entities.
+EXTENDED_BLACKLIST = {
+    "microsoft", "certified", "learn", "introduction", "module",
+    "experience", "services", "resources", "candidate", "responsibilities",
+    "knowledge", "solution", "solutions", "clients",
+}
+
+# Whole-word matches dropped from LLM-refined skill lists.
+NON_SKILL_WORDS = {"abu dhabi", "dubai", "uae", "national", "male", "female"}
+
+# Whole-word matches that mark a scraped bullet as a demographic requirement.
+DEMOGRAPHIC_WORDS = {
+    "age", "aged", "male", "female", "residing", "resident",
+    "national", "nationals", "nationality",
+}
+
+
+class PhraseAutomaton:
+    """
+    Aho–Corasick automaton over arbitrary symbol sequences.
+
+    Symbols are characters when matching substrings and tokens when matching
+    whole phrases (see catalog.gazetteer). `scan()` reports every pattern
+    occurrence in one left-to-right pass, whatever the number of patterns.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._own = [()]      # patterns ending exactly at each node
+        self._fail = [0]
+        self._out = [()]      # own + inherited via failure links
+        self._built = True
+
+    def __len__(self):
+        return sum(len(o) for o in self._own)
+
+    def add(self, symbols, value):
+        """Insert one pattern; the automaton is rebuilt lazily on next scan."""
+        node = 0
+        for sym in symbols:
+            nxt = self._goto[node].get(sym)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._own.append(())
+                self._goto[node][sym] = nxt
+            node = nxt
+        if node == 0:
+            return
+        length = len(symbols)
+        if any(v == value for _, v in self._own[node]):
+            return
+        self._own[node] = self._own[node] + ((length, value),)
+        self._built = False
+
+    def build(self):
+        goto = self._goto
+        fail = [0] * len(goto)
+        out = list(self._own)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for sym, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and sym not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(sym, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+        self._fail, self._out = fail, out
+        self._built = True
+
+    def scan(self, symbols):
+        """Yield (start, end, value) for every pattern occurrence."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, sym in enumerate(symbols):
+            while node and sym not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(sym, 0)
+            if out[node]:
+                for length, value in out[node]:
+                    yield i + 1 - length, i + 1, value
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class TermBlacklist:
+    """
+    Case-insensitive multi-term matcher over raw text.
+
+    `contains` terms match anywhere (plain substring, like `b in phrase`);
+    `words` terms only match on word boundaries (like `\\bterm\\b`).
+    """
+
+    def __init__(self, contains=(), words=()):
+        self._automaton = PhraseAutomaton()
+        for term in contains:
+            self._automaton.add(term.lower(), (term.lower(), False))
+        for term in words:
+            self._automaton.add(term.lower(), (term.lower(), True))
+        self._automaton.build()
+
+    def __bool__(self):
+        return len(self._automaton) > 0
+
+    def hits(self, lowered):
+        """Yield (start, end, term) for matches in an already lower-cased string."""
+        for start, end, (term, whole_word) in self._automaton.scan(lowered):
+            if whole_word and (
+                (start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(term[0]))
+                or (end < len(lowered) and _is_word_char(lowered[end]) and _is_word_char(term[-1]))
+            ):
+                continue
+            yield start, end, term
+
+    def search(self, text):
+        return next(self.hits(text.lower()), None) is not None
+
+
+class SkillNormalizer:
+    """
+    A cleanup profile. Call `many()` with a list of raw strings; the whole
+    batch is joined into one buffer so every regex and the blacklist
+    automaton run once per batch instead of once per string.
+    """
+
+    def __init__(self, *, strip=None, strip_prefix=None, lowercase=False,
+                 min_len=1, allow_short=(), drop_digits=False,
+                 exact=(), contains=(), words=(), patterns=(), dedupe=True):
+        self.strip = strip
+        self.strip_prefix = strip_prefix
+        self.lowercase = lowercase
+        self.min_len = min_len
+        self.allow_short = frozenset(s.lower() for s in allow_short)
+        self.drop_digits = drop_digits
+        self.exact = frozenset(t.lower() for t in exact)
+        self.blacklist = TermBlacklist(contains=contains, words=words)
+        self.patterns = tuple(patterns)
+        self.dedupe = dedupe
+
+    def many(self, items):
+        items = [LINE_BREAKS.sub(" ", str(s)) for s in items if s]
+        if not items:
+            return []
+
+        blob = "\n".join(items)
+        if self.strip_prefix is not None:
+            blob = self.strip_prefix.sub("", blob)
+        if self.strip is not None:
+            blob = self.strip.sub("", blob)
+        blob = HSPACE.sub(" ", blob)
+        lowered = blob.lower()
+        if self.lowercase:
+            blob = lowered
+
+        lines = blob.split("\n")
+        low_lines = lowered.split("\n")
+
+        # one automaton pass over the whole batch, mapped back to line numbers
+        rejected = set()
+        if self.blacklist:
+            starts, pos = [], 0
+            for ln in low_lines:
+                starts.append(pos)
+                pos += len(ln) + 1
+            for start, _, _ in self.blacklist.hits(lowered):
+                rejected.add(bisect_right(starts, start) - 1)
+
+        out, seen = [], set()
+        for idx, (line, low) in enumerate(zip(lines, low_lines)):
+            if idx in rejected:
+                continue
+            line, low = line.strip(), low.strip()
+            if not line:
+                continue
+            if len(low) < self.min_len and low not in self.allow_short:
+                continue
+            if low in self.exact:
+                continue
+            if self.drop_digits and DIGIT.search(low):
+                continue
+            if any(p.search(line) for p in self.patterns):
+                continue
+            if self.dedupe:
+                if low in seen:
+                    continue
+                seen.add(low)
+            out.append(line)
+        return out
+
+    def one(self, item):
+        cleaned = self.many([item])
+        return cleaned[0] if cleaned else ""
+
+
+# ─── PROFILES ───────────────────────────────────────────────────────────────────
+PROFILES = {
+    # HuggingFace NER entities (dslim/bert-base-NER, jobbert)
+    "ner": SkillNormalizer(
+        strip=STRAY_PUNCT, min_len=3, allow_short=ALLOWED_SHORT,
+        exact=UNWANTED_TERMS,
+    ),
+    # spaCy entities + noun chunks
+    "phrase": SkillNormalizer(
+        strip=PHRASE_PUNCT, lowercase=True, min_len=3, drop_digits=True,
+        contains=EXTENDED_BLACKLIST,
+    ),
+    # structured seeds (products / subjects from catalog APIs)
+    "seed": SkillNormalizer(
+        strip=PHRASE_PUNCT, lowercase=True, min_len=3, drop_digits=True,
+    ),
+    # LLM comma/newline lists
+    "llm": SkillNormalizer(
+        strip_prefix=BULLET_PREFIX, words=NON_SKILL_WORDS, patterns=(YEARS_RANGE,),
+    ),
+    # scraped "Skills"/"Requirements" bullets
+    "bullet": SkillNormalizer(
+        strip_prefix=BULLET_PREFIX, words=DEMOGRAPHIC_WORDS,
+    ),
+}
+
+
+def normalize_many(items, profile="ner"):
+    """Clean a batch of raw skill strings with the named profile."""
+    return PROFILES[profile].many(items)
+
+
+def clean_ner_entities(ner_outputs):
+    """
+    Turn HuggingFace NER output into a clean list of skill names:
+    drops '##' subword fragments, then applies the "ner" profile.
+    """
+    words = []
+    for ent in ner_outputs:
+        word = (ent.get("word") or "").strip()
+        if word and not word.startswith("##"):
+            words.append(word)
+    return normalize_many(words, "ner")
+
+
+def ner_text(text):
+    """Flatten a description into the single-line form fed to NER models."""
+    return WHITESPACE.sub(" ", STRAY_PUNCT.sub(" ", text)).strip()
+
+
+def split_llm_list(raw):
+    """Split a free-form LLM 'a, b, c' / bullet list into raw items."""
+    cleaned = LLM_PREFIX.sub("", raw.strip())
+    return re.split(r"[,\n]+", cleaned)
+
+
+def fit_skill_name(raw, max_len):
+    """
+    Squeeze an over-long extractor string into Skill.name: take the first
+    delimiter-separated chunk that fits, else truncate at a word boundary.
+    """
+    raw = raw.strip()
+    if len(raw) <= max_len:
+        return raw
+    for candidate in SKILL_SPLIT.split(raw):
+        candidate = candidate.strip()
+        if candidate and len(candidate) <= max_len:
+            return candidate
+    return raw[:max_len].rsplit(" ", 1)[0]
+
+
+def fit_many(items, max_len):
+    """fit_skill_name over a batch, de-duplicated case-insensitively."""
+    out, seen = [], set()
+    for raw in items:
+        name = fit_skill_name(raw, max_len)
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            out.append(name)
+    return out
+
+
+def skill_key(name):
+    """
+    Canonical lookup key for a skill name: case-folded, punctuation other
+    than + and # removed, separators collapsed ("Node.js" → "node js").
+    """
+    key = KEY_PUNCT.sub(" ", name.casefold())
+    return KEY_SPACE.sub(" ", key).strip()
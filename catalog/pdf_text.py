@@ -0,0 +1,245 @@
+# catalog/pdf_text.py
+"""
+Page-parallel, cached PDF text extraction for the catalog pipeline.
+
+`pdf_pages()` splits a document's pages into contiguous ranges and extracts
+them on a process pool (each worker opens its own fitz handle, since
+documents can't be shared across processes). The page texts and the
+course-code → description map parsed from "Course Descriptions.pdf" are
+stored in the extraction cache keyed by the file's SHA-256, so an unchanged
+PDF costs one hash of the file and one SQLite lookup.
+"""
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .extraction_cache import get_cache
+
+# bump when the parsing below changes, to invalidate cached results
+PARSER_VERSION = "2"
+# below this, process start-up costs more than it saves
+PARALLEL_MIN_PAGES = 16
+
+# "ABC 123 Course Title (3-0-3)" at the start of a line; the title may wrap
+# once, and is bounded so a header can never scan the rest of the document
+COURSE_HEADER = re.compile(
+    r"^([A-Z]{2,5}\s*\d{3})\s+([^(\n]{0,200}(?:\n[^(\n]{0,200})?)\(([^)]{0,40})\)",
+    re.MULTILINE,
+)
+# "(3)", "(3-0-3)", "(1.5)": the last number is the credit value
+CREDITS = re.compile(r"^\s*(?:\d+(?:\.\d+)?\s*-\s*)*(\d+(?:\.\d+)?)\s*$")
+WHITESPACE = re.compile(r"\s+")
+COURSE_CODE = re.compile(r"\b[A-Z]{2,5}\s*\d{3}\b")
+PAGE_FOOTER = re.compile(r"^\d+\s*\|\s*Page")
+SENTENCE_END = re.compile(r"(?<=[\.\?!])\s+")
+HYPHEN_BREAK = re.compile(r"([a-z])[-–—]([a-z])", re.I)
+# "Prerequisite(s):", "Pre-requisites:", "Corequisite (s) :" (and the odd "Prequisite")
+REQUISITE_LABEL = re.compile(r"\b(pre|co)-?\s*(?:re)?quisites?\s*(?:\(\s*s\s*\))?\s*:", re.I)
+# a clause wraps onto the next line only after a connector or an open parenthesis
+REQUISITE_CONTINUES = re.compile(r"(?:\b(?:and|or)|[,;&(])\s*$", re.I)
+# inside a clause codes can come out letter-spaced ("M ATH 1 1 3")
+REQUISITE_TOKEN = re.compile(
+    r"(?P<code>\b[A-Z](?:\s?[A-Z]){1,4}\s*\d(?:\s?\d){2}\b)|(?P<op>[(),;&]|(?i:\band\b|\bor\b))"
+)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fitz_version():
+    import fitz
+
+    return fitz.VersionBind
+
+
+def _extract_range(args):
+    """Worker: text of pages [start, stop) of one document."""
+    import fitz
+
+    path, start, stop = args
+    with fitz.open(path) as doc:
+        return [doc[i].get_text("text") for i in range(start, stop)]
+
+
+def _page_count(path):
+    import fitz
+
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def extract_pages(path, workers=None):
+    """Uncached per-page text, on a process pool for larger documents."""
+    path = str(path)
+    n = _page_count(path)
+    workers = workers or min(os.cpu_count() or 1, 8)
+    if workers <= 1 or n < PARALLEL_MIN_PAGES:
+        return _extract_range((path, 0, n))
+    step = -(-n // workers)
+    ranges = [(path, lo, min(lo + step, n)) for lo in range(0, n, step)]
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        return [text for part in pool.map(_extract_range, ranges) for text in part]
+
+
+def pdf_pages(path, workers=None, key=None):
+    """Per-page text of `path`, from the cache when the file is unchanged."""
+    key = key or file_digest(path)
+    return get_cache().fetch_key(
+        "pdf_pages", f"fitz-{_fitz_version()}/{PARSER_VERSION}", key,
+        lambda: extract_pages(path, workers),
+    )
+
+
+def pdf_text(path, workers=None):
+    """The whole document, pages separated by newlines (as page.get_text() concatenated)."""
+    return "".join(page + "\n" for page in pdf_pages(path, workers))
+
+
+def parse_course_entries(raw):
+    """
+    Code → {"title", "credits", "description"} for every
+    "CODE 123 Title (credits)" header in `raw`. One scan for headers, then
+    each description is the slice up to the next header — linear in the
+    document, unlike a lazy DOTALL match with a lookahead tried at every
+    character.
+    """
+    heads = list(COURSE_HEADER.finditer(raw))
+    entries = {}
+    for m, nxt in zip(heads, heads[1:] + [None]):
+        code = WHITESPACE.sub(" ", m.group(1)).strip()
+        credits = CREDITS.match(m.group(3))
+        body = raw[m.end():nxt.start() if nxt else len(raw)]
+        entries[code] = {
+            "title": WHITESPACE.sub(" ", m.group(2)).strip(),
+            "credits": float(credits.group(1)) if credits else None,
+            "description": WHITESPACE.sub(" ", body).strip(),
+            **parse_requisites(body),
+        }
+    return entries
+
+
+def parse_requisites(body):
+    """
+    {"prerequisites": groups, "corequisites": groups} from one course's text.
+    Groups are all required; the codes inside a group are alternatives, so
+    "MATH 113 and (CSCI 112 or CSCI 114)" → [["MATH 113"], ["CSCI 112", "CSCI 114"]].
+    A clause is the rest of its label's line (plus wrapped lines, see
+    REQUISITE_CONTINUES), cut at the next label.
+    """
+    out = {"prerequisites": [], "corequisites": []}
+    labels = list(REQUISITE_LABEL.finditer(body))
+    for m, nxt in zip(labels, labels[1:] + [None]):
+        lines = body[m.end():nxt.start() if nxt else len(body)].split("\n")
+        clause = lines[0]
+        for line in lines[1:]:
+            if not REQUISITE_CONTINUES.search(clause) or len(clause) > 300:
+                break
+            clause += " " + line
+        groups = _requisite_groups(clause)
+        out["prerequisites" if m.group(1).lower() == "pre" else "corequisites"].extend(groups)
+    return out
+
+
+def _requisite_groups(clause):
+    groups, depth = [[]], 0
+    for tok in REQUISITE_TOKEN.finditer(clause):
+        if tok.group("code"):
+            letters, digits = re.match(r"([A-Z\s]+?)\s*([\d\s]+)$", tok.group("code")).groups()
+            code = f"{WHITESPACE.sub('', letters)} {WHITESPACE.sub('', digits)}"
+            if code not in groups[-1]:
+                groups[-1].append(code)
+            continue
+        op = tok.group("op").lower()
+        if op == "(":
+            depth += 1
+        elif op == ")":
+            depth = max(depth - 1, 0)
+        elif op != "or" and depth == 0 and groups[-1]:
+            groups.append([])      # "and" / "," / ";" / "&" outside parentheses
+    return [g for g in groups if g]
+
+
+def descriptions_map(entries):
+    """Code → description, under both "ABC 123" and "ABC123"."""
+    descs = {}
+    for code, entry in entries.items():
+        descs[code] = entry["description"]
+        descs[code.replace(" ", "")] = entry["description"]
+    return descs
+
+
+def parse_course_descriptions(raw):
+    return descriptions_map(parse_course_entries(raw))
+
+
+def course_entries(path, workers=None):
+    """parse_course_entries() of a PDF, cached by file hash."""
+    key = file_digest(path)
+    return get_cache().fetch_key(
+        "course_entries", f"fitz-{_fitz_version()}/{PARSER_VERSION}", key,
+        lambda: parse_course_entries("".join(p + "\n" for p in pdf_pages(path, workers, key))),
+    )
+
+
+def course_descriptions(path, workers=None):
+    return descriptions_map(course_entries(path, workers))
+
+
+# ─── catalog PDFs (one per major) ───────────────────────────────────────────────
+def extract_header_text(path, y_thresh=150.0):
+    """Text blocks above `y_thresh` on the first page, top to bottom."""
+    import fitz
+
+    blocks = []
+    with fitz.open(path) as doc:
+        for blk in doc[0].get_text("blocks"):
+            x0, y0, _, _, txt = blk[:5]
+            if y0 < y_thresh and not PAGE_FOOTER.match(txt.strip()):
+                blocks.append((y0, txt.strip()))
+    blocks.sort(key=lambda t: t[0])
+    return [line for _, line in blocks]
+
+
+def parse_header(lines, max_sents=2):
+    """(department, major line, first sentences of the description)."""
+    dept = lines[0] if len(lines) > 0 else ""
+    maj_line = lines[1] if len(lines) > 1 else ""
+    desc = ""
+    if len(lines) > 2:
+        sents = SENTENCE_END.split(" ".join(lines[2:]))
+        desc = WHITESPACE.sub(" ", " ".join(sents[:max_sents]).strip())
+    return dept, maj_line, desc
+
+
+def extract_course_codes(text):
+    return sorted({m.group().upper() for m in COURSE_CODE.finditer(text)})
+
+
+def flat_text(path, workers=None):
+    """pdf_text() on one line, with hyphenated word breaks split."""
+    return HYPHEN_BREAK.sub(r"\1 \2", WHITESPACE.sub(" ", pdf_text(path, workers)))
+
+
+def scan_catalog(path):
+    """
+    Header and course codes of one catalog PDF. Runs in a process-pool
+    worker, so pages are extracted serially here.
+    """
+    t0 = time.perf_counter()
+    dept, major, desc = parse_header(extract_header_text(path))
+    codes = extract_course_codes(flat_text(path, workers=1))
+    return {
+        "path": str(path),
+        "department": dept,
+        "major": major or os.path.splitext(os.path.basename(path))[0],
+        "description": desc,
+        "codes": codes,
+        "seconds": time.perf_counter() - t0,
+    }
@@ -0,0 +1,151 @@
+# catalog/posting_attributes.py
+"""
+Single-pass posting extractor: skills plus structured attributes.
+
+A description is tokenized once (the gazetteer's own tokenizer) and that
+token list feeds both the skill gazetteer and a small cue-phrase automaton
+for the attributes stored on JobPosting:
+
+    min_years_experience   "3+ years of experience", "experience: 2-4 yrs"
+    education_level        the lowest degree mentioned (1 high school … 5 doctorate)
+    employment_type        the first of full time / part time / contract / …
+
+so adding the attributes costs one extra automaton walk over tokens that
+already exist, not another tokenization of the text.
+"""
+import re
+
+from .gazetteer import tokenize
+from .normalize import PhraseAutomaton
+
+EDUCATION_CUES = {
+    1: ["high school", "secondary school"],
+    2: ["diploma", "associate degree", "associates degree", "associate s degree", "hnd"],
+    3: ["bachelor", "bachelors", "bachelor s", "bsc", "b sc", "beng", "b eng", "btech", "b tech",
+        "undergraduate degree", "university degree", "college degree"],
+    4: ["master s", "masters", "master degree", "master of", "msc", "m sc", "meng", "mba", "mtech",
+        "postgraduate degree", "graduate degree"],
+    5: ["phd", "ph d", "doctorate", "doctoral degree"],
+}
+EMPLOYMENT_CUES = {
+    "full_time": ["full time", "fulltime", "permanent role", "permanent position"],
+    "part_time": ["part time", "parttime"],
+    "contract": ["contract role", "contract position", "contract basis", "contractor",
+                 "fixed term", "freelance"],
+    "temporary": ["temporary", "temp role", "seasonal"],
+    "internship": ["internship", "intern", "trainee"],
+}
+YEAR_TOKENS = ["year", "years", "yr", "yrs"]
+# words that tie a "N years" mention to experience rather than e.g. contract length
+EXPERIENCE_WORDS = {"experience", "exp", "experienced", "professional", "relevant", "proven",
+                    "industry", "working", "work", "hands"}
+CONTEXT_BEFORE, CONTEXT_AFTER = 6, 4
+MAX_YEARS = 30
+
+NUMBER = re.compile(r"(\d{1,2})\+?$")
+NUMBER_WORDS = {w: n for n, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve "
+    "thirteen fourteen fifteen".split())}
+
+
+def _build_cues():
+    automaton = PhraseAutomaton()
+    for level, phrases in EDUCATION_CUES.items():
+        for phrase in phrases:
+            automaton.add(tuple(phrase.split()), ("education_level", level))
+    for kind, phrases in EMPLOYMENT_CUES.items():
+        for phrase in phrases:
+            automaton.add(tuple(phrase.split()), ("employment_type", kind))
+    for token in YEAR_TOKENS:
+        automaton.add((token,), ("years", None))
+    automaton.build()
+    return automaton
+
+
+CUES = _build_cues()
+
+
+def _number(token):
+    m = NUMBER.match(token)
+    if m:
+        return int(m.group(1))
+    return NUMBER_WORDS.get(token)
+
+
+def _years_before(tokens, i, strict):
+    """
+    Smallest number in the run right before tokens[i] ("3 5 years" from
+    "3-5 years" → 3), or None. With `strict`, the mention must sit near
+    an experience word.
+    """
+    numbers = []
+    j = i - 1
+    while j >= 0 and len(numbers) < 3:
+        n = _number(tokens[j])
+        if n is None:
+            if tokens[j] not in ("to", "or", "of", "least", "minimum", "min", "over"):
+                break
+        else:
+            numbers.append(n)
+        j -= 1
+    if not numbers:
+        return None
+    if strict:
+        context = tokens[max(0, j + 1 - CONTEXT_BEFORE):j + 1] + tokens[i + 1:i + 1 + CONTEXT_AFTER]
+        if not EXPERIENCE_WORDS.intersection(context):
+            return None
+    years = min(numbers)
+    return years if 0 < years <= MAX_YEARS else None
+
+
+def scan_attributes(tokens, strict=True):
+    """Attributes from an already tokenized text (see tokenize())."""
+    years, education, employment = [], [], None
+    for start, end, (attr, value) in CUES.scan(tokens):
+        if attr == "years":
+            n = _years_before(tokens, start, strict)
+            if n is not None:
+                years.append(n)
+        elif attr == "education_level":
+            education.append(value)
+        elif employment is None:
+            employment = value
+    return {
+        "min_years_experience": min(years) if years else None,
+        "education_level": min(education) if education else None,
+        "employment_type": employment or "",
+    }
+
+
+class PostingProfile:
+    """Gazetteer skills and structured attributes from one pass over a posting."""
+
+    def __init__(self, skill_ids, skills, attributes):
+        self.skill_ids = skill_ids
+        self.skills = skills
+        self.attributes = attributes
+
+    def __repr__(self):
+        return f"<PostingProfile skills={len(self.skills)} {self.attributes}>"
+
+
+def extract_posting(text, gazetteer=None, strict=True):
+    """
+    Tokenize `text` once; match skills (when a gazetteer is given) and
+    attributes over the same tokens.
+    """
+    tokens = tokenize(text or "")
+    skill_ids = []
+    if gazetteer is not None:
+        skill_ids = list(dict.fromkeys(sid for _, _, sid in gazetteer.token_spans(tokens)))
+    skills = [gazetteer.names[sid] for sid in skill_ids] if skill_ids else []
+    return PostingProfile(skill_ids, skills, scan_attributes(tokens, strict))
+
+
+def extract_attributes(text, strict=True):
+    return scan_attributes(tokenize(text or ""), strict)
+
+
+def merge_attributes(primary, fallback):
+    """`primary` values where set, else `fallback` (e.g. a scraped field over the description)."""
+    return {k: primary.get(k) if primary.get(k) not in (None, "") else v for k, v in fallback.items()}
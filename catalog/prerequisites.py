@@ -0,0 +1,143 @@
+# catalog/prerequisites.py
+"""
+Course prerequisite graph and its transitive closure.
+
+`sync_prerequisites()` turns the requisite groups parsed from the course
+descriptions (catalog.pdf_text.parse_requisites) into CoursePrerequisite
+rows between catalog courses, writing only what changed, and then
+`refresh_closure()` recomputes PrerequisiteClosure for the courses whose
+ancestry can have changed: the edited courses and everything downstream of
+them. "Every course needed before X" is then one indexed lookup on
+PrerequisiteClosure(course=X) instead of a recursive walk per request.
+
+Only prerequisites are followed for the closure; corequisites are taken
+alongside the course, not before it. A closure row is `required` when it
+is reachable through mandatory edges only (groups with one alternative).
+"""
+from collections import deque
+
+from django.db import transaction
+
+
+def _compact(code):
+    return code.replace(" ", "")
+
+
+def sync_prerequisites(entries):
+    """
+    Link catalog courses (major=NULL) to the requisites listed in `entries`
+    (catalog.pdf_text.course_entries() output). Codes without a Course row
+    are skipped. Returns (added, removed) edges.
+    """
+    from .models import Course, CoursePrerequisite
+
+    ids = {_compact(code): pk for code, pk in Course.objects.filter(major__isnull=True)
+           .values_list("code", "pk")}
+    wanted = {}       # (course, prerequisite) -> (kind, group, alternatives)
+    for code, entry in entries.items():
+        course = ids.get(_compact(code))
+        if course is None:
+            continue
+        for kind, field in (("pre", "prerequisites"), ("co", "corequisites")):
+            for group, alternatives in enumerate(entry.get(field, ())):
+                for alt in alternatives:
+                    prerequisite = ids.get(_compact(alt))
+                    if prerequisite is not None and prerequisite != course:
+                        wanted.setdefault((course, prerequisite), (kind, group, len(alternatives)))
+
+    scope = {ids[_compact(code)] for code in entries if _compact(code) in ids}
+    stale, touched = [], set()
+    for pk, course, prerequisite, kind, group, alternatives in (
+            CoursePrerequisite.objects.filter(course_id__in=scope)
+            .values_list("pk", "course_id", "prerequisite_id", "kind", "group", "alternatives")):
+        if wanted.get((course, prerequisite)) == (kind, group, alternatives):
+            del wanted[(course, prerequisite)]          # unchanged
+        else:
+            stale.append(pk)                           # gone, or changed and re-added below
+            touched.add(course)
+    rows = [
+        CoursePrerequisite(course_id=course, prerequisite_id=prerequisite,
+                           kind=kind, group=group, alternatives=alternatives)
+        for (course, prerequisite), (kind, group, alternatives) in wanted.items()
+    ]
+    touched.update(course for course, _ in wanted)
+    with transaction.atomic():
+        if stale:
+            CoursePrerequisite.objects.filter(pk__in=stale).delete()
+        CoursePrerequisite.objects.bulk_create(rows)
+        refresh_closure(touched)
+    return len(rows), len(stale)
+
+
+def _graph():
+    """course -> [(prerequisite, mandatory)] over prerequisite edges, and its reverse."""
+    from .models import CoursePrerequisite
+
+    parents, children = {}, {}
+    for course, prerequisite, alternatives in (CoursePrerequisite.objects.filter(kind="pre")
+                                               .values_list("course_id", "prerequisite_id", "alternatives")):
+        parents.setdefault(course, []).append((prerequisite, alternatives <= 1))
+        children.setdefault(prerequisite, []).append(course)
+    return parents, children
+
+
+def ancestors(course, parents):
+    """{ancestor: (depth, required)} by breadth-first search; cycles are cut at the first revisit."""
+    depth = {}
+    queue = deque([(course, 0)])
+    while queue:
+        node, d = queue.popleft()
+        for parent, _ in parents.get(node, ()):
+            if parent != course and parent not in depth:
+                depth[parent] = d + 1
+                queue.append((parent, d + 1))
+    required, queue = set(), deque([course])
+    while queue:
+        node = queue.popleft()
+        for parent, mandatory in parents.get(node, ()):
+            if mandatory and parent != course and parent not in required:
+                required.add(parent)
+                queue.append(parent)
+    return {a: (d, a in required) for a, d in depth.items()}
+
+
+def refresh_closure(course_ids=None):
+    """
+    Recompute PrerequisiteClosure for `course_ids` and every course that
+    depends on them (all courses when None). Returns the number of rows written.
+    """
+    from .models import PrerequisiteClosure
+
+    parents, children = _graph()
+    if course_ids is None:
+        affected = set(parents) | set(PrerequisiteClosure.objects.values_list("course_id", flat=True))
+    else:
+        affected, queue = set(course_ids), deque(course_ids)
+        while queue:
+            for child in children.get(queue.popleft(), ()):
+                if child not in affected:
+                    affected.add(child)
+                    queue.append(child)
+    if not affected:
+        return 0
+
+    rows = [
+        PrerequisiteClosure(course_id=course, ancestor_id=ancestor, depth=depth, required=required)
+        for course in affected
+        for ancestor, (depth, required) in ancestors(course, parents).items()
+    ]
+    with transaction.atomic():
+        PrerequisiteClosure.objects.filter(course_id__in=affected).delete()
+        PrerequisiteClosure.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def prerequisites_of(course_ids):
+    """{course id: [PrerequisiteClosure with .ancestor]} nearest first, in one query."""
+    from .models import PrerequisiteClosure
+
+    out = {cid: [] for cid in course_ids}
+    for row in (PrerequisiteClosure.objects.filter(course_id__in=course_ids)
+                .select_related("ancestor").order_by("depth", "ancestor__code")):
+        out[row.course_id].append(row)
+    return out
@@ -0,0 +1,179 @@
+# catalog/recommend.py
+"""
+Minimum-set certification recommender.
+
+Each Skill id maps to a bitset (a Python int) of the certifications that
+cover it, bit i standing for the i-th certification. Answering "which few
+certs cover all of this student's gaps" is then a greedy weighted set
+cover over those bitsets:
+
+    repeatedly pick the cert with the best  newly-covered-skills / cost,
+    where cost grows with is_paid and shrinks with relevance_score,
+
+which is within a ln(n) factor of the optimal cover and needs no queries
+once the index is loaded. The index is rebuilt lazily after any change to
+Certification or Certification.skills (see catalog.signals), and at most
+every CERT_RECOMMENDER["max_age"] seconds so other processes' edits show up.
+"""
+import heapq
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+DEFAULT_CONFIG = {
+    "paid_cost": 2.0,     # a paid exam counts as this many free ones…
+    "free_cost": 1.0,
+    "max_age": 300,       # …and the in-memory index is rebuilt at least this often
+}
+
+
+def recommender_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "CERT_RECOMMENDER", {})}
+
+
+class CertCover:
+    """One greedy pick: the cert, the missing skills it newly covers, its cost."""
+
+    def __init__(self, cert_id, skill_ids, cost):
+        self.cert_id = cert_id
+        self.skill_ids = skill_ids
+        self.cost = cost
+
+    def __repr__(self):
+        return f"<CertCover cert={self.cert_id} covers={len(self.skill_ids)} cost={self.cost:.2f}>"
+
+
+class CertCoverIndex:
+    def __init__(self, paid_cost=None, free_cost=None):
+        config = recommender_config()
+        self.paid_cost = config["paid_cost"] if paid_cost is None else paid_cost
+        self.free_cost = config["free_cost"] if free_cost is None else free_cost
+        self.cert_ids = []                    # bit position -> Certification.id
+        self.costs = []                       # bit position -> weight
+        self.skill_certs = {}                 # skill_id -> bitset of cert positions
+        self._positions = {}
+        self.built_at = 0.0
+
+    def __len__(self):
+        return len(self.cert_ids)
+
+    def cost(self, is_paid, relevance_score):
+        base = self.paid_cost if is_paid else self.free_cost
+        return base / (1.0 + max(relevance_score or 0.0, 0.0))
+
+    # ─── building ───────────────────────────────────────────────────────────────
+    def load(self, certs, links):
+        """
+        certs: [(cert_id, is_paid, relevance_score), …]
+        links: [(cert_id, skill_id), …]
+        """
+        pos = {}
+        self.cert_ids, self.costs = [], []
+        for cid, is_paid, relevance in certs:
+            pos[cid] = len(self.cert_ids)
+            self.cert_ids.append(cid)
+            self.costs.append(self.cost(is_paid, relevance))
+
+        skill_certs = defaultdict(int)
+        for cid, sid in links:
+            if cid in pos:
+                skill_certs[sid] |= 1 << pos[cid]
+        self.skill_certs = dict(skill_certs)
+        self._positions = {}
+        self.built_at = time.monotonic()
+        return self
+
+    @classmethod
+    def build_from_db(cls):
+        from .models import Certification
+
+        certs = Certification.objects.order_by("id").values_list("id", "is_paid", "relevance_score")
+        links = Certification.skills.through.objects.values_list("certification_id", "skill_id")
+        return cls().load(certs.iterator(), links.iterator())
+
+    # ─── queries ────────────────────────────────────────────────────────────────
+    def certs_for(self, skill_id):
+        """Positions of the certs covering one skill (decoded once, then cached)."""
+        positions = self._positions.get(skill_id)
+        if positions is None:
+            bits = bin(self.skill_certs.get(skill_id, 0))[:1:-1]
+            positions = self._positions[skill_id] = [p for p, b in enumerate(bits) if b == "1"]
+        return positions
+
+    def coverage(self, skill_ids):
+        """cert position -> bitset over `skill_ids` (by list index) it covers."""
+        cover = defaultdict(int)
+        for j, sid in enumerate(skill_ids):
+            for p in self.certs_for(sid):
+                cover[p] |= 1 << j
+        return cover
+
+    def matches(self, skill_ids, min_matches=1):
+        """[(cert_id, match_count), …] covering ≥ min_matches skills, best first."""
+        skill_ids = list(dict.fromkeys(skill_ids))
+        ranked = [
+            (self.cert_ids[p], bits.bit_count())
+            for p, bits in self.coverage(skill_ids).items()
+            if bits.bit_count() >= min_matches
+        ]
+        ranked.sort(key=lambda r: (-r[1], r[0]))
+        return ranked
+
+    def cover(self, skill_ids, max_certs=None):
+        """
+        Greedy weighted set cover of `skill_ids`. Returns (picks, uncovered_ids):
+        CertCover picks in selection order, plus the skills no cert teaches.
+        """
+        skill_ids = list(dict.fromkeys(skill_ids))
+        cover = self.coverage(skill_ids)
+        reachable = 0
+        for bits in cover.values():
+            reachable |= bits
+        uncovered = reachable
+
+        # lazy greedy: a cert's gain only shrinks as skills get covered, so a
+        # stale heap entry is an upper bound and only the top needs rechecking
+        heap = [(-bits.bit_count() / self.costs[p], -bits.bit_count(), p) for p, bits in cover.items()]
+        heapq.heapify(heap)
+        picks = []
+        while uncovered and heap and (max_certs is None or len(picks) < max_certs):
+            _, _, p = heapq.heappop(heap)
+            newly = cover[p] & uncovered
+            gain = newly.bit_count()
+            if not gain:
+                continue
+            entry = (-gain / self.costs[p], -gain, p)
+            if heap and entry > heap[0]:
+                heapq.heappush(heap, entry)
+                continue
+            uncovered &= ~newly
+            picks.append(CertCover(
+                self.cert_ids[p],
+                [sid for j, sid in enumerate(skill_ids) if newly >> j & 1],
+                self.costs[p],
+            ))
+
+        left = [sid for j, sid in enumerate(skill_ids) if not (reachable >> j & 1) or uncovered >> j & 1]
+        return picks, left
+
+
+_lock = threading.Lock()
+_instance = None
+
+
+def get_cover_index():
+    """Process-wide index, rebuilt after invalidate() or once it is max_age old."""
+    global _instance
+    max_age = recommender_config()["max_age"]
+    with _lock:
+        if _instance is None or (max_age and time.monotonic() - _instance.built_at > max_age):
+            _instance = CertCoverIndex.build_from_db()
+        return _instance
+
+
+def invalidate():
+    global _instance
+    with _lock:
+        _instance = None
@@ -0,0 +1,230 @@
+# catalog/semantic.py
+"""
+Persisted FAISS index over Skill names (all-MiniLM-L6-v2 embeddings).
+
+Vectors are L2-normalised and stored in an inner-product index keyed by
+Skill.id, so a search score is cosine similarity. The index lives under
+settings.SKILL_INDEX_DIR next to a small JSON sidecar (id → name).
+
+Writers top the index up with `refresh()`, which only pulls skills newer
+than the highest id it has seen (like the gazetteer); renames and deletions
+(catalog.signals → invalidate()) mark the index stale on disk so the next
+refresh reconciles with the whole table. Changes are written to disk once, by `flush()` at process exit,
+not per added skill.
+
+Lookups between existing skills (e.g. in MissingSkills) reconstruct the
+stored vectors, so the web process never needs to load the embedder. Readers
+reload the persisted index when a writer has saved a newer one.
+"""
+import atexit
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from .inference import EMBEDDING_MODEL, embed_many
+
+INDEX_FILE = "skills.faiss"
+
+
+def _faiss():
+    import faiss
+    return faiss
+
+
+def embed(texts, model=EMBEDDING_MODEL, batch_size=256):
+    return embed_many(texts, model, normalize=True, batch_size=batch_size)
+
+
+class SkillVectorIndex:
+    def __init__(self, index=None, names=None, model=EMBEDDING_MODEL):
+        self.index = index
+        self.names = names or {}      # skill_id -> name the vector was built from
+        self.model = model
+        self.max_skill_id = max(self.names, default=0)
+        self.dirty = False
+
+    def __len__(self):
+        return 0 if self.index is None else self.index.ntotal
+
+    # ─── maintenance ────────────────────────────────────────────────────────────
+    def _ensure_index(self, dim):
+        if self.index is None:
+            faiss = _faiss()
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    def add(self, pairs):
+        """Embed and add [(skill_id, name), …]."""
+        pairs = list(pairs)
+        if not pairs:
+            return
+        vecs = embed([n for _, n in pairs], self.model)
+        self._ensure_index(vecs.shape[1])
+        self.index.add_with_ids(vecs, np.array([i for i, _ in pairs], dtype="int64"))
+        self.names.update(pairs)
+        self.max_skill_id = max(self.max_skill_id, *(i for i, _ in pairs))
+        self.dirty = True
+
+    def remove(self, ids):
+        ids = list(ids)
+        if ids and self.index is not None:
+            self.index.remove_ids(np.array(ids, dtype="int64"))
+            self.dirty = True
+        for i in ids:
+            self.names.pop(i, None)
+
+    def refresh(self, full=False):
+        """
+        Embed skills created since the last refresh; with `full`, reconcile
+        with the whole Skill table instead (renamed skills re-embedded,
+        deleted ones dropped). Returns (added, removed).
+        """
+        from .models import Skill
+
+        if not full:
+            fresh = list(Skill.objects.filter(id__gt=self.max_skill_id).order_by("id").values_list("id", "name"))
+            self.add(fresh)
+            return len(fresh), 0
+
+        current = dict(Skill.objects.values_list("id", "name"))
+        stale = [i for i, n in self.names.items() if current.get(i) != n]
+        fresh = [(i, n) for i, n in current.items() if self.names.get(i) != n]
+        self.remove(stale)
+        self.add(fresh)
+        return len(fresh), len(stale)
+
+    # ─── queries ────────────────────────────────────────────────────────────────
+    def search_vectors(self, vecs, k=5):
+        if not len(self):
+            return [[] for _ in range(len(vecs))]
+        scores, ids = self.index.search(np.ascontiguousarray(vecs, dtype="float32"), k)
+        return [
+            [(int(i), self.names.get(int(i), ""), float(s)) for i, s in zip(row_ids, row_scores) if i != -1]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
+
+    def nearest(self, names, k=5):
+        """[(skill_id, name, cosine), …] for each free-text name (needs the embedder)."""
+        return self.search_vectors(embed(names, self.model), k)
+
+    def neighbours(self, skill_ids, k=5):
+        """Like nearest(), but for existing skills — uses stored vectors, no model load."""
+        skill_ids = [i for i in skill_ids if i in self.names]
+        if not skill_ids:
+            return {}
+        vecs = np.vstack([self.index.reconstruct(int(i)) for i in skill_ids])
+        return dict(zip(skill_ids, self.search_vectors(vecs, k + 1)))
+
+    def resolve(self, names, threshold=None):
+        """Map each name to the closest Skill id at ≥ threshold cosine, else None."""
+        threshold = settings.SKILL_SIMILARITY_THRESHOLD if threshold is None else threshold
+        out = []
+        for hits in self.nearest(names, k=1):
+            out.append(hits[0][0] if hits and hits[0][2] >= threshold else None)
+        return out
+
+    # ─── persistence ────────────────────────────────────────────────────────────
+    @staticmethod
+    def path():
+        return Path(settings.SKILL_INDEX_DIR) / INDEX_FILE
+
+    def save(self, path=None):
+        path = Path(path or self.path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.index is not None:
+            _faiss().write_index(self.index, str(path))
+        meta = {"model": self.model, "names": {str(i): n for i, n in self.names.items()}}
+        path.with_suffix(".json").write_text(json.dumps(meta), encoding="utf-8")
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=None):
+        path = Path(path or cls.path())
+        meta_path = path.with_suffix(".json")
+        if not (path.exists() and meta_path.exists()):
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("model") != EMBEDDING_MODEL:
+            return None
+        names = {int(i): n for i, n in meta["names"].items()}
+        return cls(_faiss().read_index(str(path)), names, meta["model"])
+
+
+_lock = threading.Lock()
+_instance = None
+_loaded_mtime = None      # mtime of the sidecar _instance was loaded from / saved to
+_reconciled = None        # mtime of the stale marker the in-memory index has caught up with
+_flush_registered = False
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _meta_path():
+    # the sidecar is written after the FAISS file, so its mtime marks a complete save
+    return SkillVectorIndex.path().with_suffix(".json")
+
+
+def _stale_path():
+    return SkillVectorIndex.path().with_suffix(".stale")
+
+
+def get_index(refresh=False):
+    """
+    Process-wide index. Readers (API views) use the persisted index, reloaded
+    when a writer has saved a newer one; writers (ingesters,
+    build_skill_index) pass refresh=True to top it up in memory, and the
+    result is saved once at exit (flush()).
+    """
+    global _instance, _loaded_mtime, _reconciled, _flush_registered
+    with _lock:
+        if _instance is None or (not _instance.dirty and _mtime(_meta_path()) != _loaded_mtime):
+            _loaded_mtime = _mtime(_meta_path())
+            _instance = SkillVectorIndex.load() or SkillVectorIndex()
+        if refresh:
+            stale = _mtime(_stale_path())
+            _instance.refresh(full=stale is not None and stale != _reconciled)
+            _reconciled = stale
+        if _instance.dirty and not _flush_registered:
+            atexit.register(flush)
+            _flush_registered = True
+        return _instance
+
+
+def flush():
+    """Write the in-memory index to disk if it changed since it was loaded or saved."""
+    global _loaded_mtime
+    with _lock:
+        if _instance is None or not _instance.dirty:
+            return
+        _instance.save()
+        _loaded_mtime = _mtime(_meta_path())
+        # only clear the marker if no rename/delete happened since we reconciled
+        if _reconciled is not None and _mtime(_stale_path()) == _reconciled:
+            _stale_path().unlink(missing_ok=True)
+
+
+def invalidate():
+    """
+    A skill was renamed or deleted: the next refresh, in whichever process
+    runs it, reconciles with the whole table. Marked on disk because renames
+    happen in the web process and refreshes in the writers.
+    """
+    path = _stale_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+def available():
+    """True if faiss is importable and a persisted index exists."""
+    try:
+        _faiss()
+    except ImportError:
+        return False
+    return SkillVectorIndex.path().exists()
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Major, Skill, JobPosting, StudentProfile, Certification, FacultyProfile
+from .models import Major, Skill, JobPosting, StudentProfile, Certification, FacultyProfile, Course
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from .models import JobField
@@ -89,19 +89,70 @@ class JobPostingSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JobPosting
-        fields = ["id","title","company_name","location","skills", "job_field"]
+        fields = ["id","title","company_name","location","skills", "job_field",
+                  "min_years_experience", "education_level", "employment_type"]
 
 class CertificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Certification
         fields = ["id", "name", "provider", "url", "relevance_score"]
 
+class CertificationCoverSerializer(CertificationSerializer):
+    # ids of the missing skills this cert was picked to cover
+    covers = serializers.ListField(child=serializers.IntegerField())
+
+    class Meta(CertificationSerializer.Meta):
+        fields = CertificationSerializer.Meta.fields + ["is_paid", "covers"]
+
 class MissingSerializer(serializers.Serializer):
     missing_skills = SkillSerializer(many=True)
     # suggestions is a dict: skill_name -> list of CertificationSerializer
     suggestions = serializers.DictField(
         child=CertificationSerializer(many=True)
     )
+    # fewest/cheapest certs that together cover the missing skills
+    recommended = CertificationCoverSerializer(many=True)
+    uncovered_skill_ids = serializers.ListField(child=serializers.IntegerField())
+
+class CourseSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Course
+        fields = ["id", "code", "name", "credits"]
+
+class PrerequisiteSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    code = serializers.CharField()
+    name = serializers.CharField()
+    depth = serializers.IntegerField()
+    # false when only needed through one of several alternatives
+    required = serializers.BooleanField()
+    in_major = serializers.BooleanField()
+
+class ElectiveSerializer(serializers.Serializer):
+    course = CourseSerializer()
+    covers = SkillSerializer(many=True)
+    prerequisites = PrerequisiteSerializer(many=True)
+    outstanding = serializers.IntegerField()
+
+class ElectivesSerializer(serializers.Serializer):
+    missing_skills = SkillSerializer(many=True)
+    electives = ElectiveSerializer(many=True)
+
+class RankedPostingSerializer(serializers.Serializer):
+    job = JobPostingSerializer()
+    matched = serializers.IntegerField()
+    missing = serializers.IntegerField()
+    # matched / the posting's skill count
+    ratio = serializers.FloatField()
+
+class FieldRankingSerializer(serializers.Serializer):
+    job_field = serializers.CharField()
+    scored = serializers.IntegerField()
+    results = RankedPostingSerializer(many=True)
+
+class ExtractSkillsSerializer(serializers.Serializer):
+    # pasted job ad or resume
+    text = serializers.CharField(max_length=20000)
 
 class FacultyProfileSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,16 +1,174 @@
-from django.db.models import Count
-from .models import Certification
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Lower
+
+from .models import Certification, Skill, SkillAlias
+from .recommend import get_cover_index
 
 def get_candidate_certs(job_skill_names, min_matches=1):
     """
     Returns Certifications that cover ≥ min_matches of the given job_skill_names,
-    sorted by descending match_count.
+    sorted by descending match_count. Overlaps come from the in-memory cover
+    index; the result is still a QuerySet, with match_count annotated.
     """
+    skill_ids = Skill.objects.filter(name__in=job_skill_names).values_list("id", flat=True)
+    ranked = get_cover_index().matches(skill_ids, min_matches)
+    if not ranked:
+        return Certification.objects.none()
     return (
         Certification.objects
-            .filter(skills__name__in=job_skill_names)
-            .annotate(match_count=Count('skills'))
-            .filter(match_count__gte=min_matches)
-            .order_by('-match_count')
-            .distinct()
+            .filter(pk__in=[cid for cid, _ in ranked])
+            .annotate(match_count=Case(*(When(pk=cid, then=Value(n)) for cid, n in ranked),
+                                       output_field=IntegerField()))
+            .order_by('-match_count', 'pk')
     )
+
+
+def recommend_certs(missing_ids, max_certs=None):
+    """
+    Smallest-cost set of Certifications that together cover `missing_ids`
+    (greedy weighted set cover, see catalog.recommend). Each returned cert
+    has `covers` = the Skill ids it was picked for; also returns the ids no
+    certification teaches.
+    """
+    picks, uncovered = get_cover_index().cover(missing_ids, max_certs)
+    by_id = Certification.objects.in_bulk([p.cert_id for p in picks])
+    certs = []
+    for pick in picks:
+        if pick.cert_id in by_id:
+            by_id[pick.cert_id].covers = pick.skill_ids
+            certs.append(by_id[pick.cert_id])
+    return certs, uncovered
+
+
+def _semantic_index(refresh):
+    """The FAISS skill index, or None when faiss/sentence-transformers are unavailable."""
+    try:
+        from . import semantic
+        if not refresh and not semantic.available():
+            return None
+        return semantic.get_index(refresh=refresh)
+    except ImportError:
+        return None
+
+
+def _find_skills(names, semantic, threshold, refresh):
+    """{lowered name: Skill} for the names that already exist (exactly, via alias, or semantically)."""
+    lowered = {n.lower() for n in names}
+    found = {
+        s.lname: s
+        for s in Skill.objects.annotate(lname=Lower("name")).filter(lname__in=lowered)
+    }
+    for a in (SkillAlias.objects.annotate(lalias=Lower("alias"))
+              .filter(lalias__in=lowered - found.keys()).select_related("skill")):
+        found[a.lalias] = a.skill
+
+    pending = [n for n in names if n.lower() not in found]
+    index = _semantic_index(refresh=refresh) if (pending and semantic) else None
+    if index is not None:
+        ids = index.resolve(pending, threshold)
+        by_id = Skill.objects.in_bulk([i for i in ids if i is not None])
+        for name, sid in zip(pending, ids):
+            if sid in by_id:
+                found[name.lower()] = by_id[sid]
+    return found, index
+
+
+def _clean_names(names):
+    return [n for n in dict.fromkeys((n or "").strip() for n in names) if n]
+
+
+def resolve_skill_map(names, semantic=True, threshold=None):
+    """
+    {lowered name: Skill} for every name, in one pass:
+      1. case-insensitive match on Skill.name or SkillAlias.alias
+      2. nearest existing Skill in the semantic index (cosine ≥ threshold)
+      3. otherwise create a new Skill (and add it to the index)
+    """
+    names = _clean_names(names)
+    if not names:
+        return {}
+    found, index = _find_skills(names, semantic, threshold, refresh=True)
+
+    created = []
+    for name in names:
+        if name.lower() not in found:
+            skill, is_new = Skill.objects.get_or_create(name=name)
+            found[name.lower()] = skill
+            if is_new:
+                created.append((skill.id, skill.name))
+    if index is not None and created:
+        index.add(created)        # saved once when the writing process exits (semantic.flush)
+    return found
+
+
+def resolve_skills(names, semantic=True, threshold=None):
+    """Map raw extractor output to Skill rows, in input order (see resolve_skill_map)."""
+    names = _clean_names(names)
+    found = resolve_skill_map(names, semantic, threshold)
+    return list({found[n.lower()].id: found[n.lower()] for n in names}.values())
+
+
+def link_posting_skills(posting, names, result=None, source=None, semantic=True):
+    """
+    Add JobPosting ↔ Skill links for `names` with their provenance: the tier
+    each name came from in `result` (a catalog.extraction.ExtractionResult),
+    else `source`. Links from the tier that settled the result carry its
+    confidence. Existing links are kept, and posting.skill_ids is refreshed
+    (bulk_create bypasses m2m_changed). Returns the number of links offered.
+    """
+    from .models import JobPosting, JobPostingSkill
+    from .skill_arrays import refresh_skill_ids
+
+    names = _clean_names(names)
+    found = resolve_skill_map(names, semantic)
+    tiers = {k.lower(): v for k, v in result.sources.items()} if result else {}
+    default = JobPostingSkill.UNKNOWN if source is None else source
+    rows = {}
+    for name in names:
+        skill = found.get(name.lower())
+        if skill is None or skill.id in rows:
+            continue
+        tier = tiers.get(name.lower(), result.tier if result else None)
+        settled = result is not None and result.tier is not None and tier == result.tier
+        rows[skill.id] = JobPostingSkill(
+            jobposting=posting, skill=skill,
+            source=JobPostingSkill.TIER_SOURCES.get(tier, default),
+            confidence=min(100, max(0, round(result.confidence * 100))) if settled else None,
+        )
+    offered = len(JobPostingSkill.objects.bulk_create(rows.values(), ignore_conflicts=True))
+    if offered:
+        refresh_skill_ids(JobPosting, [posting.pk])
+        posting.refresh_from_db(fields=["skill_ids"])   # a later posting.save() mustn't write the stale list
+    return offered
+
+
+def match_skills(names, semantic=True, threshold=None):
+    """
+    Read-only resolve_skills(): (existing Skills in input order, names that
+    matched nothing). Uses the persisted semantic index as-is.
+    """
+    names = _clean_names(names)
+    if not names:
+        return [], []
+    found, _ = _find_skills(names, semantic, threshold, refresh=False)
+    skills = list({found[n.lower()].id: found[n.lower()] for n in names if n.lower() in found}.values())
+    return skills, [n for n in names if n.lower() not in found]
+
+
+def semantically_covered(missing_ids, have_ids, threshold=None):
+    """
+    Subset of `missing_ids` whose near-duplicate (cosine ≥ threshold) is in
+    `have_ids` — e.g. a student with "ML" is not missing "Machine Learning".
+    """
+    if not missing_ids or not have_ids:
+        return set()
+    index = _semantic_index(refresh=False)
+    if index is None:
+        return set()
+    threshold = settings.SKILL_SIMILARITY_THRESHOLD if threshold is None else threshold
+    covered = set()
+    for sid, hits in index.neighbours(missing_ids, k=5).items():
+        if any(hid in have_ids and hid != sid and score >= threshold for hid, _, score in hits):
+            covered.add(sid)
+    return covered
@@ -1,9 +1,13 @@
 # catalog/signals.py
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.db             import transaction
 from django.dispatch       import receiver
 from django.contrib.auth   import get_user_model
-from .models               import StudentProfile , FacultyProfile
+from .models               import (StudentProfile , FacultyProfile, Skill, SkillAlias, Certification,
+                                   CoursePrerequisite, JobPosting)
+from .                     import gazetteer, matching, prerequisites, recommend, semantic
+from .skill_arrays         import refresh_skill_ids
 
 User = get_user_model()
 
@@ -25,4 +29,120 @@ def sync_profiles(sender, instance, created, **kwargs):
         StudentProfile.objects.filter(user=instance).delete()
     else:
         StudentProfile.objects.get_or_create(user=instance)
-        FacultyProfile.objects.filter(user=instance).delete()      
+        FacultyProfile.objects.filter(user=instance).delete()
+
+
+# the columns the gazetteer/vector index are built from
+TERM_FIELDS = {Skill: ("name",), SkillAlias: ("alias", "skill_id")}
+
+
+@receiver(pre_save, sender=Skill)
+@receiver(pre_save, sender=SkillAlias)
+def remember_terms(sender, instance, update_fields=None, **kwargs):
+    """Load the stored name/alias so post_save can tell whether it really changed."""
+    fields = TERM_FIELDS[sender]
+    instance._stored_terms = None
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {"name", "alias", "skill", "skill_id"} & set(update_fields):
+        return
+    instance._stored_terms = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+def _terms_changed(sender, instance, created):
+    stored = instance.__dict__.pop("_stored_terms", None)
+    if created or stored is None:
+        return False
+    return stored != tuple(getattr(instance, f) for f in TERM_FIELDS[sender])
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+def gazetteer_on_save(sender, instance, created, **kwargs):
+    """
+    New rows are picked up incrementally by gazetteer.refresh(); only a
+    rename can leave stale patterns behind, so that forces a rebuild.
+    Saves that leave the name/alias alone (e.g. a category edit) keep it.
+    """
+    if not _terms_changed(sender, instance, created):
+        return
+    gazetteer.invalidate()
+    if sender is Skill:
+        semantic.invalidate()
+
+
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=SkillAlias)
+def gazetteer_on_delete(sender, instance, **kwargs):
+    gazetteer.invalidate()
+
+
+@receiver(post_delete, sender=Skill)
+def skill_index_on_delete(sender, instance, **kwargs):
+    semantic.invalidate()
+
+
+@receiver(m2m_changed, sender=Certification.skills.through)
+def recommender_on_cert_skills(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        recommend.invalidate()
+
+
+@receiver(post_save, sender=Certification)
+@receiver(post_delete, sender=Certification)
+def recommender_on_cert(sender, instance, **kwargs):
+    """is_paid / relevance_score feed the cover weights."""
+    recommend.invalidate()
+
+
+@receiver(post_save, sender=CoursePrerequisite)
+@receiver(post_delete, sender=CoursePrerequisite)
+def closure_on_prerequisite(sender, instance, **kwargs):
+    """Admin edits; catalog syncs write in bulk and refresh the closure themselves."""
+    course_id = instance.course_id
+    transaction.on_commit(lambda: prerequisites.refresh_closure([course_id]))
+
+
+@receiver(m2m_changed, sender=JobPosting.skills.through)
+@receiver(m2m_changed, sender=StudentProfile.skills.through)
+def skill_ids_on_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep JobPosting/StudentProfile.skill_ids in step with their links, from
+    either side (posting.skills.add(...) or skill.job_postings.add(...)).
+    """
+    owner = JobPosting if sender is JobPosting.skills.through else StudentProfile
+    fk = "jobposting_id" if owner is JobPosting else "studentprofile_id"
+    if action == "pre_clear" and reverse:
+        # the skill's owners are gone from the link table by post_clear
+        instance._skill_array_owners = list(sender.objects.filter(skill=instance).values_list(fk, flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        refresh_skill_ids(owner, [instance.pk])
+        instance.refresh_from_db(fields=["skill_ids"])
+    elif action == "post_clear":
+        refresh_skill_ids(owner, instance.__dict__.pop("_skill_array_owners", []))
+    elif pk_set:
+        refresh_skill_ids(owner, pk_set)
+
+
+@receiver(pre_delete, sender=Skill)
+def skill_ids_on_skill_delete(sender, instance, **kwargs):
+    """The cascade removes the skill's links without m2m_changed; drop its id once committed."""
+    postings = list(JobPosting.skills.through.objects.filter(skill=instance)
+                    .values_list("jobposting_id", flat=True))
+    profiles = list(StudentProfile.skills.through.objects.filter(skill=instance)
+                    .values_list("studentprofile_id", flat=True))
+    if postings:
+        transaction.on_commit(lambda: refresh_skill_ids(JobPosting, postings))
+    if profiles:
+        transaction.on_commit(lambda: refresh_skill_ids(StudentProfile, profiles))
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def matcher_on_posting(sender, instance, **kwargs):
+    """A posting can move between fields; skill changes arrive through refresh_skill_ids()."""
+    pk = instance.pk
+    transaction.on_commit(lambda: matching.mark_stale([pk]))
@@ -0,0 +1,78 @@
+# catalog/skill_arrays.py
+"""
+Denormalized skill ids on JobPosting and StudentProfile.
+
+`skill_ids` mirrors each row's links in JobPostingSkill / StudentProfileSkill
+as a sorted bigint[] with a GIN index, so set questions about postings are
+single SQL expressions instead of per-posting link queries:
+
+  overlap      JobPosting.objects.filter(skill_ids__overlap=profile.skill_ids)
+  containment  JobPosting.objects.filter(skill_ids__contained_by=profile.skill_ids)
+  missing      JobPosting.objects.annotate(missing=SkillsMissing("skill_ids", ids))
+
+The link tables stay the source of truth. m2m_changed keeps the arrays in
+step for .add()/.remove()/.set()/.clear() (catalog.signals); bulk writers
+that go straight to the through table call `refresh_skill_ids()` themselves,
+which also hands changed postings to the in-memory matcher (catalog.matching).
+"""
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.db.models import F, Func, OuterRef, Value
+
+
+def _through(model):
+    """(through model, FK name of `model` on it)."""
+    from .models import JobPosting, JobPostingSkill, StudentProfile, StudentProfileSkill
+
+    return {JobPosting: (JobPostingSkill, "jobposting"),
+            StudentProfile: (StudentProfileSkill, "studentprofile")}[model]
+
+
+def refresh_skill_ids(model, ids=None):
+    """
+    Rebuild `skill_ids` from the link table for the `model` rows in `ids`
+    (all rows when None), in one UPDATE. Returns the number of rows updated.
+    """
+    from . import matching
+
+    through, fk = _through(model)
+    ids = None if ids is None else list(ids)
+    qs = model.objects.all() if ids is None else model.objects.filter(pk__in=ids)
+    links = through.objects.filter(**{fk: OuterRef("pk")}).order_by("skill_id").values("skill_id")
+    updated = qs.update(skill_ids=ArraySubquery(links))
+    if fk == "jobposting":
+        transaction.on_commit(lambda: matching.mark_stale(ids))
+    return updated
+
+
+def skill_id_array(ids):
+    """A bigint[] parameter, for comparing against `skill_ids` in expressions."""
+    return Value(sorted(ids), output_field=ArrayField(models.BigIntegerField()))
+
+
+class SkillsMissing(Func):
+    """Elements of the first array that are not in the second (`a - b` as an array)."""
+    output_field = ArrayField(models.BigIntegerField())
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (lhs, lhs_params), (rhs, rhs_params) = (compiler.compile(e) for e in self.get_source_expressions())
+        return (f"ARRAY(SELECT s FROM unnest({lhs}) AS s WHERE s <> ALL({rhs}) ORDER BY s)",
+                (*lhs_params, *rhs_params))
+
+
+class Cardinality(Func):
+    function = "cardinality"
+    output_field = models.IntegerField()
+
+
+def with_skill_match(queryset, skill_ids):
+    """
+    Annotate postings with `missing_skill_ids`, `missing_count` and
+    `matched_count` against the skills in `skill_ids`.
+    """
+    have = skill_id_array(skill_ids)
+    return queryset.annotate(
+        missing_skill_ids=SkillsMissing("skill_ids", have),
+        missing_count=Cardinality(SkillsMissing("skill_ids", have)),
+    ).annotate(matched_count=Cardinality("skill_ids") - F("missing_count"))
@@ -1,3 +1,591 @@
-from django.test import TestCase
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import date, timedelta
+from itertools import count
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from .models import (
+    Course, JobField, JobPosting, Major, PrerequisiteClosure, Skill, StudentProfile,
+)
+from .batching import BatcherFull, DynamicBatcher
+from .chunking import chunked_ner, merge_entities, windows
+from .extraction import ExtractionCascade
+from .extraction_cache import ExtractionCache
+from .gazetteer import Gazetteer
+from .matching import FieldMatrix
+from .pdf_text import parse_course_entries, parse_requisites
+from .posting_attributes import extract_attributes, extract_posting, merge_attributes
+from .prerequisites import ancestors
+from .skill_arrays import refresh_skill_ids, with_skill_match
+
+# Query-plan regression suite: the main API queries are EXPLAINed over a
+# generated dataset big enough for the planner to prefer indexes, and a
+# sequential scan of any large table fails the test. Grow the dataset with
+# EXPLAIN_TEST_SCALE=4 (default 1 ≈ 20k postings / 100k posting-skill links).
+SCALE = float(os.environ.get("EXPLAIN_TEST_SCALE", "1"))
+
+N_FIELDS = 40
+N_SKILLS = int(4_000 * SCALE)
+N_MAJORS = 100
+N_COURSES = int(2_000 * SCALE)
+N_POSTINGS = int(20_000 * SCALE)
+N_USERS = int(5_000 * SCALE)
+SKILLS_PER_POSTING = 5
+
+# Tables that grow with the data; small lookup tables (JobField, Major) may be scanned
+LARGE_TABLES = {
+    "auth_user",
+    "catalog_course",
+    "catalog_course_skills",
+    "catalog_jobposting",
+    "catalog_jobposting_skills",
+    "catalog_major_skills",
+    "catalog_prerequisiteclosure",
+    "catalog_skill",
+    "catalog_studentprofile_skills",
+}
+
+def _pg_seq_scans(node):
+    if node.get("Node Type") == "Seq Scan":
+        yield node["Relation Name"]
+    for child in node.get("Plans", ()):
+        yield from _pg_seq_scans(child)
+
+
+def sequential_scans(queryset):
+    """Large tables the plan of `queryset` reads with a full scan."""
+    plan = json.loads(queryset.explain(format="json"))
+    return sorted(set(_pg_seq_scans(plan[0]["Plan"])) & LARGE_TABLES)
+
+
+# skill_ids is a PostgreSQL array, so the schema itself needs PostgreSQL
+@unittest.skipUnless(connection.vendor == "postgresql", "needs PostgreSQL")
+class QueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(46)
+        User = get_user_model()
+
+        fields = JobField.objects.bulk_create(JobField(name=f"Field {i}") for i in range(N_FIELDS))
+        # categories skewed like the real table: mostly major-related, few soft skills
+        skills = Skill.objects.bulk_create(
+            Skill(name=f"skill {i}", category=rng.choices(["major", "technical", "soft"], [6, 3, 1])[0])
+            for i in range(N_SKILLS)
+        )
+        majors = Major.objects.bulk_create(Major(name=f"Major {i}") for i in range(N_MAJORS))
+        courses = Course.objects.bulk_create(
+            Course(code=f"C{i // 1000:02d} {i % 1000:03d}", name=f"Course {i}") for i in range(N_COURSES)
+        )
+
+        today = date(2025, 1, 1)
+        postings = JobPosting.objects.bulk_create(
+            JobPosting(
+                title=f"Job {i}",
+                job_field=rng.choice(fields) if rng.random() < 0.9 else None,
+                date_posted=today - timedelta(days=rng.randrange(1_000)),
+                min_years_experience=rng.randrange(11),
+                education_level=rng.choices([1, 2, 3, 4, 5], [1, 4, 10, 4, 1])[0],
+                employment_type="internship" if rng.random() < 0.02 else "full_time",
+            )
+            for i in range(N_POSTINGS)
+        )
+        users = User.objects.bulk_create(
+            User(username=f"user{i}", email=f"user{i}@example.com") for i in range(N_USERS)
+        )
+        profiles = StudentProfile.objects.bulk_create(
+            StudentProfile(user=u, major=rng.choice(majors)) for u in users
+        )
+
+        def links(through, owner, owners, per):
+            through.objects.bulk_create(
+                (through(**{f"{owner}_id": o.pk, "skill_id": s.pk})
+                 for o in owners for s in rng.sample(skills, per)),
+                batch_size=5_000,
+            )
+
+        links(JobPosting.skills.through, "jobposting", postings, SKILLS_PER_POSTING)
+        links(Major.skills.through, "major", majors, 30)
+        links(Course.skills.through, "course", courses, 5)
+        links(StudentProfile.skills.through, "studentprofile", profiles, 10)
+        refresh_skill_ids(JobPosting)
+        refresh_skill_ids(StudentProfile)
+        PrerequisiteClosure.objects.bulk_create(
+            (PrerequisiteClosure(course=c, ancestor=a, depth=d + 1)
+             for c in courses for d, a in enumerate(rng.sample(courses, 3)) if a != c),
+            batch_size=5_000,
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.field = fields[7]
+        cls.major = majors[3]
+        cls.job = postings[123]
+        cls.profile = StudentProfile.objects.get(pk=profiles[42].pk)
+        cls.skill_ids = [s.pk for s in skills[:5]]
+        cls.course_ids = [c.pk for c in courses[:10]]
+
+    def queries(self):
+        """The API's hot queries, as the views build them."""
+        return {
+            # /api/jobs/?job_field=…  and the field's newest postings
+            "jobs by field": JobPosting.objects.filter(job_field=self.field),
+            "field newest": JobPosting.objects.filter(job_field=self.field).order_by("-date_posted")[:20],
+            # admin changelist ordering
+            "newest postings": JobPosting.objects.order_by("-date_posted", "title")[:100],
+            "jobs by employment type": JobPosting.objects.filter(employment_type="internship"),
+            "jobs by education": JobPosting.objects.filter(education_level__lte=1),
+            # /api/majors/<pk>/skills/ (MajorSkillsSerializer)
+            "major skills by category": self.major.skills.filter(category="soft"),
+            "skills by category": Skill.objects.filter(category="soft").order_by("name")[:50],
+            # /api/jobs/<pk>/missing/
+            "posting skills": self.job.skills.values_list("id", flat=True),
+            "profile skills": self.profile.skills.values_list("id", flat=True),
+            # /api/jobs/?matching=1 and ?qualified=1, over the GIN-indexed skill_ids
+            "postings sharing a skill": with_skill_match(
+                JobPosting.objects.filter(skill_ids__overlap=self.profile.skill_ids), self.profile.skill_ids),
+            "postings needing two skills": JobPosting.objects.filter(skill_ids__contains=self.skill_ids[:2]),
+            # /api/jobs/<pk>/electives/
+            "courses teaching skills": Course.skills.through.objects.filter(skill_id__in=self.skill_ids),
+            "prerequisite closure": PrerequisiteClosure.objects.filter(course_id__in=self.course_ids)
+                                    .select_related("ancestor"),
+            # EmailAuthToken
+            "user by email": get_user_model().objects.filter(email="user321@example.com"),
+        }
+
+    def test_no_sequential_scans(self):
+        for name, queryset in self.queries().items():
+            with self.subTest(name):
+                self.assertEqual(sequential_scans(queryset), [], queryset.explain())
+
+    def test_email_iexact_uses_expression_index(self):
+        # FacultyEmailAuthToken
+        queryset = get_user_model().objects.filter(email__iexact="USER321@example.com")
+        self.assertEqual(sequential_scans(queryset), [], queryset.explain())
+
+
+class FieldMatrixTests(SimpleTestCase):
+    """catalog.matching against a brute-force set computation, through loads and in-place patches."""
+
+    def setUp(self):
+        self.rng = random.Random(49)
+        self.postings = {pid: set(self.rng.sample(range(1, 300), self.rng.randint(0, 10)))
+                         for pid in range(1, 2_000)}
+        self.matrix = FieldMatrix().load(sorted((pid, sorted(s)) for pid, s in self.postings.items()))
+
+    def patch(self, n=3_000):
+        # new skills add columns past the loaded words, new postings grow the rows
+        for _ in range(n):
+            pid = self.rng.randrange(1, 4_000)
+            if self.rng.random() < 0.3:
+                self.matrix.remove_posting(pid)
+                self.postings.pop(pid, None)
+            else:
+                skills = set(self.rng.sample(range(1, 400), self.rng.randint(0, 12)))
+                self.matrix.set_posting(pid, skills)
+                self.postings[pid] = skills
+
+    def expected_rank(self, student, limit):
+        def key(pid):
+            skills = self.postings[pid]
+            matched = len(skills & student)
+            return -(matched / len(skills) if skills else 0.0), len(skills) - matched, pid
+        return sorted(self.postings, key=key)[:limit]
+
+    def assert_matches(self, student):
+        posting_ids, matched, missing, _ = self.matrix.score(student)
+        self.assertEqual(sorted(posting_ids.tolist()), sorted(self.postings))
+        for pid, m, miss in zip(posting_ids.tolist(), matched.tolist(), missing.tolist()):
+            self.assertEqual((m, miss), (len(self.postings[pid] & student), len(self.postings[pid] - student)))
+        for limit in (1, 25, len(self.postings) + 5):
+            self.assertEqual([r[0] for r in self.matrix.rank(student, limit)], self.expected_rank(student, limit))
+
+    def test_scores_and_rank_after_load(self):
+        for _ in range(5):
+            self.assert_matches(set(self.rng.sample(range(1, 300), 40)))
+
+    def test_scores_and_rank_after_patches(self):
+        self.patch()
+        self.assertEqual(len(self.matrix), len(self.postings))
+        for _ in range(5):
+            self.assert_matches(set(self.rng.sample(range(1, 400), 40)))
+
+    def test_student_without_field_skills(self):
+        self.assertTrue(all(r[1] == 0 for r in self.matrix.rank({10_000}, 10)))
+
+
+class RequisiteParserTests(SimpleTestCase):
+    """catalog.pdf_text requisite clauses: groups are all required, codes inside a group are alternatives."""
+
+    def test_and_or_grouping(self):
+        self.assertEqual(
+            parse_requisites("Prerequisites: MATH 113 and (CSCI 112 or CSCI 114)")["prerequisites"],
+            [["MATH 113"], ["CSCI 112", "CSCI 114"]],
+        )
+        # outside parentheses "," / ";" / "&" separate required groups like "and"
+        self.assertEqual(
+            parse_requisites("Prerequisite: CSCI 112, CSCI 114 or CSCI 116; STAT 200 & STAT 210")["prerequisites"],
+            [["CSCI 112"], ["CSCI 114", "CSCI 116"], ["STAT 200"], ["STAT 210"]],
+        )
+
+    def test_letter_spaced_codes(self):
+        self.assertEqual(
+            parse_requisites("Prerequisite: C S C I 1 1 2 or M ATH 1 1 3.")["prerequisites"],
+            [["CSCI 112", "MATH 113"]],
+        )
+
+    def test_wrapped_clause(self):
+        # a line ending in a connector or "(" continues; anything else ends the clause
+        body = "Pre-requisite: MATH 101 or\nMATH 102 and (\nSTAT 200 or STAT 201)\nSee also STAT 999."
+        self.assertEqual(parse_requisites(body)["prerequisites"],
+                         [["MATH 101", "MATH 102"], ["STAT 200", "STAT 201"]])
+        self.assertEqual(parse_requisites("Prerequisite: MATH 101\nMATH 102 is recommended")["prerequisites"],
+                         [["MATH 101"]])
+
+    def test_pre_and_corequisites(self):
+        body = "Prerequisite(s): PHYS 101 Corequisite (s) : MATH 201 or MATH 202"
+        self.assertEqual(parse_requisites(body),
+                         {"prerequisites": [["PHYS 101"]], "corequisites": [["MATH 201", "MATH 202"]]})
+
+    def test_course_entries(self):
+        raw = ("CSCI 210 Data Structures (3-0-3)\nLists and trees.\nPrerequisite: CSCI 112\n"
+               "CSCI 310 Algorithms (3)\nGraphs.\nPrerequisites: CSCI 210 and MATH 113\n")
+        entries = parse_course_entries(raw)
+        self.assertEqual(entries["CSCI 210"]["credits"], 3.0)
+        self.assertEqual(entries["CSCI 210"]["prerequisites"], [["CSCI 112"]])
+        self.assertEqual(entries["CSCI 310"]["prerequisites"], [["CSCI 210"], ["MATH 113"]])
+
+
+class PrerequisiteClosureTests(SimpleTestCase):
+    """catalog.prerequisites.ancestors on an in-memory graph (course -> [(prerequisite, mandatory)])."""
+
+    # 1 needs 2 and optionally 3; 2 needs 4; 4 needs 1 again (a cycle) and 5;
+    # 3 needs 5 and 6, so 5 is required through 4 but 6 only through optional 3
+    PARENTS = {
+        1: [(2, True), (3, False)],
+        2: [(4, True)],
+        3: [(5, True), (6, True)],
+        4: [(1, True), (5, True)],
+    }
+
+    def test_depths_and_required(self):
+        self.assertEqual(ancestors(1, self.PARENTS),
+                         {2: (1, True), 3: (1, False), 4: (2, True), 5: (2, True), 6: (2, False)})
+
+    def test_cycle_excludes_the_course_itself(self):
+        self.assertEqual(ancestors(2, self.PARENTS),
+                         {4: (1, True), 1: (2, True), 5: (2, True), 3: (3, False), 6: (4, False)})
+
+    def test_course_without_prerequisites(self):
+        self.assertEqual(ancestors(6, self.PARENTS), {})
+
+
+class ExtractionCacheTests(SimpleTestCase):
+    """catalog.extraction_cache on a throwaway SQLite file."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ExtractionCache(Path(tmp.name) / "cache.sqlite3", max_entries=10, enabled=True)
+        self.addCleanup(self.cache.close)
+        # strictly increasing timestamps, so LRU order doesn't depend on clock resolution
+        clock = mock.patch("catalog.extraction_cache.time.time", side_effect=count(1))
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def rows(self):
+        return self.cache.conn.execute("SELECT COUNT(*) FROM extraction").fetchone()[0]
+
+    def test_put_many_counts_only_new_keys(self):
+        self.cache._evict()         # load the count
+        for _ in range(3):
+            self.cache.put_many("ner", "1", [(str(i), i) for i in range(8)])
+        self.assertEqual(self.cache._count, 8)
+        self.assertEqual(self.rows(), 8)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put_many("ner", "1", [(str(i), i) for i in range(10)])
+        self.assertEqual(self.cache.get_many("ner", "1", ["0", "1"]), {"0": 0, "1": 1})
+        self.cache.put_many("ner", "1", [("10", 10)])
+        # over 10 → trimmed to 9: the two oldest untouched keys go, the read ones stay
+        self.assertEqual(self.rows(), 9)
+        left = self.cache.get_many("ner", "1", [str(i) for i in range(11)])
+        self.assertEqual(sorted(left, key=int), ["0", "1"] + [str(i) for i in range(4, 11)])
+
+    def test_fetch_many_computes_misses_once(self):
+        calls = []
+
+        def compute(texts):
+            calls.append(list(texts))
+            return [t.upper() if t != "skip" else None for t in texts]
+
+        self.assertEqual(self.cache.fetch_many("ner", "1", ["a", "b", "a", "skip"], compute),
+                         ["A", "B", "A", None])
+        self.assertEqual(self.cache.fetch_many("ner", "1", ["b", "a", "skip"], compute), ["B", "A", None])
+        # duplicates computed once; None is not cached, so only "skip" is retried
+        self.assertEqual(calls, [["a", "b", "skip"], ["skip"]])
+        self.assertEqual(self.cache.stats["ner"], {"hits": 2, "misses": 4})
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork()")
+    def test_forked_child_opens_its_own_connection(self):
+        self.cache.put_many("ner", "1", [("parent", 1)])
+        parent_conn = self.cache.conn
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = self.cache.conn is not parent_conn
+                self.cache.put_many("ner", "1", [("child", 2)])
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertIs(self.cache.conn, parent_conn)
+        self.assertEqual(self.cache.get_many("ner", "1", ["parent", "child"]), {"parent": 1, "child": 2})
+
+
+class Encoding(dict):
+    def __init__(self, offsets, word_ids):
+        super().__init__(offset_mapping=offsets)
+        self._word_ids = word_ids
+
+    def word_ids(self):
+        return self._word_ids
+
+
+class WordPieceTokenizer:
+    """Stand-in for a fast HF tokenizer: words longer than 5 chars become two sub-tokens."""
+
+    model_max_length = 512
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+    def __call__(self, text, **kwargs):
+        offsets, word_ids = [], []
+        for w, m in enumerate(re.finditer(r"\S+", text)):
+            cuts = [m.start(), m.start() + 5, m.end()] if m.end() - m.start() > 5 else [m.start(), m.end()]
+            for lo, hi in zip(cuts, cuts[1:]):
+                offsets.append((lo, hi))
+                word_ids.append(w)
+        return Encoding(offsets, word_ids)
+
+
+class ChunkingTests(SimpleTestCase):
+    """catalog.chunking windows and the merge of entities seen from overlapping windows."""
+
+    def setUp(self):
+        self.tokenizer = WordPieceTokenizer()
+        self.text = " ".join(f"word{i}" if i % 3 else f"longword{i}" for i in range(120))
+
+    def test_short_text_is_one_window(self):
+        self.assertEqual(windows(self.tokenizer, "python and sql", max_tokens=12), [(0, 14)])
+
+    def test_windows_overlap_and_cut_on_word_boundaries(self):
+        spans = windows(self.tokenizer, self.text, max_tokens=32, stride=8)
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[-1][1], len(self.text))
+        starts = {m.start() for m in re.finditer(r"\S+", self.text)}
+        ends = {m.end() for m in re.finditer(r"\S+", self.text)}
+        for (lo, hi), (next_lo, _) in zip(spans, spans[1:]):
+            self.assertIn(lo, starts)
+            self.assertIn(hi, ends)
+            self.assertLess(next_lo, hi)            # overlap…
+            self.assertGreater(next_lo, lo)         # …and progress
+        for lo, hi in spans:
+            # 32 minus 2 special tokens
+            self.assertLessEqual(len(self.tokenizer(self.text[lo:hi])["offset_mapping"]), 30)
+
+    def test_merge_collapses_overlapping_spans_of_one_type(self):
+        text = "Experience with machine learning and SQL"
+        entities = [
+            {"entity_group": "Skill", "word": "machine", "score": 0.6, "start": 16, "end": 23},
+            {"entity_group": "Skill", "word": "machine learning", "score": 0.9, "start": 16, "end": 32},
+            {"entity_group": "Skill", "word": "SQL", "score": 0.8, "start": 37, "end": 40},
+            {"entity_group": "Skill", "word": "SQL", "score": 0.7, "start": 37, "end": 40},
+            {"entity_group": "Knowledge", "word": "learning", "score": 0.5, "start": 24, "end": 32},
+        ]
+        merged = merge_entities(text, entities)
+        self.assertEqual(
+            [(e["entity_group"], e["word"], e["score"]) for e in merged],
+            [("Skill", "machine learning", 0.9), ("Knowledge", "learning", 0.5), ("Skill", "SQL", 0.8)],
+        )
+
+    def test_merge_without_offsets_dedupes_by_word(self):
+        entities = [
+            {"entity_group": "Skill", "word": "sql", "score": 0.4, "start": None, "end": None},
+            {"entity_group": "Skill", "word": "sql", "score": 0.9, "start": None, "end": None},
+        ]
+        self.assertEqual([e["score"] for e in merge_entities("sql", entities)], [0.9])
+
+    def test_chunked_ner_maps_window_entities_back_to_the_document(self):
+        tokenizer = self.tokenizer
+
+        class Pipe:
+            # tags every "longwordN" at its offsets within the window
+            def __init__(self):
+                self.tokenizer = tokenizer
+
+            def __call__(self, inputs, batch_size):
+                return [[{"entity_group": "Skill", "word": m.group(), "score": 0.9,
+                          "start": m.start(), "end": m.end()}
+                         for m in re.finditer(r"longword\d+", chunk)] for chunk in inputs]
+
+        found = chunked_ner(Pipe(), [self.text, "", "longword7 only"], max_tokens=32, stride=8)
+        expected = [m.group() for m in re.finditer(r"longword\d+", self.text)]
+        self.assertEqual([e["word"] for e in found[0]], expected)     # each seen once
+        self.assertEqual(found[1], [])
+        self.assertEqual([e["word"] for e in found[2]], ["longword7"])
+
+
+class DynamicBatcherTests(SimpleTestCase):
+    """catalog.batching with a batch function that records what it was given."""
+
+    def setUp(self):
+        self.batches = []
+        self.running = threading.Event()    # set once the worker is inside the batch function
+        self.release = threading.Event()    # the batch function returns once this is set
+        self.release.set()
+        self.addCleanup(self.release.set)
+
+    def double(self, items):
+        self.running.set()
+        self.release.wait(5)
+        self.batches.append(list(items))
+        if "boom" in items:
+            raise ValueError("boom")
+        return [i * 2 for i in items]
+
+    def hold_worker(self, batcher):
+        """Park the worker inside a batch of [0]; returns the thread waiting for it."""
+        self.release.clear()
+        holder = threading.Thread(target=batcher.submit, args=(0, 5))
+        holder.start()
+        self.assertTrue(self.running.wait(5))
+        return holder
+
+    def test_queued_submits_share_a_batch(self):
+        batcher = DynamicBatcher(self.double, max_batch=8, max_wait=0.05)
+        holder = self.hold_worker(batcher)
+        with ThreadPoolExecutor(8) as pool:
+            futures = [pool.submit(batcher.submit, i, 5) for i in range(1, 9)]
+            while batcher.queue.qsize() < 8:
+                time.sleep(0.001)
+            self.release.set()
+            results = [f.result() for f in futures]
+        holder.join()
+        self.assertEqual(results, [i * 2 for i in range(1, 9)])
+        self.assertEqual(self.batches, [[0], list(range(1, 9))])
+        self.assertEqual(batcher.metrics()["batch_sizes"], {"1": 1, "8": 1})
+
+    def test_error_reaches_every_caller_of_the_batch(self):
+        batcher = DynamicBatcher(self.double, max_batch=2, max_wait=0.05)
+        holder = self.hold_worker(batcher)
+        with ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(batcher.submit, item, 5) for item in ("boom", "x")]
+            while batcher.queue.qsize() < 2:
+                time.sleep(0.001)
+            self.release.set()
+            for future in futures:
+                self.assertRaises(ValueError, future.result)
+        holder.join()
+        self.assertEqual(batcher.metrics()["errors"], 1)
+        self.assertEqual(batcher.submit(3, timeout=5), 6)       # the worker thread survives
+
+    def test_timed_out_items_are_cancelled_not_run(self):
+        batcher = DynamicBatcher(self.double, max_batch=1, max_wait=0)
+        holder = self.hold_worker(batcher)
+        with self.assertRaises(FuturesTimeout):
+            batcher.submit(1, timeout=0.01)
+        self.release.set()
+        holder.join()
+        self.assertEqual(batcher.submit(2, timeout=5), 4)
+        self.assertEqual(self.batches, [[0], [2]])
+        self.assertEqual(batcher.metrics()["cancelled"], 1)
+
+    def test_full_queue_rejects(self):
+        batcher = DynamicBatcher(self.double, max_batch=1, max_wait=0, max_queue=1)
+        holder = self.hold_worker(batcher)
+        waiting = threading.Thread(target=batcher.submit, args=(1, 5))
+        waiting.start()
+        while batcher.queue.qsize() < 1:
+            time.sleep(0.001)
+        with self.assertRaises(BatcherFull):
+            batcher.submit(2, timeout=5)
+        self.release.set()
+        holder.join()
+        waiting.join()
+        self.assertEqual(self.batches, [[0], [1]])
+        self.assertEqual(batcher.metrics()["rejected"], 1)
+
+
+class PostingAttributeTests(SimpleTestCase):
+    """catalog.posting_attributes cue phrases, on the gazetteer's tokens."""
+
+    def test_years_of_experience(self):
+        self.assertEqual(extract_attributes("We need 3+ years of experience in Python.")["min_years_experience"], 3)
+        self.assertEqual(extract_attributes("Experience: 2-4 yrs.")["min_years_experience"], 2)
+        self.assertEqual(extract_attributes("Minimum of five years professional experience")["min_years_experience"], 5)
+        self.assertEqual(extract_attributes("1 year of relevant work, or 4 years industry exp")["min_years_experience"], 1)
+
+    def test_years_need_experience_context_unless_lenient(self):
+        text = "Founded 25 years ago. A 2 year contract."
+        self.assertIsNone(extract_attributes(text)["min_years_experience"])
+        self.assertEqual(extract_attributes(text, strict=False)["min_years_experience"], 2)
+        self.assertIsNone(extract_attributes("at least 40 years experience")["min_years_experience"])   # > MAX_YEARS
+
+    def test_education_takes_the_lowest_degree(self):
+        self.assertEqual(extract_attributes("Master's or PhD preferred")["education_level"], 4)
+        self.assertEqual(extract_attributes("Bachelor degree required, MSc a plus")["education_level"], 3)
+        self.assertEqual(extract_attributes("High school diploma")["education_level"], 1)
+        self.assertIsNone(extract_attributes("No formal requirements")["education_level"])
+
+    def test_employment_type_is_the_first_cue(self):
+        self.assertEqual(extract_attributes("Full-time role, contractors welcome")["employment_type"], "full_time")
+        self.assertEqual(extract_attributes("Part time internship")["employment_type"], "part_time")
+        self.assertEqual(extract_attributes("")["employment_type"], "")
+
+    def test_skills_and_attributes_from_one_pass(self):
+        gz = Gazetteer()
+        gz.add(1, "Python")
+        gz.add(2, "Machine Learning")
+        gz.add(2, "Machine Learning", "ML")
+        gz.automaton.build()
+        profile = extract_posting("ML engineer: Python, machine learning, 3 years experience, full time", gz)
+        self.assertEqual(profile.skill_ids, [2, 1])
+        self.assertEqual(profile.skills, ["Machine Learning", "Python"])
+        self.assertEqual(profile.attributes,
+                         {"min_years_experience": 3, "education_level": None, "employment_type": "full_time"})
+
+    def test_merge_prefers_primary_values(self):
+        primary = {"min_years_experience": None, "education_level": 3, "employment_type": ""}
+        fallback = {"min_years_experience": 2, "education_level": 4, "employment_type": "contract"}
+        self.assertEqual(merge_attributes(primary, fallback),
+                         {"min_years_experience": 2, "education_level": 3, "employment_type": "contract"})
+
+
+class ExtractionCascadeTests(SimpleTestCase):
+    """catalog.extraction with only the header tier (no models, no gazetteer)."""
+
+    def test_settled_and_unsettled_results(self):
+        cascade = ExtractionCascade(tiers=["header"], min_skills={"header": 3})
+        settled = cascade.extract("", bullets=["Python", "SQL", "Docker"])
+        self.assertEqual((settled.tier, settled.skills), ("header", ["Python", "SQL", "Docker"]))
+        # too few skills: kept, but no tier is credited with settling them
+        short = cascade.extract("", bullets=["Python", "SQL"])
+        self.assertIsNone(short.tier)
+        self.assertEqual(short.sources, {"Python": "header", "SQL": "header"})
+        self.assertEqual(cascade.stats["header"]["accepted"], 1)
+        self.assertEqual(cascade.unsettled, 1)
@@ -1,7 +1,9 @@
 from django.urls import path
 from .views import (
     MajorList, MajorSkillsDetail,
-    ProfileDetail, JobSearch, MissingSkills, FacultyProfileDetail, JobFieldList, SkillListCreate
+    ProfileDetail, JobSearch, MissingSkills, ElectiveSuggestions, FieldRanking, FacultyProfileDetail, JobFieldList,
+    SkillListCreate,
+    ExtractSkills, ExtractSkillsMetrics,
 )
 
 urlpatterns = [
@@ -11,7 +13,11 @@ urlpatterns = [
     path("faculty/profile/",         FacultyProfileDetail.as_view(), name="faculty-profile"),
     path("jobs/",                          JobSearch.as_view(),       name="job-search"),
     path("jobs/<int:pk>/missing/",         MissingSkills.as_view(),   name="missing-skills"),
+    path("jobs/<int:pk>/electives/",       ElectiveSuggestions.as_view(), name="elective-suggestions"),
     path("jobfields/", JobFieldList.as_view(), name="jobfield-list"),
+    path("jobfields/<int:pk>/ranking/",    FieldRanking.as_view(),    name="field-ranking"),
     path('skills/', SkillListCreate.as_view(), name='skill-list-create'),
+    path("extract-skills/",                ExtractSkills.as_view(),   name="extract-skills"),
+    path("extract-skills/metrics/",        ExtractSkillsMetrics.as_view(), name="extract-skills-metrics"),
 ]
 
@@ -1,11 +1,24 @@
+import logging
+from concurrent.futures import TimeoutError as FuturesTimeout
+
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.db.models import Q
 
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
-from .models      import StudentProfile as Profile, Major, JobPosting, Skill, Certification, JobField
+from .models      import StudentProfile as Profile, Major, JobPosting, Skill, Certification, JobField, Course
+from .batching    import BatcherFull, all_metrics, batching_config, get_batcher
+from .gazetteer   import get_gazetteer
+from .inference   import ner_entities_many
+from .matching    import get_field_matrix
+from .normalize   import clean_ner_entities, ner_text
+from .prerequisites import prerequisites_of
+from .recommend   import get_cover_index
+from .services    import match_skills, recommend_certs, semantically_covered
+from .skill_arrays import SkillsMissing, skill_id_array, with_skill_match
 from .serializers import (
     MajorSerializer,
     MajorSkillsSerializer,
@@ -13,7 +26,9 @@ from .serializers import (
     JobPostingSerializer,
     MissingSerializer,
     SkillSerializer, 
-    CertificationSerializer,
+    ExtractSkillsSerializer,
+    ElectivesSerializer,
+    FieldRankingSerializer,
     FacultyProfileSerializer,
     RegisterSerializer,
     JobFieldSerializer,
@@ -29,6 +44,7 @@ from rest_framework import filters
 from rest_framework.authtoken.views import ObtainAuthToken
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 class SkillListCreate(generics.ListCreateAPIView):
     queryset = Skill.objects.all()
@@ -84,6 +100,7 @@ class ProfileDetail(APIView):
 
 #
 # 4) /api/jobs/?title=Foo  →  list job postings filtered by title substring
+#    (and by experience / education / employment type)
 #
 class JobSearch(generics.ListAPIView):
     serializer_class = JobPostingSerializer
@@ -93,46 +110,225 @@ class JobSearch(generics.ListAPIView):
         Allow:
           - ?title=<substring>
           - ?job_field=<exact name of job field>
+          - ?max_years=<n>        postings asking for at most n years of experience
+          - ?education=<1..5>     postings accepting that degree level or lower
+          - ?employment_type=<full_time|part_time|contract|temporary|internship>
+          - ?matching=1           postings sharing a skill with the student's profile,
+                                  fewest missing skills first
+          - ?qualified=1          postings whose skills the profile already has all of
+        Skill filters compare the GIN-indexed skill_ids arrays in SQL.
         """
         qs = JobPosting.objects.all()
-        title = self.request.query_params.get("title", "").strip()
-        job_field = self.request.query_params.get("job_field", "").strip()
+        params = self.request.query_params
+        title = params.get("title", "").strip()
+        job_field = params.get("job_field", "").strip()
         if title:
             qs = qs.filter(title__icontains=title)
         if job_field:
             # filter by job_field name (case-insensitive)
             qs = qs.filter(job_field__name__iexact=job_field)
+        # indexed columns filled at ingest, so these never scan descriptions
+        max_years = params.get("max_years", "").strip()
+        education = params.get("education", "").strip()
+        employment_type = params.get("employment_type", "").strip()
+        if max_years.isdigit():
+            qs = qs.filter(min_years_experience__lte=int(max_years))
+        if education.isdigit():
+            qs = qs.filter(education_level__lte=int(education))
+        if employment_type:
+            qs = qs.filter(employment_type=employment_type)
+
+        prof = getattr(self.request.user, "profile", None) if self.request.user.is_authenticated else None
+        if prof is not None:
+            if params.get("qualified") == "1":
+                qs = qs.filter(skill_ids__contained_by=prof.skill_ids).exclude(skill_ids=[])
+            if params.get("matching") == "1":
+                qs = with_skill_match(qs.filter(skill_ids__overlap=prof.skill_ids), prof.skill_ids)
+                qs = qs.order_by("missing_count", "-matched_count", "-date_posted")
         return qs
 
+def missing_skill_ids(pk, prof):
+    """(posting, ids of its skills the profile lacks); the difference of the skill_ids arrays runs in SQL."""
+    job = get_object_or_404(
+        JobPosting.objects.annotate(missing_ids=SkillsMissing("skill_ids", skill_id_array(prof.skill_ids))),
+        pk=pk,
+    )
+    # "ML" on the profile covers "Machine Learning" on the posting
+    missing_ids = set(job.missing_ids)
+    missing_ids -= semantically_covered(missing_ids, set(prof.skill_ids))
+    return job, missing_ids
+
 #
 # 5) /api/jobs/<pk>/missing/  →  find which skills the user is missing for a given job
 #    and suggest certifications for each missing skill
 #
 class MissingSkills(APIView):
     def get(self, request, pk):
-        job  = get_object_or_404(JobPosting, pk=pk)
         prof = request.user.profile
-
-        user_sk = set(prof.skills.values_list("id", flat=True))
-        job_sk  = set(job.skills.values_list("id", flat=True))
-
-        missing = Skill.objects.filter(id__in=job_sk - user_sk)
-
-        # build suggestions as full objects
-        suggestions = {}
-        for skill in missing:
-            certs = Certification.objects.filter(skills=skill)
-            # serialize them
-            serializer = CertificationSerializer(certs, many=True)
-            suggestions[skill.name] = serializer.data
+        job, missing_ids = missing_skill_ids(pk, prof)
+        missing = Skill.objects.filter(id__in=missing_ids)
+
+        # the minimal set of certs covering every gap, plus per-skill options
+        recommended, uncovered = recommend_certs(missing_ids)
+        index = get_cover_index()
+        per_skill = {s.id: [index.cert_ids[p] for p in index.certs_for(s.id)] for s in missing}
+        certs = Certification.objects.in_bulk({cid for ids in per_skill.values() for cid in ids})
+        suggestions = {
+            skill.name: [certs[cid] for cid in per_skill[skill.id] if cid in certs]
+            for skill in missing
+        }
 
         payload = {
             "missing_skills": missing,
             "suggestions": suggestions,
+            "recommended": recommended,
+            "uncovered_skill_ids": uncovered,
         }
         return Response(MissingSerializer(payload).data)
 
 
+#
+# 5b) /api/jobs/<pk>/electives/?limit=10  →  courses outside the student's major
+#     that teach the missing skills, each with every course needed before it
+#     (one PrerequisiteClosure lookup); courses already in the major's catalog
+#     are marked as done. Most gaps covered first, then fewest outstanding prerequisites.
+#
+class ElectiveSuggestions(APIView):
+    def get(self, request, pk):
+        prof = request.user.profile
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+        except ValueError:
+            limit = 10
+
+        job, missing_ids = missing_skill_ids(pk, prof)
+        covers = {}
+        for course_id, skill_id in Course.skills.through.objects.filter(
+                skill_id__in=missing_ids).values_list("course_id", "skill_id"):
+            covers.setdefault(course_id, set()).add(skill_id)
+
+        courses = Course.objects.filter(pk__in=covers)
+        in_major = set()
+        if prof.major_id:
+            courses = courses.filter(Q(major__isnull=True) | Q(major=prof.major_id)).exclude(majors=prof.major_id)
+            in_major = set(Major.courses.through.objects.filter(major_id=prof.major_id)
+                           .values_list("course_id", flat=True))
+        else:
+            courses = courses.filter(major__isnull=True)
+        courses = list(courses)
+
+        closure = prerequisites_of([c.pk for c in courses])
+        skills = Skill.objects.in_bulk(missing_ids)
+        electives = []
+        for course in courses:
+            prereqs = [
+                {"id": row.ancestor_id, "code": row.ancestor.code, "name": row.ancestor.name,
+                 "depth": row.depth, "required": row.required, "in_major": row.ancestor_id in in_major}
+                for row in closure[course.pk]
+            ]
+            electives.append({
+                "course": course,
+                "covers": [skills[sid] for sid in sorted(covers[course.pk]) if sid in skills],
+                "prerequisites": prereqs,
+                "outstanding": sum(1 for p in prereqs if p["required"] and not p["in_major"]),
+            })
+        electives.sort(key=lambda e: (-len(e["covers"]), e["outstanding"], e["course"].code))
+
+        payload = {
+            "missing_skills": Skill.objects.filter(id__in=missing_ids),
+            "electives": electives[:limit],
+        }
+        return Response(ElectivesSerializer(payload).data)
+
+
+#
+# 5c) /api/jobfields/<pk>/ranking/?limit=20  →  every posting in the field scored
+#     against the student's skills in one pass over the field's bit matrix
+#     (catalog.matching); best match ratio first, then fewest missing skills.
+#
+class FieldRanking(APIView):
+    def get(self, request, pk):
+        field = get_object_or_404(JobField, pk=pk)
+        prof  = request.user.profile
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+        except ValueError:
+            limit = 20
+
+        matrix = get_field_matrix(field.pk)
+        ranked = matrix.rank(prof.skill_ids, limit)
+        jobs = (JobPosting.objects.select_related("job_field").prefetch_related("skills")
+                .in_bulk([pid for pid, *_ in ranked]))
+
+        payload = {
+            "job_field": field.name,
+            "scored": len(matrix),
+            "results": [
+                {"job": jobs[pid], "matched": matched, "missing": missing, "ratio": ratio}
+                for pid, matched, missing, ratio in ranked if pid in jobs
+            ],
+        }
+        return Response(FieldRankingSerializer(payload).data)
+
+
+#
+# 6) POST /api/extract-skills/  {"text": "..."}  →  skills found in pasted text,
+#    resolved to existing Skill ids. NER runs through a shared micro-batcher,
+#    so concurrent requests share one forward pass; 503 when its queue is full.
+#
+class ExtractSkills(APIView):
+    def post(self, request):
+        serializer = ExtractSkillsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        text = serializer.validated_data["text"]
+
+        # dictionary matches: exact Skill/SkillAlias hits, no model needed
+        gz_ids = get_gazetteer(refresh=False).match_ids(text)
+        sources = {sid: "gazetteer" for sid in gz_ids}
+
+        ner_names, ner_ok = [], True
+        try:
+            batcher = get_batcher("ner", ner_entities_many)
+            entities = batcher.submit(ner_text(text), timeout=batching_config()["timeout"])
+            ner_names = clean_ner_entities(entities)
+        except BatcherFull as e:
+            logger.warning("NER batcher full, rejecting request: %s", e)
+            return Response({"detail": "Skill extraction is overloaded, try again shortly."},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except FuturesTimeout:
+            # batch didn't finish within the request timeout: dictionary results only
+            logger.warning("NER batcher timed out; returning dictionary matches only")
+            ner_ok = False
+        except (ImportError, OSError) as e:
+            # transformers/optimum missing, or model files can't be loaded
+            logger.warning("NER model unavailable: %s", e)
+            ner_ok = False
+
+        # exact/alias lookup only: the semantic resolve would load the embedder in the web process
+        ner_skills, unmatched = match_skills(ner_names, semantic=False)
+        for skill in ner_skills:
+            sources.setdefault(skill.id, "ner")
+
+        skills = Skill.objects.in_bulk(list(sources))
+        return Response({
+            "skills": [
+                {"id": sid, "name": skills[sid].name, "source": src}
+                for sid, src in sources.items() if sid in skills
+            ],
+            "unmatched": unmatched,
+            "ner": ner_ok,
+        })
+
+
+#
+# 7) GET /api/extract-skills/metrics/  →  batcher queue depth / batch sizes (staff only)
+#
+class ExtractSkillsMetrics(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response({"batchers": all_metrics()})
+
 
 class FacultyProfileDetail(APIView):
     """
@@ -143,6 +143,61 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Persisted skill-extraction artefacts (gazetteer, vector index, caches)
+SKILL_INDEX_DIR = BASE_DIR / "data" / "skill_index"
+
+# Cosine similarity at which two skill names count as the same skill (catalog.semantic)
+SKILL_SIMILARITY_THRESHOLD = 0.80
+
+# Tiered skill extraction (catalog.extraction): a tier's result is kept once it
+# has min_skills skills at min_confidence; otherwise the next tier runs.
+SKILL_EXTRACTION_CASCADE = {
+    "tiers": ["header", "gazetteer", "ner", "llm"],
+    "min_skills": {"header": 3, "gazetteer": 5, "ner": 3},
+    "min_confidence": {"ner": 0.80},
+}
+
+# Backend for the BERT NER pipelines (catalog.inference): "torch", or "onnx" for
+# an int8-quantized onnxruntime export (needs optimum[onnxruntime]).
+NER_BACKEND = "torch"
+
+# Micro-batching for POST /api/extract-skills/ (catalog.batching): concurrent
+# requests are coalesced for up to max_wait_ms into one NER call of ≤ max_batch texts.
+SKILL_EXTRACTION_BATCHING = {
+    "max_batch": 32,
+    "max_wait_ms": 10,
+    "max_queue": 256,       # queued texts per worker before requests get a 503
+    "timeout": 30,
+}
+
+# Unix socket of the resident model worker (`manage.py inference_server`);
+# commands fall back to in-process models when nothing listens there.
+INFERENCE_SOCKET = BASE_DIR / "data" / "inference.sock"
+INFERENCE_TIMEOUT = 600
+
+# Ollama HTTP API used for schema-constrained extraction (catalog.llm)
+OLLAMA_URL = "http://localhost:11434"
+
+# Content-hash cache of raw extractor output (catalog.extraction_cache), stored
+# in SKILL_INDEX_DIR; the least recently used entries are evicted past max_entries.
+EXTRACTION_CACHE = {
+    "max_entries": 500_000,
+}
+
+# Certification set-cover weights (catalog.recommend): cost = paid/free_cost
+# / (1 + relevance_score); the in-memory index is rebuilt every max_age seconds.
+CERT_RECOMMENDER = {
+    "paid_cost": 2.0,
+    "free_cost": 1.0,
+    "max_age": 300,
+}
+
+# Per-JobField posting × skill bit matrices (catalog.matching), patched in place
+# on posting changes and rebuilt every max_age seconds for other processes' edits.
+SKILL_MATCHER = {
+    "max_age": 300,
+}
+
 MAJOR_TO_JOBFIELDS = {
     # 1) School of Arts and Sciences
     "Mass Communication": [
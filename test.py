@@ -1,5 +1,6 @@
 from llama_cpp import Llama
-import re
+
+from catalog.llm import llama_json, skill_list_schema, stats
 
 # 1) Initialize the model with your local GGUF path
 llm = Llama(
@@ -8,31 +9,25 @@ llm = Llama(
     verbose=False
 )
 
+SKILLS_SCHEMA = skill_list_schema(max_skills=15)
+
 def extract_skills(text: str):
     prompt = f"""
 You are a skills-extraction assistant.
-Read the following job description and output ONLY in single words.
+Read the following job description and list its skills, each in as few words as possible.
 
 Job Description:
 \"\"\"
 {text}
 \"\"\"
 
-Skills (comma-separated):"""
-
-    out = llm(
-        prompt=prompt,
-        max_tokens=128,
-        temperature=0.0,
-    )
-    raw = out["choices"][0]["text"]
-
-    # strip any accidental “Skills:” or “Output:” prefixes
-    cleaned = re.sub(r'^(Skills:|Output:)\s*', '', raw.strip(), flags=re.IGNORECASE)
+Answer as JSON: {{"skills": ["...", "..."]}}
+"""
 
-    # split into a Python list
-    skill_list = [s.strip() for s in cleaned.split(',') if s.strip()]
-    return cleaned, skill_list
+    # decoding is constrained to SKILLS_SCHEMA, so the reply is always valid JSON
+    parsed = llama_json(llm, prompt, SKILLS_SCHEMA, task="test_extract")
+    skill_list = [s.strip() for s in (parsed or {}).get("skills", []) if s.strip()]
+    return ", ".join(skill_list), skill_list
 
 if __name__ == "__main__":
     description = (
@@ -42,3 +37,4 @@ if __name__ == "__main__":
     skills_str, skills_list = extract_skills(description)
     print("Raw comma-string:", skills_str)
     print("As Python list:", skills_list)
+    print(stats.report())